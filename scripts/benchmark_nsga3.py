@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Compare NSGA-II and NSGA-III selection in the CNSGA generator on the DTLZ2
+many-objective test function.
+
+The pareto front of DTLZ2 is the unit hypersphere in the positive orthant. For
+each selection algorithm the mean distance of the final population to the front
+(convergence), the inverted generational distance to a uniform set of points on
+the front (convergence and diversity) and the time spent in selection are
+reported, averaged over seeds.
+
+Example:
+    python scripts/benchmark_nsga3.py --objectives 5 --generations 100
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from xopt.generators.ga.cnsga import CNSGAGenerator
+from xopt.generators.ga.selection import uniform_reference_points
+from xopt.resources.test_functions.dtlz import evaluate_dtlz2, make_dtlz2_vocs
+
+
+def run(vocs, selection, population_size, n_generations, seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+    options = CNSGAGenerator.default_options()
+    options.population_size = population_size
+    options.selection = selection
+    generator = CNSGAGenerator(vocs, options)
+
+    select_time = 0.0
+    for i in range(n_generations + 1):
+        index = np.arange(i * population_size, (i + 1) * population_size)
+        inputs = pd.DataFrame(generator.generate(population_size), index=index)
+        outputs = pd.DataFrame(
+            [evaluate_dtlz2(ele) for ele in inputs.to_dict("records")], index=index
+        )
+        start = time.perf_counter()
+        generator.add_data(pd.concat([inputs, outputs], axis=1))
+        select_time += time.perf_counter() - start
+
+    return vocs.objective_data(generator.population).to_numpy(), select_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objectives", type=int, default=5)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--population", type=int, default=128)
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    vocs = make_dtlz2_vocs(args.objectives)
+    front = uniform_reference_points(args.objectives, 6)
+    front /= np.linalg.norm(front, axis=1, keepdims=True)
+
+    rows = []
+    for selection in ["nsga2", "nsga3"]:
+        for seed in range(args.seeds):
+            objectives, select_time = run(
+                vocs, selection, args.population, args.generations, seed
+            )
+            distances = np.linalg.norm(
+                front[:, None, :] - objectives[None, :, :], axis=-1
+            )
+            rows.append(
+                {
+                    "selection": selection,
+                    "distance_to_front": np.mean(
+                        np.linalg.norm(objectives, axis=1) - 1.0
+                    ),
+                    "igd": np.mean(distances.min(axis=1)),
+                    "select_time": select_time,
+                }
+            )
+
+    results = pd.DataFrame(rows).groupby("selection").mean()
+    print(f"DTLZ2 with {args.objectives} objectives")
+    print(results.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Compare the speed and accuracy of Bayesian optimization in single (float32) and
+double (float64) precision on the bundled test functions.
+
+For each test function and precision the same initial points are evaluated,
+followed by a number of optimization steps. The mean time spent generating a
+candidate and the best feasible objective value found (averaged over seeds that
+found a feasible point) are reported.
+
+Example:
+    python scripts/benchmark_precision.py --steps 20 --threads 1
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import torch
+
+from xopt import Evaluator, Xopt
+from xopt.generators.bayesian import UpperConfidenceBoundGenerator
+from xopt.resources.test_functions.rosenbrock import (
+    evaluate_rosenbrock,
+    make_rosenbrock_vocs,
+)
+from xopt.resources.test_functions.sinusoid_1d import evaluate_sinusoid, sinusoid_vocs
+
+PROBLEMS = {
+    "sinusoid_1d": (sinusoid_vocs, evaluate_sinusoid),
+    "rosenbrock_2d": (make_rosenbrock_vocs(2), evaluate_rosenbrock),
+    "rosenbrock_4d": (make_rosenbrock_vocs(4), evaluate_rosenbrock),
+}
+
+
+def run(vocs, function, dtype, n_steps, n_threads, seed):
+    options = UpperConfidenceBoundGenerator.default_options()
+    options.dtype = dtype
+    options.n_threads = n_threads
+    generator = UpperConfidenceBoundGenerator(vocs, options)
+    X = Xopt(generator=generator, evaluator=Evaluator(function=function), vocs=vocs)
+
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    X.evaluate_data(pd.DataFrame(vocs.random_inputs(5)))
+
+    generate_times = []
+    for _ in range(n_steps):
+        start = time.perf_counter()
+        candidates = pd.DataFrame(X.generator.generate(1))
+        generate_times.append(time.perf_counter() - start)
+        X.evaluate_data(candidates)
+
+    feasible = vocs.feasibility_data(X.data)["feasible"]
+    objective = vocs.objective_data(X.data, "")[vocs.objective_names[0]]
+    return np.mean(generate_times), objective[feasible].min()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    rows = []
+    for name, (vocs, function) in PROBLEMS.items():
+        for dtype in ["float64", "float32"]:
+            results = np.array(
+                [
+                    run(vocs, function, dtype, args.steps, args.threads, seed)
+                    for seed in range(args.seeds)
+                ]
+            )
+            rows.append(
+                {
+                    "problem": name,
+                    "dtype": dtype,
+                    "generate_time": results[:, 0].mean(),
+                    "best_objective": np.nanmean(results[:, 1]),
+                }
+            )
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
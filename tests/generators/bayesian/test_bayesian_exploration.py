@@ -16,6 +16,11 @@ class TestBayesianExplorationGenerator:
                 TEST_VOCS_BASE, UpperConfidenceBoundOptions()
             )
 
+        options = BayesianExplorationGenerator.default_options()
+        options.acq.cost_aware = True
+        with pytest.raises(ValueError):
+            BayesianExplorationGenerator(TEST_VOCS_BASE, options)
+
     def test_generate(self):
         gen = BayesianExplorationGenerator(
             TEST_VOCS_BASE,
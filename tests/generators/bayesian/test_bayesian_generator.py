@@ -129,3 +129,97 @@ class TestBayesianGenerator(TestCase):
         gen.add_data(pd.DataFrame({"x1": [0.5], "x2": [5.0], "y1": [0.5], "c1": [0.5]}))
         bounds = gen._get_bounds()
         assert torch.allclose(bounds, torch.tensor([[0.4, 3.0], [0.6, 7.0]]).to(bounds))
+
+    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
+    def test_training_subset(self):
+        gen = BayesianGenerator(TEST_VOCS_BASE, BayesianGenerator.default_options())
+        gen.add_data(TEST_VOCS_DATA)
+
+        # default uses all of the data
+        assert len(gen.get_training_subset(gen.data)) == len(TEST_VOCS_DATA)
+
+        # train only on nearest neighbors to the last point
+        gen.options.training.n_nearest_neighbors = 4
+        subset = gen.get_training_subset(gen.data)
+        assert len(subset) == 4
+        assert TEST_VOCS_DATA.index[-1] in subset.index
+        model = gen.train_model()
+        assert len(model.models[0].train_inputs[0]) == 4
+
+        # nearest neighbors should be closest in normalized space
+        lower, upper = TEST_VOCS_BASE.bounds
+        x = (TEST_VOCS_DATA[TEST_VOCS_BASE.variable_names].to_numpy() - lower) / (
+            upper - lower
+        )
+        distance = np.linalg.norm(x - x[-1], axis=-1)
+        assert set(subset.index) == set(np.argsort(distance)[:4])
+
+        # train only on points within a radius of the last point
+        gen.options.training.n_nearest_neighbors = None
+        gen.options.training.neighborhood_radius = 0.5
+        subset = gen.get_training_subset(gen.data)
+        assert set(subset.index) == set(np.flatnonzero(distance <= 0.5))
+
+        # combine both options
+        gen.options.training.n_nearest_neighbors = 2
+        gen.options.training.neighborhood_radius = 1e-6
+        subset = gen.get_training_subset(gen.data)
+        assert len(subset) == 1
+
+    @patch.multiple(BayesianGenerator, __abstractmethods__=set())
+    def test_aggregate_duplicates(self):
+        gen = BayesianGenerator(TEST_VOCS_BASE, BayesianGenerator.default_options())
+
+        # five settings, each measured three times
+        x = np.array([[0.15, 1.5], [0.25, 2.5], [0.45, 4.5], [0.65, 6.5], [0.85, 8.5]])
+        inputs = np.repeat(x, 3, axis=0)
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(
+            {
+                "x1": inputs[:, 0],
+                "x2": inputs[:, 1],
+                "y1": inputs[:, 1] + rng.normal(0.0, 0.1, len(inputs)),
+                "c1": inputs[:, 0] + rng.normal(0.0, 0.1, len(inputs)),
+            }
+        ).sample(frac=1.0, random_state=0)
+
+        aggregated, n_repeats, sum_squares = gen.aggregate_duplicates(data)
+        assert len(aggregated) == 5
+        assert np.all(n_repeats == 3)
+        order = np.argsort(aggregated["x1"].to_numpy())
+        grouped = data.groupby(["x1", "x2"])
+        expected = grouped.mean().reset_index()
+        assert np.allclose(aggregated[["x1", "x2", "y1", "c1"]].iloc[order], expected)
+        expected = grouped[["y1", "c1"]].var(ddof=0) * 3
+        assert np.allclose(sum_squares[["y1", "c1"]].iloc[order], expected)
+
+        # points that are close in normalized space are grouped with a tolerance
+        perturbed = data.copy()
+        perturbed["x1"] += rng.uniform(-1e-4, 1e-4, len(data))
+        assert len(gen.aggregate_duplicates(perturbed)[0]) == len(data)
+        gen.options.training.duplicate_tolerance = 0.01
+        assert len(gen.aggregate_duplicates(perturbed)[0]) == 5
+
+        # points within the tolerance are grouped regardless of grid cell edges
+        straddling = pd.DataFrame(
+            {"x1": [0.5049, 0.5051], "x2": [5.0, 5.0], "y1": [1.0, 2.0], "c1": 0.0}
+        )
+        aggregated, n_repeats, sum_squares = gen.aggregate_duplicates(straddling)
+        assert len(aggregated) == 1
+        assert np.all(n_repeats == 2)
+        assert np.allclose(sum_squares["y1"], 0.5)
+
+        # train on aggregated data, the noise of each point is scaled by the number
+        # of repeats
+        gen.options.training.aggregate_duplicates = True
+        model = gen.train_model(perturbed)
+        for sub_model in model.models:
+            assert len(sub_model.train_inputs[0]) == 5
+            likelihood = sub_model.likelihood
+            train_X = sub_model.train_inputs[0]
+            train_noise = likelihood.noise_covar(train_X).diag()
+            assert torch.allclose(train_noise, likelihood.noise / 3.0)
+
+            # other inputs have the noise of a single measurement
+            test_noise = likelihood.noise_covar(train_X + 0.01).diag()
+            assert torch.allclose(test_noise, likelihood.noise)
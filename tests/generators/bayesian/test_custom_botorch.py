@@ -1,6 +1,51 @@
+import math
+import time
+from copy import deepcopy
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
 import torch
+from botorch.acquisition import qExpectedImprovement, qUpperConfidenceBound
+from botorch.models import SingleTaskGP
+from botorch.models.transforms import Normalize
+from gpytorch import ExactMarginalLogLikelihood
 
+from xopt.generators.bayesian.bayesian_exploration import (
+    BayesianExplorationGenerator,
+    qPosteriorVariance,
+)
+from xopt.generators.bayesian.custom_botorch import monte_carlo
+from xopt.generators.bayesian.custom_botorch.analytic import (
+    AnalyticExpectedImprovement,
+    AnalyticPosteriorVariance,
+    AnalyticUpperConfidenceBound,
+    log_ei_helper,
+)
+from xopt.generators.bayesian.custom_botorch.constrained_acqusition import (
+    ConstrainedMCAcquisitionFunction,
+)
 from xopt.generators.bayesian.custom_botorch.constraint_transform import Constraint
+from xopt.generators.bayesian.custom_botorch.cost_aware import (
+    CostAwareAcquisitionFunction,
+)
+from xopt.generators.bayesian.custom_botorch.likelihoods import (
+    create_repeated_measurement_likelihood,
+)
+from xopt.generators.bayesian.custom_botorch.optimize import (
+    optimize_acqf_dense,
+    optimize_acqf_with_deadline,
+)
+from xopt.generators.bayesian.objectives import (
+    create_constraint_callables,
+    create_constraint_indices,
+    create_objective_weights,
+)
+from xopt.generators.bayesian.upper_confidence_bound import (
+    UpperConfidenceBoundGenerator,
+)
+from xopt.resources.testing import TEST_VOCS_BASE, TEST_VOCS_DATA
+from xopt.vocs import VOCS
 
 
 class TestCustomBotorch:
@@ -42,3 +87,389 @@ class TestCustomBotorch:
                 0
             ]
             assert torch.allclose(untransformed_tensor, test_tensor)
+
+    def test_repeated_measurement_likelihood(self):
+        torch.manual_seed(0)
+        x = torch.rand(5, 2).double()
+        n_repeats = torch.tensor([3, 1, 2, 4, 1]).double()
+        groups = torch.repeat_interleave(torch.arange(5), n_repeats.long())
+        raw_x = x[groups]
+        raw_y = raw_x.sum(-1, keepdim=True).sin() + 0.1 * torch.randn(len(groups), 1)
+        y = torch.stack([raw_y[groups == i].mean(0) for i in range(5)])
+        sum_squares = torch.stack(
+            [((raw_y[groups == i] - y[i]) ** 2).sum() for i in range(5)]
+        )
+
+        bounds = torch.tensor([[0.0, 0.0], [1.0, 1.0]]).double()
+        raw_model = SingleTaskGP(
+            raw_x, raw_y, input_transform=Normalize(2, bounds=bounds)
+        )
+        likelihood = create_repeated_measurement_likelihood(n_repeats)
+        model = SingleTaskGP(
+            x, y, input_transform=Normalize(2, bounds=bounds), likelihood=likelihood
+        )
+        likelihood.noise_covar.set_train_data(
+            [x, model.input_transform(x)], sum_squares
+        )
+
+        # use the same hyperparameters for both models
+        model.load_state_dict(raw_model.state_dict(), strict=False)
+        likelihood.noise = raw_model.likelihood.noise.detach()
+
+        # the likelihood of the aggregated data includes the spread of the
+        # repeated measurements, such that it is equal to that of all measurements
+        mlls = []
+        for m in [raw_model, model]:
+            m.train()
+            mll = ExactMarginalLogLikelihood(m.likelihood, m)
+            output = m(*m.train_inputs)
+            mlls.append(
+                mll(output, m.train_targets, *m.train_inputs) * len(m.train_targets)
+            )
+        assert torch.allclose(mlls[0], mlls[1])
+
+        # predictions are equal to those of a model trained on all measurements,
+        # including those for batches of the same size as the training data
+        raw_model.eval()
+        model.eval()
+        for test_x in [torch.rand(3, 2).double(), torch.rand(5, 2).double()]:
+            for observation_noise in [False, True]:
+                raw_posterior = raw_model.posterior(
+                    test_x, observation_noise=observation_noise
+                )
+                posterior = model.posterior(test_x, observation_noise=observation_noise)
+                assert torch.allclose(raw_posterior.mean, posterior.mean)
+                assert torch.allclose(raw_posterior.variance, posterior.variance)
+
+    def test_log_ei_helper(self):
+        u = torch.linspace(-30, 10, 101).double()
+        normal = torch.distributions.Normal(0.0, 1.0)
+        expected = torch.log(normal.log_prob(u).exp() + u * normal.cdf(u))
+
+        # compare where the direct computation is accurate
+        mask = u > -5
+        assert torch.allclose(log_ei_helper(u)[mask], expected[mask], rtol=1e-6)
+
+        # compare with the leading order asymptotic expansion for large negative u
+        u = torch.tensor([-30.0, -100.0]).double()
+        expected = -(u**2) / 2 - math.log(2 * math.pi) / 2 - 2 * u.abs().log()
+        assert torch.allclose(log_ei_helper(u), expected, rtol=1e-3)
+
+        # stable (finite and monotonic) far from the incumbent
+        result = log_ei_helper(torch.tensor([-1e3, -1e7, -1e2]).double())
+        assert torch.all(torch.isfinite(result))
+        assert result[1] < result[0] < result[2]
+
+    def test_analytic_acquisition(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        gen = UpperConfidenceBoundGenerator(vocs)
+        gen.options.acq.monte_carlo_samples = 4096
+        gen.options.acq.beta = 2.0
+
+        # use fixed data and samples, monte carlo estimates are noisy near zero
+        torch.manual_seed(0)
+        x = np.random.default_rng(0).random((10, 2)) * np.array([1.0, 10.0])
+        data = pd.DataFrame(
+            {"x1": x[:, 0], "x2": x[:, 1], "y1": x[:, 1], "c1": x[:, 0]}
+        )
+        model = gen.train_model(data)
+
+        weights = create_objective_weights(vocs)
+        X = torch.rand(20, 1, 2).double() * torch.tensor([1.0, 10.0]).double()
+
+        # unconstrained UCB is equivalent to qUCB for q=1
+        analytic = AnalyticUpperConfidenceBound(model, 2.0, weights)
+        mc = qUpperConfidenceBound(
+            model, 2.0, sampler=gen.sampler, objective=gen.objective
+        )
+        with torch.no_grad():
+            assert torch.allclose(analytic(X), mc(X), rtol=0.01, atol=0.01)
+
+        # exploration
+        analytic = AnalyticPosteriorVariance(model, weights)
+        mc = qPosteriorVariance(model, sampler=gen.sampler, objective=gen.objective)
+        with torch.no_grad():
+            assert torch.allclose(analytic(X), mc(X), rtol=0.05, atol=0.01)
+
+        # expected improvement
+        best_f = torch.tensor(-1.0).double()
+        analytic = AnalyticExpectedImprovement(model, best_f, weights, log=False)
+        log_analytic = AnalyticExpectedImprovement(model, best_f, weights)
+        mc = qExpectedImprovement(
+            model, best_f, sampler=gen.sampler, objective=gen.objective
+        )
+        with torch.no_grad():
+            assert torch.allclose(analytic(X), mc(X), rtol=0.05, atol=0.01)
+            assert torch.allclose(log_analytic(X).exp(), analytic(X))
+
+    def test_analytic_candidates(self):
+        # analytic and monte carlo paths should give the same candidates
+        vocs = VOCS(
+            variables={"x1": [0.0, 1.0], "x2": [0.0, 1.0]},
+            objectives={"y1": "MINIMIZE"},
+        )
+        x = np.random.default_rng(0).random((20, 2))
+        data = pd.DataFrame({"x1": x[:, 0], "x2": x[:, 1]})
+        data["y1"] = (data["x1"] - 0.3) ** 2 + (data["x2"] - 0.6) ** 2
+
+        candidates = []
+        for use_analytic in [True, False]:
+            gen = UpperConfidenceBoundGenerator(
+                vocs, UpperConfidenceBoundGenerator.default_options()
+            )
+            gen.options.acq.use_analytic = use_analytic
+            gen.options.acq.beta = 0.1
+            gen.options.acq.monte_carlo_samples = 512
+            gen.options.optim.use_nearby_initial_points = False
+            gen.options.optim.raw_samples = 128
+            gen.options.optim.num_restarts = 5
+            gen.add_data(data)
+            candidates += [gen.generate(1).to_numpy()]
+
+        assert np.allclose(*candidates, atol=0.02)
+
+    def test_analytic_constrained(self):
+        # the optimum lies on the boundary of the constraint
+        vocs = VOCS(
+            variables={"x1": [0.0, 1.0], "x2": [0.0, 1.0]},
+            objectives={"y1": "MAXIMIZE"},
+            constraints={"c1": ["LESS_THAN", 0.09]},
+        )
+        x = np.random.default_rng(0).random((30, 2))
+        data = pd.DataFrame({"x1": x[:, 0], "x2": x[:, 1]})
+        data["y1"] = data["x1"] + data["x2"]
+        data["c1"] = (data["x1"] - 0.5) ** 2 + (data["x2"] - 0.5) ** 2
+
+        gen = UpperConfidenceBoundGenerator(
+            vocs, UpperConfidenceBoundGenerator.default_options()
+        )
+        gen.options.acq.monte_carlo_samples = 4096
+        model = gen.train_model(data)
+
+        # analytic acquisition functions weighted by the probability of
+        # feasibility are equivalent to the monte carlo constraint weighting
+        weights = create_objective_weights(vocs)
+        indices = create_constraint_indices(vocs)
+        best_f = torch.tensor(data["y1"].max()).double()
+        acquisitions = [
+            (
+                AnalyticUpperConfidenceBound(model, 2.0, weights, indices),
+                qUpperConfidenceBound(
+                    model, 2.0, sampler=gen.sampler, objective=gen.objective
+                ),
+            ),
+            (
+                AnalyticExpectedImprovement(model, best_f, weights, indices, log=False),
+                qExpectedImprovement(
+                    model, best_f, sampler=gen.sampler, objective=gen.objective
+                ),
+            ),
+            (
+                AnalyticPosteriorVariance(model, weights, indices),
+                qPosteriorVariance(model, sampler=gen.sampler, objective=gen.objective),
+            ),
+        ]
+        torch.manual_seed(0)
+        X = torch.rand(50, 1, 2).double()
+        for analytic, base in acquisitions:
+            mc = ConstrainedMCAcquisitionFunction(
+                model, base, create_constraint_callables(vocs), infeasible_cost=0.0
+            )
+            with torch.no_grad():
+                assert torch.allclose(analytic(X), mc(X), rtol=0.05, atol=0.01)
+
+        # candidates are the same up to optimizer tolerance
+        for generator_class in [
+            UpperConfidenceBoundGenerator,
+            BayesianExplorationGenerator,
+        ]:
+            candidates = []
+            for use_analytic in [True, False]:
+                options = generator_class.default_options()
+                options.acq.use_analytic = use_analytic
+                options.acq.monte_carlo_samples = 512
+                options.optim.use_nearby_initial_points = False
+                options.optim.raw_samples = 128
+                options.optim.num_restarts = 5
+                gen = generator_class(vocs, options)
+                gen.add_data(data)
+                torch.manual_seed(0)
+                candidates += [gen.generate(1)[vocs.variable_names].to_numpy()]
+            assert np.allclose(*candidates, atol=0.01)
+
+    def test_constrained_acquisition_shared_posterior(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        gen = UpperConfidenceBoundGenerator(
+            vocs, UpperConfidenceBoundGenerator.default_options()
+        )
+        gen.options.acq.use_analytic = False
+        model = gen.train_model(TEST_VOCS_DATA)
+
+        base_acquisitions = [
+            monte_carlo.qUpperConfidenceBound(
+                model, 2.0, sampler=gen.sampler, objective=gen.objective
+            ),
+            monte_carlo.qExpectedImprovement(
+                model, -1.0, sampler=gen.sampler, objective=gen.objective
+            ),
+            qPosteriorVariance(model, sampler=gen.sampler, objective=gen.objective),
+        ]
+        X = torch.rand(20, 1, 2).double() * torch.tensor([1.0, 10.0]).double()
+        for base in base_acquisitions:
+            acq = ConstrainedMCAcquisitionFunction(
+                model, base, create_constraint_callables(vocs)
+            )
+
+            # a single posterior computation per forward pass
+            with patch.object(
+                model, "posterior", wraps=model.posterior
+            ) as posterior, torch.no_grad():
+                value = acq(X)
+            assert posterior.call_count == 1
+
+            # same result as evaluating the base acquisition function separately
+            with torch.no_grad():
+                samples = gen.sampler(model.posterior(X))
+                feasibility = acq.objective(samples, X=X).max(dim=-1)[0].mean(dim=0)
+                assert torch.allclose(value, base(X) * feasibility)
+
+        # same values as the botorch acquisition functions
+        botorch_acquisitions = [
+            qUpperConfidenceBound(
+                model, 2.0, sampler=gen.sampler, objective=gen.objective
+            ),
+            qExpectedImprovement(
+                model, -1.0, sampler=gen.sampler, objective=gen.objective
+            ),
+        ]
+        for base, botorch_base in zip(base_acquisitions, botorch_acquisitions):
+            with torch.no_grad():
+                assert torch.allclose(base(X), botorch_base(X))
+
+            # acquisition functions without `sample_forward` are called directly
+            acq = ConstrainedMCAcquisitionFunction(
+                model, botorch_base, create_constraint_callables(vocs)
+            )
+            expected = ConstrainedMCAcquisitionFunction(
+                model, base, create_constraint_callables(vocs)
+            )
+            with patch.object(
+                model, "posterior", wraps=model.posterior
+            ) as posterior, torch.no_grad():
+                assert torch.allclose(acq(X), expected(X))
+            assert posterior.call_count == 3
+
+    def test_optimize_acqf_with_deadline(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        gen = UpperConfidenceBoundGenerator(
+            vocs, UpperConfidenceBoundGenerator.default_options()
+        )
+        model = gen.train_model(TEST_VOCS_DATA)
+        acq = gen.get_acquisition(model)
+        bounds = torch.tensor(vocs.bounds).double()
+        initial_conditions = torch.rand(5, 1, 2).double() * bounds[1]
+        with torch.no_grad():
+            initial_values = acq(initial_conditions)
+
+        # deadline in the past returns the best initial condition
+        candidate, value, reached = optimize_acqf_with_deadline(
+            acq, bounds, 5, 0.0, batch_initial_conditions=initial_conditions
+        )
+        assert reached
+        assert candidate.shape == torch.Size([1, 2])
+        assert torch.allclose(candidate, initial_conditions[initial_values.argmax()])
+
+        # optimization improves on the initial conditions
+        candidate, value, reached = optimize_acqf_with_deadline(
+            acq,
+            bounds,
+            5,
+            time.time() + 100.0,
+            batch_initial_conditions=initial_conditions,
+        )
+        assert not reached
+        assert value >= initial_values.max()
+        assert torch.all(candidate >= bounds[0]) and torch.all(candidate <= bounds[1])
+
+    def test_optimize_acqf_dense(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        gen = UpperConfidenceBoundGenerator(
+            vocs, UpperConfidenceBoundGenerator.default_options()
+        )
+        model = gen.train_model(TEST_VOCS_DATA)
+        acq = gen.get_acquisition(model)
+        bounds = torch.tensor(vocs.bounds).double()
+
+        # evaluating in batches gives the same result as a single batch
+        candidate, value, reached = optimize_acqf_dense(acq, bounds, 256, seed=0)
+        assert not reached
+        assert candidate.shape == torch.Size([1, 2])
+        batched = optimize_acqf_dense(acq, bounds, 256, batch_size=10, seed=0)
+        assert torch.allclose(candidate, batched[0])
+        with torch.no_grad():
+            assert torch.allclose(value, acq(candidate.unsqueeze(0)))
+
+        # polishing does not decrease the acquisition value
+        polished, polished_value, _ = optimize_acqf_dense(
+            acq, bounds, 256, num_polish=2, seed=0
+        )
+        assert polished_value >= value
+        assert torch.all(polished >= bounds[0]) and torch.all(polished <= bounds[1])
+
+        # deadline in the past evaluates a single batch
+        _, deadline_value, reached = optimize_acqf_dense(
+            acq, bounds, 256, batch_size=10, deadline=0.0, seed=0
+        )
+        assert reached
+        assert deadline_value <= value
+
+    def test_cost_aware_acquisition(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        gen = UpperConfidenceBoundGenerator(
+            vocs, UpperConfidenceBoundGenerator.default_options()
+        )
+        data = deepcopy(TEST_VOCS_DATA)
+        data["xopt_runtime"] = np.exp(3.0 * data["x1"])
+        model = gen.train_model(data)
+        cost_model = gen.train_cost_model(data)
+
+        base = AnalyticExpectedImprovement(
+            model, -1.0, create_objective_weights(vocs), log=False
+        )
+        acq = CostAwareAcquisitionFunction(base, cost_model)
+        X = torch.rand(20, 1, 2).double() * torch.tensor([1.0, 10.0]).double()
+        with torch.no_grad():
+            value = base(X)
+            cost = acq.log_expected_cost(X).exp()
+            assert torch.all(cost >= acq.min_cost)
+            assert torch.allclose(acq(X), value / cost)
+
+            # a clearly larger improvement at a moderately higher cost is
+            # preferred over a near-zero improvement at a lower cost
+            def evaluate(acq_function, values, costs):
+                with patch.object(
+                    AnalyticExpectedImprovement, "forward", return_value=values
+                ), patch.object(acq_function.cost_model, "posterior") as posterior:
+                    posterior.return_value.mean = costs.log().reshape(-1, 1, 1)
+                    posterior.return_value.variance = torch.zeros(len(costs), 1, 1)
+                    return acq_function(X[: len(costs)])
+
+            values = torch.tensor([1e-6, 1e-3]).double()
+            costs = torch.tensor([1.0, 2.0]).double()
+            result = evaluate(acq, values, costs)
+            assert result.argmax() == 1
+            assert torch.allclose(result, values / costs)
+
+            # the expected cost is clamped below
+            result = evaluate(acq, values, torch.tensor([1e-6, 1e-6]).double())
+            assert torch.allclose(result, values / acq.min_cost)
+
+        # log acquisition functions subtract the log cost
+        log_base = AnalyticExpectedImprovement(
+            model, -1.0, create_objective_weights(vocs)
+        )
+        acq = CostAwareAcquisitionFunction(log_base, cost_model, log=True)
+        with torch.no_grad():
+            assert torch.allclose(acq(X), log_base(X) - acq.log_expected_cost(X))
+            result = evaluate(acq, values.log(), costs)
+            assert result.argmax() == 1
@@ -1,5 +1,6 @@
 from copy import deepcopy
 
+import numpy as np
 import pytest
 
 from xopt.base import Xopt
@@ -39,6 +40,23 @@ class TestUpperConfidenceBoundGenerator:
         # candidate = gen.generate(2)
         # assert len(candidate) == 2
 
+    def test_generate_cost_aware(self):
+        options = ExpectedImprovementGenerator.default_options()
+        options.acq.cost_aware = True
+        gen = ExpectedImprovementGenerator(TEST_VOCS_BASE, options)
+
+        # cost aware acquisition requires runtime data
+        gen.data = TEST_VOCS_DATA
+        with pytest.raises(ValueError):
+            gen.generate(1)
+
+        data = deepcopy(TEST_VOCS_DATA)
+        data["xopt_runtime"] = np.exp(3.0 * data["x1"])
+        gen.data = data
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert gen._cost_model is not None
+
     def test_generate_w_overlapping_objectives_constraints(self):
         test_vocs = deepcopy(TEST_VOCS_BASE)
         test_vocs.constraints = {"y1": ["GREATER_THAN", 0.0]}
@@ -1,6 +1,7 @@
 from copy import deepcopy
 
 import numpy as np
+import pandas as pd
 import pytest
 import yaml
 
@@ -80,3 +81,73 @@ class TestBayesianExplorationGenerator:
         X = Xopt(config=yaml.safe_load(YAML))
         X.step()
         X.step()
+
+    def test_pareto_front_cache(self):
+        gen = MOBOGenerator(tnk_vocs, MOBOGenerator.default_options())
+        x = np.random.default_rng(0).random((30, 2)) * 3.14159
+        data = pd.DataFrame([evaluate_TNK({"x1": ele[0], "x2": ele[1]}) for ele in x])
+        data["x1"], data["x2"] = x[:, 0], x[:, 1]
+
+        # incrementally add data, compare to brute force non-dominated sorting
+        for index in np.array_split(np.arange(30), 3):
+            gen.add_data(data.iloc[index])
+            positions = gen.get_pareto_front_positions()
+
+            objectives = tnk_vocs.objective_data(gen.data, "").to_numpy()
+            feasible = tnk_vocs.feasibility_data(gen.data)["feasible"].to_numpy()
+            expected = []
+            for j in np.flatnonzero(feasible):
+                dominated = np.all(objectives[feasible] <= objectives[j], axis=-1) & (
+                    np.any(objectives[feasible] < objectives[j], axis=-1)
+                )
+                if not np.any(dominated):
+                    expected += [j]
+            assert set(positions) == set(expected)
+
+        # hypervolume is tracked after each update
+        history = gen.hypervolume_history
+        assert list(history["n_evaluations"]) == [10, 20, 30]
+        assert all(history["hypervolume"].diff().dropna() >= 0)
+
+        # replacing the data with different data of the same length resets the
+        # cached front
+        replaced = data.iloc[::-1].reset_index(drop=True)
+        replaced.loc[0, ["y1", "y2"]] = [-1.0, -1.0]
+        replaced.loc[0, ["c1", "c2"]] = [1.0, 0.0]
+        gen.data = replaced
+        assert list(gen.get_pareto_front_positions()) == [0]
+
+        gen.data = data
+        # baseline is capped, observed pareto optimal points are kept
+        gen.options.acq.max_baseline_points = len(positions) + 2
+        baseline = gen.get_baseline_data()
+        assert len(baseline) == len(positions) + 2
+        assert set(gen.data.index[positions]).issubset(baseline.index)
+        assert set(gen.data.index[-2:]).issubset(baseline.index)
+
+    def test_partitioning_alpha(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        vocs.objectives.update({"y2": "MINIMIZE"})
+        gen = MOBOGenerator(vocs, MOBOGenerator.default_options())
+        assert gen.get_partitioning_alpha() == 0.0
+
+        vocs.objectives.update({"y3": "MINIMIZE", "y4": "MINIMIZE"})
+        gen = MOBOGenerator(vocs, MOBOGenerator.default_options())
+        assert gen.get_partitioning_alpha() > 0.0
+
+        gen.options.acq.partitioning_alpha = 0.0
+        assert gen.get_partitioning_alpha() == 0.0
+
+    def test_capped_baseline_generate(self):
+        evaluator = Evaluator(function=evaluate_TNK)
+        options = MOBOGenerator.default_options()
+        options.optim.raw_samples = 2
+        options.acq.monte_carlo_samples = 2
+        options.acq.max_baseline_points = 3
+        options.acq.partitioning_alpha = 1e-3
+        options.n_initial = 5
+        generator = MOBOGenerator(tnk_vocs, options)
+        X = Xopt(generator=generator, evaluator=evaluator, vocs=tnk_vocs)
+        X.step()
+        X.step()
+        assert len(X.data) == 6
@@ -0,0 +1,138 @@
+import time
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+from xopt.generators.bayesian.multi_fidelity import MultiFidelityGenerator
+from xopt.generators.bayesian.options import BayesianOptions
+from xopt.resources.testing import TEST_VOCS_BASE
+
+MF_VOCS = deepcopy(TEST_VOCS_BASE)
+MF_VOCS.variables["s"] = [0.0, 1.0]
+
+
+def mf_function(input_dict):
+    x1, x2, s = input_dict["x1"], input_dict["x2"], input_dict["s"]
+    return {"y1": (x2 - 5.0) ** 2 + (1.0 - s) * x1, "c1": x1}
+
+
+def get_data(n=8):
+    np.random.seed(0)
+    data = pd.DataFrame(
+        {
+            "x1": np.random.rand(n),
+            "x2": np.random.rand(n) * 10.0,
+            "s": np.random.choice([0.0, 1.0], n),
+        }
+    )
+    outputs = pd.DataFrame([mf_function(ele) for ele in data.to_dict("records")])
+    return pd.concat([data, outputs], axis=1)
+
+
+def get_generator(vocs=MF_VOCS):
+    options = MultiFidelityGenerator.default_options()
+    options.acq.fidelity_parameter = "s"
+    options.acq.num_fantasies = 2
+    options.acq.monte_carlo_samples = 4
+    options.optim.num_restarts = 1
+    options.optim.raw_samples = 4
+    return MultiFidelityGenerator(vocs, options)
+
+
+class TestMultiFidelityGenerator:
+    def test_init(self):
+        gen = get_generator()
+        gen.options.dict()
+        gen.options.schema()
+        assert gen.fidelity_index == MF_VOCS.variable_names.index("s")
+        assert gen.target_fidelity == 1.0
+
+        with pytest.raises(ValueError):
+            MultiFidelityGenerator(MF_VOCS, BayesianOptions())
+
+        # fidelity parameter must be a variable
+        with pytest.raises(ValueError):
+            MultiFidelityGenerator(MF_VOCS, MultiFidelityGenerator.default_options())
+
+        options = MultiFidelityGenerator.default_options()
+        options.acq.fidelity_parameter = "s"
+        options.acq.cost_aware = True
+        with pytest.raises(ValueError):
+            MultiFidelityGenerator(MF_VOCS, options)
+
+    def test_generate(self):
+        gen = get_generator()
+        gen.add_data(get_data())
+
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert 0.0 <= candidate["s"].iloc[0] <= 1.0
+
+        # acquisition function is evaluated on single points without fantasies
+        acq = gen.get_acquisition(gen.model)
+        assert acq.get_augmented_q_batch_size(1) == 1 + gen.options.acq.num_fantasies
+
+    def test_generate_time_budget(self):
+        gen = get_generator()
+        gen.options.optim.time_budget = 0.0
+        gen.add_data(get_data())
+
+        start = time.time()
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert gen.time_budget_reached
+        assert time.time() - start < 30.0
+
+    def test_recommendation(self):
+        gen = get_generator()
+        gen.add_data(get_data())
+
+        recommendation = gen.get_recommendation()
+        assert len(recommendation) == 1
+        assert recommendation["s"].iloc[0] == 1.0
+
+        gen = get_generator()
+        with pytest.raises(ValueError):
+            gen.get_recommendation()
+
+    def test_in_xopt(self):
+        YAML = """
+        xopt: {}
+        generator:
+            name: multi_fidelity
+            n_initial: 3
+            optim:
+                num_restarts: 1
+                raw_samples: 4
+            acq:
+                fidelity_parameter: s
+                fidelity_costs: [0.2, 1.0]
+                num_fantasies: 2
+                monte_carlo_samples: 4
+
+        evaluator:
+            function: tests.generators.bayesian.test_multi_fidelity.mf_function
+
+        vocs:
+            variables:
+                x1: [0, 1]
+                x2: [0, 10]
+                s: [0, 1]
+            objectives: {y1: MINIMIZE}
+        """
+        X = Xopt(config=yaml.safe_load(YAML))
+        X.step()
+        X.step()
+        assert len(X.data) == 4
+
+        evaluator = Evaluator(function=mf_function)
+        X = Xopt(generator=get_generator(), evaluator=evaluator, vocs=MF_VOCS)
+        X.step()
+        X.step()
+        assert len(X.data) == 4
+        assert X.generator.get_recommendation()["s"].iloc[0] == 1.0
@@ -0,0 +1,102 @@
+from copy import deepcopy
+
+import pandas as pd
+import pytest
+import torch
+import yaml
+
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+from xopt.generators.bayesian.mobo import MOBOOptions
+from xopt.generators.bayesian.parego import ParEGOGenerator
+from xopt.resources.test_functions.tnk import evaluate_TNK, tnk_vocs
+from xopt.resources.testing import TEST_VOCS_BASE
+
+
+class TestParEGOGenerator:
+    def test_init(self):
+        vocs = deepcopy(TEST_VOCS_BASE)
+        vocs.objectives.update({"y2": "MINIMIZE"})
+        gen = ParEGOGenerator(vocs)
+        gen.options.dict()
+        gen.options.schema()
+
+        with pytest.raises(ValueError):
+            ParEGOGenerator(vocs, MOBOOptions())
+
+    def test_scalarization(self):
+        gen = ParEGOGenerator(tnk_vocs, ParEGOGenerator.default_options())
+        gen.options.acq.ref_point = [-2.0, -2.0]
+        objective_values = torch.tensor([[-1.0, 0.0], [0.0, -1.0]]).double()
+
+        weights = torch.tensor([0.5, 0.5]).double()
+        scalarization = gen.get_scalarization(weights, objective_values)
+
+        # reference point maps to zero, the best observed values map to one
+        values = scalarization(torch.tensor([[-2.0, -2.0], [0.0, 0.0]]).double())
+        alpha = gen.options.acq.chebyshev_alpha
+        assert torch.allclose(values, torch.tensor([0.0, 0.5 + alpha]).double())
+
+        # scalarization depends on the weights
+        weights = torch.tensor([0.1, 0.9]).double()
+        scalarization = gen.get_scalarization(weights, objective_values)
+        values = scalarization(objective_values)
+        assert values[1] > values[0]
+
+    def test_generate(self):
+        gen = ParEGOGenerator(tnk_vocs, ParEGOGenerator.default_options())
+        gen.options.optim.raw_samples = 2
+        gen.options.optim.num_restarts = 1
+        gen.options.acq.monte_carlo_samples = 4
+
+        data = pd.DataFrame({"x1": [0.5, 1.0, 1.5, 2.0], "x2": [2.0, 1.5, 1.0, 0.5]})
+        data = pd.concat(
+            [
+                data,
+                pd.DataFrame([evaluate_TNK(ele) for ele in data.to_dict("records")]),
+            ],
+            axis=1,
+        )
+        gen.add_data(data)
+
+        # q-batch of candidates using different scalarization weights
+        candidates = gen.generate(3)
+        assert len(candidates) == 3
+        assert gen._X_pending is None
+
+    def test_in_xopt(self):
+        YAML = """
+        xopt: {}
+        generator:
+            name: parego
+            n_initial: 3
+            optim:
+                num_restarts: 1
+                raw_samples: 2
+            acq:
+                monte_carlo_samples: 4
+
+        evaluator:
+            function: xopt.resources.test_functions.tnk.evaluate_TNK
+
+        vocs:
+            variables:
+                x1: [0, 3.14159]
+                x2: [0, 3.14159]
+            objectives: {y1: MINIMIZE, y2: MINIMIZE}
+            constraints:
+                c1: [GREATER_THAN, 0]
+                c2: [LESS_THAN, 0.5]
+        """
+        X = Xopt(config=yaml.safe_load(YAML))
+        X.step()
+        X.step()
+
+        evaluator = Evaluator(function=evaluate_TNK)
+        gen = ParEGOGenerator(tnk_vocs, ParEGOGenerator.default_options())
+        gen.options.optim.raw_samples = 2
+        gen.options.optim.num_restarts = 1
+        X = Xopt(generator=gen, evaluator=evaluator, vocs=tnk_vocs)
+        X.step()
+        X.step()
+        assert len(X.data) == 4
@@ -3,8 +3,17 @@ from copy import deepcopy
 from unittest.mock import patch
 
 import numpy as np
+import pytest
+import torch
+from botorch import fit_gpytorch_model
 
-from xopt.generators.bayesian.time_dependent import TimeDependentBayesianGenerator
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+
+from xopt.generators.bayesian.time_dependent import (
+    TDTrainingOptions,
+    TimeDependentBayesianGenerator,
+)
 from xopt.generators.bayesian.upper_confidence_bound import (
     TDUpperConfidenceBoundGenerator,
 )
@@ -16,6 +25,15 @@ class TestTimeDependentBO:
     def test_init(self):
         TimeDependentBayesianGenerator(TEST_VOCS_BASE)
 
+        for refit_interval in [0, -1]:
+            with pytest.raises(ValueError):
+                TDTrainingOptions(refit_interval=refit_interval)
+
+        options = TimeDependentBayesianGenerator.default_options()
+        options.training.aggregate_duplicates = True
+        with pytest.raises(ValueError):
+            TimeDependentBayesianGenerator(TEST_VOCS_BASE, options)
+
     @patch.multiple(TimeDependentBayesianGenerator, __abstractmethods__=set())
     def test_model_generation(self):
         gen = TimeDependentBayesianGenerator(TEST_VOCS_BASE)
@@ -56,3 +74,79 @@ class TestTimeDependentBO:
 
         gen.add_data(test_data)
         gen.generate(1)
+
+    def test_release_time(self):
+        options = TDUpperConfidenceBoundGenerator.default_options()
+        options.acq.added_time = 1.0
+        options.acq.monte_carlo_samples = 1
+        options.optim.raw_samples = 1
+        options.optim.num_restarts = 1
+        gen = TDUpperConfidenceBoundGenerator(deepcopy(TEST_VOCS_BASE), options)
+
+        # candidates are evaluated at (or after) the release time
+        def evaluate(inputs):
+            return {"y1": inputs["x1"], "c1": inputs["x2"], "time": time.time()}
+
+        X = Xopt(generator=gen, evaluator=Evaluator(function=evaluate), vocs=gen.vocs)
+        for _ in range(2):
+            X.step()
+            assert np.all(X.data["time"].iloc[-1] >= gen.release_time)
+
+        # generate itself does not wait for the release time
+        gen.options.acq.added_time = 30.0
+        start = time.time()
+        gen.generate(1)
+        assert time.time() < gen.release_time
+        assert gen.release_time >= start + gen.options.acq.added_time
+
+    @patch.multiple(TimeDependentBayesianGenerator, __abstractmethods__=set())
+    def test_training_window(self):
+        gen = TimeDependentBayesianGenerator(
+            TEST_VOCS_BASE, TimeDependentBayesianGenerator.default_options()
+        )
+        test_data = deepcopy(TEST_VOCS_DATA)
+        test_data["time"] = 1000.0 + np.arange(len(test_data))
+        gen.add_data(test_data)
+
+        # only train on points within the time window
+        gen.options.training.time_window = 5.0
+        subset = gen.get_training_subset(gen.data)
+        assert set(subset.index) == set(test_data.index[-6:])
+        model = gen.train_model()
+        assert len(model.models[0].train_inputs[0]) == 6
+
+        # cap the number of training points
+        gen.options.training.max_points = 3
+        subset = gen.get_training_subset(gen.data)
+        assert set(subset.index) == set(test_data.index[-3:])
+
+    @patch.multiple(TimeDependentBayesianGenerator, __abstractmethods__=set())
+    def test_hyperparameter_reuse(self):
+        options = TimeDependentBayesianGenerator.default_options()
+        options.training.time_window = 5.0
+        options.training.refit_interval = 3
+        gen = TimeDependentBayesianGenerator(TEST_VOCS_BASE, options)
+        test_data = deepcopy(TEST_VOCS_DATA)
+        test_data["time"] = 1000.0 + np.arange(len(test_data))
+
+        with patch(
+            "xopt.generators.bayesian.models.standard.fit_gpytorch_model",
+            wraps=fit_gpytorch_model,
+        ) as fit:
+            gen.train_model(test_data.iloc[:6])
+            assert fit.call_count == 2
+            lengthscale = gen.model.models[0].covar_module.base_kernel.lengthscale
+
+            # only condition on new data, dropping expired points
+            for i in range(7, 9):
+                model = gen.train_model(test_data.iloc[:i])
+                assert fit.call_count == 2
+                assert len(model.models[0].train_inputs[0]) == 6
+                assert torch.allclose(
+                    model.models[0].covar_module.base_kernel.lengthscale,
+                    lengthscale,
+                )
+
+            # retrain hyperparameters
+            gen.train_model(test_data)
+            assert fit.call_count == 4
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+from xopt.generators.bayesian.turbo import (
+    TrustRegion,
+    TrustRegionOptions,
+    TurboGenerator,
+)
+from xopt.generators.bayesian.upper_confidence_bound import UCBOptions
+from xopt.resources.test_functions.rosenbrock import (
+    evaluate_rosenbrock,
+    make_rosenbrock_vocs,
+)
+from xopt.resources.testing import TEST_VOCS_BASE, TEST_VOCS_DATA, xtest_callable
+
+
+class TestTurboGenerator:
+    def test_init(self):
+        gen = TurboGenerator(TEST_VOCS_BASE)
+        gen.options.dict()
+        gen.options.schema()
+
+        with pytest.raises(ValueError):
+            TurboGenerator(TEST_VOCS_BASE, UCBOptions())
+
+        options = TurboGenerator.default_options()
+        options.optim.max_travel_distances = [0.1, 0.1]
+        with pytest.raises(ValueError):
+            TurboGenerator(TEST_VOCS_BASE, options)
+
+        options = TurboGenerator.default_options()
+        options.acq.proximal_lengthscales = [1.0, 1.0]
+        options.optim.num_restarts = 1
+        with pytest.raises(ValueError):
+            TurboGenerator(TEST_VOCS_BASE, options)
+
+    def test_trust_region_update(self):
+        options = TrustRegionOptions(success_tolerance=2)
+        region = TrustRegion(np.zeros(2), options, failure_tolerance=2)
+
+        # first update initializes the region
+        region.update(np.array([0.5, 0.5]), 0.0, 1.0)
+        assert region.is_initialized
+        assert np.allclose(region.center, 0.5)
+
+        # expand on success
+        region.update(np.array([0.4, 0.4]), 0.0, 0.5)
+        region.update(np.array([0.3, 0.3]), 0.0, 0.1)
+        assert region.length == options.length_max
+        assert np.allclose(region.center, 0.3)
+
+        # shrink on failure
+        region.update(np.array([0.2, 0.2]), 0.0, 2.0)
+        region.update(np.array([0.2, 0.2]), 0.0, 2.0)
+        assert region.length == options.length_max / 2.0
+        assert np.allclose(region.center, 0.3)
+
+        # infeasible points never improve on feasible ones
+        region.update(np.array([0.1, 0.1]), 1.0, -10.0)
+        assert np.allclose(region.center, 0.3)
+
+        # bounds stay inside the normalized domain
+        assert np.all(region.bounds >= 0.0) and np.all(region.bounds <= 1.0)
+
+    def test_local_data(self):
+        gen = TurboGenerator(TEST_VOCS_BASE)
+        gen.options.trust_region.min_local_points = 3
+        gen.add_data(TEST_VOCS_DATA)
+
+        region = gen._create_trust_region(np.array([0.5, 0.5]))
+        region.length = 1e-6
+        local_data = gen.get_local_data(gen.data, region)
+        assert len(local_data) == 3
+
+        region.length = 2.0
+        local_data = gen.get_local_data(gen.data, region)
+        assert len(local_data) == len(TEST_VOCS_DATA)
+
+    def test_generate(self):
+        gen = TurboGenerator(TEST_VOCS_BASE)
+        gen.options.optim.raw_samples = 1
+        gen.options.optim.num_restarts = 1
+        gen.options.acq.monte_carlo_samples = 1
+        gen.add_data(TEST_VOCS_DATA)
+
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+
+        # candidate must be inside the active trust region (up to round off)
+        region = gen.trust_regions[0]
+        x = gen._normalize(candidate[TEST_VOCS_BASE.variable_names].to_numpy())
+        lower, upper = region.bounds
+        assert np.all(x >= lower - 1e-9) and np.all(x <= upper + 1e-9)
+
+        # adding the evaluated candidate updates the trust region
+        outputs = pd.DataFrame(
+            [xtest_callable(ele) for ele in candidate.to_dict("records")],
+            index=candidate.index,
+        )
+        gen.add_data(pd.concat([candidate, outputs], axis=1))
+        assert len(gen._pending) == 0
+
+    def test_generate_initial_design(self):
+        gen = TurboGenerator(TEST_VOCS_BASE)
+        gen.options.trust_region.n_trust_regions = 2
+        gen.add_data(TEST_VOCS_DATA)
+        gen._initialize_trust_regions()
+        gen._n_generated = 1
+        region = gen.trust_regions[1]
+
+        # a new region fills the batch with points around its center
+        candidates = gen.generate(3)
+        x = gen._normalize(candidates[TEST_VOCS_BASE.variable_names].to_numpy())
+        assert len(candidates) == 3
+        assert np.allclose(x[0], region.center)
+        assert np.all(region.contains(x))
+
+        # the best point of the initial design becomes the center
+        outputs = pd.DataFrame(
+            [xtest_callable(ele) for ele in candidates.to_dict("records")],
+            index=candidates.index,
+        )
+        gen.add_data(pd.concat([candidates, outputs], axis=1))
+        violation, objective = gen._get_scores(outputs)
+        best = np.lexsort((objective, violation))[0]
+        assert region.is_initialized
+        assert np.allclose(region.center, x[best])
+        assert region.n_failures == 0 and region.n_successes == 0
+
+    def test_generate_parallel(self):
+        options = TurboGenerator.default_options()
+        options.optim.raw_samples = 4
+        options.optim.num_restarts = 1
+        options.acq.monte_carlo_samples = 16
+        gen = TurboGenerator(TEST_VOCS_BASE, options)
+        gen.add_data(TEST_VOCS_DATA)
+
+        # a single trust region generates a batch of distinct candidates
+        candidates = gen.generate(3)
+        x = gen._normalize(candidates[TEST_VOCS_BASE.variable_names].to_numpy())
+        assert len(candidates) == 3
+        assert len(np.unique(x.round(6), axis=0)) == 3
+        assert all(region is gen.trust_regions[0] for _, region, _ in gen._pending)
+        assert len(gen._pending) == 3
+
+        # further candidates account for those still being evaluated
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert len(gen._pending) == 4
+
+    def test_in_xopt_parallel(self):
+        evaluator = Evaluator(function=xtest_callable, max_workers=3)
+        options = TurboGenerator.default_options()
+        options.optim.raw_samples = 4
+        options.optim.num_restarts = 1
+        options.trust_region.n_trust_regions = 2
+        gen = TurboGenerator(TEST_VOCS_BASE, options)
+
+        X = Xopt(generator=gen, evaluator=evaluator, vocs=TEST_VOCS_BASE)
+        X.random_evaluate(3)
+
+        # every step fills all workers, cycling through the trust regions
+        for _ in range(3):
+            n_data = len(X.data)
+            X.step()
+            assert len(X.data) == n_data + 3
+
+        assert all(region.is_initialized for region in gen.trust_regions)
+        assert len(gen._pending) == 0
+
+    def test_in_xopt(self):
+        evaluator = Evaluator(function=xtest_callable)
+        gen = TurboGenerator(TEST_VOCS_BASE)
+        gen.options.optim.raw_samples = 1
+        gen.options.optim.num_restarts = 1
+        gen.options.trust_region.n_trust_regions = 2
+
+        X = Xopt(generator=gen, evaluator=evaluator, vocs=TEST_VOCS_BASE)
+
+        # initialize with random initial candidates
+        X.step()
+
+        # now use bayes opt, second region starts from its (random) center
+        for _ in range(3):
+            X.step()
+
+        assert len(gen.trust_regions) == 2
+        assert all(region.is_initialized for region in gen.trust_regions)
+
+    def test_restart(self):
+        vocs = make_rosenbrock_vocs(5)
+        evaluator = Evaluator(function=evaluate_rosenbrock)
+        gen = TurboGenerator(vocs)
+        gen.options.optim.raw_samples = 1
+        gen.options.optim.num_restarts = 1
+        gen.options.trust_region.failure_tolerance = 1
+        gen.options.trust_region.length_min = 0.5
+
+        X = Xopt(generator=gen, evaluator=evaluator, vocs=vocs)
+        X.step()
+        X.step()
+
+        # force a collapse and make sure the region is restarted
+        region = gen.trust_regions[0]
+        region.length = 0.4
+        X.step()
+        assert gen.trust_regions[0] is not region
+        assert gen.trust_regions[0].length == gen.options.trust_region.length_init
+        assert not gen.trust_regions[0].is_initialized
@@ -1,6 +1,7 @@
 from copy import deepcopy
 
 import pytest
+import torch
 
 from xopt.base import Xopt
 
@@ -20,9 +21,7 @@ class TestUpperConfidenceBoundGenerator:
         ucb_gen.options.schema()
 
         with pytest.raises(ValueError):
-            UpperConfidenceBoundGenerator(
-                TEST_VOCS_BASE, BayesianExplorationOptions()
-            )
+            UpperConfidenceBoundGenerator(TEST_VOCS_BASE, BayesianExplorationOptions())
 
     def test_generate(self):
         gen = UpperConfidenceBoundGenerator(
@@ -39,6 +38,78 @@ class TestUpperConfidenceBoundGenerator:
         # candidate = gen.generate(2)
         # assert len(candidate) == 2
 
+    def test_generate_time_budget(self):
+        gen = UpperConfidenceBoundGenerator(
+            TEST_VOCS_BASE, UpperConfidenceBoundGenerator.default_options()
+        )
+        gen.data = TEST_VOCS_DATA
+
+        # budget is spent before optimization starts, best initial point is used
+        gen.options.optim.time_budget = 0.0
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert gen.time_budget_reached
+
+        # optimization finishes inside of the budget
+        gen.options.optim.time_budget = 100.0
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert not gen.time_budget_reached
+
+    def test_generate_dense(self):
+        gen = UpperConfidenceBoundGenerator(
+            TEST_VOCS_BASE, UpperConfidenceBoundGenerator.default_options()
+        )
+        gen.options.optim.dense_samples = 512
+        gen.options.optim.dense_batch_size = 100
+        gen.options.optim.dense_polish = 2
+        gen.data = TEST_VOCS_DATA
+
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+
+        gen.options.optim.time_budget = 0.0
+        candidate = gen.generate(1)
+        assert len(candidate) == 1
+        assert gen.time_budget_reached
+
+    def test_generate_float32(self):
+        gen = UpperConfidenceBoundGenerator(
+            TEST_VOCS_BASE, UpperConfidenceBoundGenerator.default_options()
+        )
+        gen.options.dtype = "float32"
+        gen.data = TEST_VOCS_DATA
+
+        for use_analytic in [True, False]:
+            gen.options.acq.use_analytic = use_analytic
+            candidate = gen.generate(1)
+            assert len(candidate) == 1
+            assert gen.model.models[0].train_inputs[0].dtype == torch.float32
+            TEST_VOCS_BASE.validate_input_data(candidate)
+
+        # the number of torch threads is set when the generator is created
+        n_threads = torch.get_num_threads()
+        options = UpperConfidenceBoundGenerator.default_options()
+        options.n_threads = n_threads + 1
+        try:
+            UpperConfidenceBoundGenerator(TEST_VOCS_BASE, options)
+            assert torch.get_num_threads() == n_threads + 1
+        finally:
+            torch.set_num_threads(n_threads)
+
+        options = UpperConfidenceBoundGenerator.default_options()
+        options.dtype = "float16"
+        with pytest.raises(ValueError):
+            UpperConfidenceBoundGenerator(TEST_VOCS_BASE, options)
+
+    def test_cost_aware_rejected(self):
+        # upper confidence bound values can be negative, dividing them by the
+        # evaluation cost would favor expensive points
+        options = UpperConfidenceBoundGenerator.default_options()
+        options.acq.cost_aware = True
+        with pytest.raises(ValueError):
+            UpperConfidenceBoundGenerator(TEST_VOCS_BASE, options)
+
     def test_generate_w_overlapping_objectives_constraints(self):
         test_vocs = deepcopy(TEST_VOCS_BASE)
         test_vocs.constraints = {"y1": ["GREATER_THAN", 0.0]}
@@ -5,6 +5,7 @@ import torch
 
 from xopt.generators.bayesian.objectives import (
     create_constrained_mc_objective,
+    create_mc_objective,
     create_mobo_objective,
 )
 from xopt.resources.testing import TEST_VOCS_BASE
@@ -57,3 +58,15 @@ class TestUtils:
         output = obj(test_samples)
         assert torch.allclose(output[..., 1], -test_samples[..., 1])
         assert torch.allclose(output[..., 0], -test_samples[..., 0])
+
+    def test_objective_precision(self):
+        test_samples = torch.randn(3, 4, 5, 2, dtype=torch.float32)
+        assert create_mc_objective(TEST_VOCS_BASE)(test_samples).dtype == torch.float32
+        obj = create_constrained_mc_objective(TEST_VOCS_BASE)
+        assert obj.to(torch.float32)(test_samples).dtype == torch.float32
+
+        test_vocs_copy = deepcopy(TEST_VOCS_BASE)
+        test_vocs_copy.objectives["y2"] = "MAXIMIZE"
+        obj = create_mobo_objective(test_vocs_copy, {"dtype": torch.float32})
+        test_samples = torch.randn(3, 4, 5, 3, dtype=torch.float32)
+        assert obj(test_samples).dtype == torch.float32
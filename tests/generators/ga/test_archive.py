@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from xopt.generators.ga.archive import PopulationArchive
+from xopt.generators.ga.cnsga import CNSGAGenerator
+from xopt.resources.test_functions.tnk import evaluate_TNK_dataframe, tnk_vocs
+
+
+class TestPopulationArchive:
+    def test_round_trip(self, tmp_path):
+        archive = PopulationArchive(os.path.join(tmp_path, "population.npz"))
+        assert len(archive) == 0
+
+        population = pd.DataFrame(
+            {
+                "x1": np.random.rand(5),
+                "n": np.arange(5),
+                "feasible": [True, False, True, True, False],
+                "some_string": list("abcde"),
+            },
+            index=pd.Index(np.arange(10, 15), name="xopt_index"),
+        )
+        archive.append(population, 0)
+        archive.append(population.iloc[:3] * 2, 1)
+        assert archive.generations == [0, 1]
+        assert 1 in archive
+
+        pd.testing.assert_frame_equal(archive.read(0), population)
+        pd.testing.assert_frame_equal(archive.read(), population.iloc[:3] * 2)
+
+        with pytest.raises(ValueError):
+            archive.append(population, 1)
+
+        with pytest.raises(ValueError):
+            archive.read(2)
+
+    def test_cnsga_output_path(self, tmp_path):
+        options = CNSGAGenerator.default_options()
+        options.population_size = 8
+        options.output_path = str(tmp_path)
+        generator = CNSGAGenerator(tnk_vocs, options)
+        for _ in range(3):
+            generator.add_data(
+                evaluate_TNK_dataframe(pd.DataFrame(generator.generate(8)))
+            )
+
+        assert os.listdir(tmp_path) == ["cnsga_population.npz"]
+        assert generator.archive.generations == [0, 1, 2]
+        # arrays in object columns are read back as lists
+        population = generator.population.drop(columns="some_array")
+        pd.testing.assert_frame_equal(
+            generator.archive.read().drop(columns="some_array"), population
+        )
+        assert generator.archive.read()["some_array"].iloc[0] == [1, 2, 3]
+
+        # resume from the latest generation
+        options.output_path = None
+        options.population_file = os.path.join(tmp_path, "cnsga_population.npz")
+        resumed = CNSGAGenerator(tnk_vocs, options)
+        assert resumed.generation == 2
+        pd.testing.assert_frame_equal(
+            resumed.population.drop(columns="some_array"), population
+        )
+        assert len(resumed.generate(8)) == 8
@@ -1,7 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from botorch.acquisition.multi_objective import qExpectedHypervolumeImprovement
+
 from xopt.evaluator import Evaluator
-from xopt.base import Xopt
+from xopt.base import Xopt, XoptOptions
 from xopt.generators.ga.cnsga import CNSGAGenerator
-from xopt.resources.test_functions.tnk import evaluate_TNK, tnk_vocs
+from xopt.generators.ga.surrogate import prescreen, train_surrogate
+from xopt.resources.test_functions.tnk import (
+    evaluate_TNK,
+    evaluate_TNK_dataframe,
+    tnk_vocs,
+)
 from xopt.resources.testing import TEST_YAML
 
 
@@ -23,3 +36,162 @@ def test_cnsga_from_yaml():
     X.run()
     assert len(X.data) == 5
     assert all(~X.data["xopt_error"])
+
+
+def test_cnsga_steady_state():
+    options = CNSGAGenerator.default_options()
+    options.population_size = 8
+    options.steady_state = True
+    generator = CNSGAGenerator(tnk_vocs, options)
+
+    # random children until a full initial population has been generated
+    inputs = pd.DataFrame(generator.generate(6))
+    assert len(inputs) == 6
+    assert generator.n_generated == 6
+
+    # evaluations are added to the population immediately
+    outputs = pd.DataFrame([evaluate_TNK(ele) for ele in inputs.to_dict("records")])
+    generator.add_data(pd.concat([inputs, outputs], axis=1).iloc[:3])
+    assert len(generator.population) == 3
+
+    # children are bred from the population once it has been generated
+    inputs = pd.DataFrame(generator.generate(3))
+    assert len(inputs) == 3
+    assert len(generator.generate(1)) == 1
+
+    inputs = pd.DataFrame(tnk_vocs.random_inputs(20))
+    outputs = pd.DataFrame([evaluate_TNK(ele) for ele in inputs.to_dict("records")])
+    generator.add_data(pd.concat([inputs, outputs], axis=1).set_index(inputs.index + 3))
+    assert len(generator.population) == 8
+    assert generator.n_folded == 23
+
+
+def test_cnsga_steady_state_asynch():
+    options = CNSGAGenerator.default_options()
+    options.population_size = 8
+    options.steady_state = True
+    X = Xopt(
+        generator=CNSGAGenerator(tnk_vocs, options),
+        evaluator=Evaluator(
+            function=evaluate_TNK,
+            function_kwargs={"random_sleep": 0.01},
+            executor=ThreadPoolExecutor(),
+            max_workers=4,
+        ),
+        vocs=tnk_vocs,
+        options=XoptOptions(asynch=True),
+    )
+    X.options.max_evaluations = 30
+    X.run()
+
+    assert len(X.data) >= 30
+    assert len(X.generator.population) == 8
+    assert set(X.generator.population.index) <= set(X.data.index)
+
+
+@pytest.mark.parametrize("ranking", ["nondominated", "hypervolume"])
+def test_cnsga_surrogate(ranking):
+    options = CNSGAGenerator.default_options()
+    options.population_size = 8
+    options.surrogate_oversample = 4
+    options.surrogate_ranking = ranking
+    X = Xopt(
+        generator=CNSGAGenerator(tnk_vocs, options),
+        evaluator=Evaluator(function=evaluate_TNK, max_workers=8),
+        vocs=tnk_vocs,
+    )
+    for _ in range(3):
+        X.step()
+
+    assert len(X.data) == 24
+    assert len(X.generator.data) == 24
+    assert X.generator._surrogate_generation == 2
+
+    # children are prescreened from oversampled candidates
+    candidates = pd.DataFrame(X.generator.create_children())
+    assert len(candidates) == 8
+    tnk_vocs.validate_input_data(candidates)
+
+
+def test_cnsga_surrogate_prescreen():
+    options = CNSGAGenerator.default_options()
+    options.population_size = 4
+    options.surrogate_oversample = 2
+    options.steady_state = True
+    generator = CNSGAGenerator(tnk_vocs, options)
+
+    inputs = pd.DataFrame(tnk_vocs.random_inputs(10))
+    outputs = pd.DataFrame([evaluate_TNK(ele) for ele in inputs.to_dict("records")])
+    generator.add_data(pd.concat([inputs, outputs], axis=1))
+    generator.n_generated = 10
+
+    # the surrogate is trained once per generation
+    assert len(generator.generate(3)) == 3
+    surrogate = generator.surrogate
+    assert len(generator.generate(1)) == 1
+    assert generator.surrogate is surrogate
+
+    # the most promising candidates according to the surrogate are kept
+    candidates = pd.DataFrame({"x1": [0.1, 1.0, 2.0], "x2": [0.1, 1.0, 3.0]})
+    selected = generator.prescreen_children(candidates, 1)
+    assert len(selected) == 1
+
+    options.surrogate_ranking = "expected_improvement"
+    with pytest.raises(ValueError):
+        CNSGAGenerator(tnk_vocs, options)
+
+
+def test_prescreen_reference_point():
+    inputs = pd.DataFrame({"x1": [0.2, 0.9, 1.0, 1.1], "x2": [1.1, 0.9, 0.8, 0.2]})
+    data = evaluate_TNK_dataframe(inputs)
+    model = train_surrogate(data, tnk_vocs)
+    candidates = pd.DataFrame({"x1": [0.1, 1.0, 2.0], "x2": [0.1, 1.0, 3.0]})
+
+    ref_points = []
+    for reference_point in [None, {"y1": 3.0, "y2": 4.0}]:
+        with patch(
+            "xopt.generators.ga.surrogate.qExpectedHypervolumeImprovement",
+            wraps=qExpectedHypervolumeImprovement,
+        ) as acq:
+            prescreen(
+                candidates,
+                1,
+                model,
+                tnk_vocs,
+                data,
+                ranking="hypervolume",
+                reference_point=reference_point,
+            )
+        ref_points.append(-acq.call_args.kwargs["ref_point"].numpy())
+
+    # the nadir of the feasible pareto front is moved outward by 10% of the range
+    feasible = data[tnk_vocs.feasibility_data(data)["feasible"]]
+    front = feasible[["y1", "y2"]].to_numpy()
+    nadir, ideal = front.max(axis=0), front.min(axis=0)
+    assert np.allclose(ref_points[0], nadir + 0.1 * (nadir - ideal))
+
+    # an explicit reference point is used as given
+    assert np.allclose(ref_points[1], [3.0, 4.0])
+
+
+def test_cnsga_hypervolume_history():
+    options = CNSGAGenerator.default_options()
+    options.population_size = 8
+    options.reference_point = {"y1": 1.5, "y2": 1.5}
+    generator = CNSGAGenerator(tnk_vocs, options)
+    data = []
+    for _ in range(4):
+        inputs = pd.DataFrame(generator.generate(8))
+        outputs = pd.DataFrame([evaluate_TNK(ele) for ele in inputs.to_dict("records")])
+        data.append(pd.concat([inputs, outputs], axis=1))
+        generator.add_data(data[-1])
+
+    history = generator.hypervolume_history
+    assert list(history["n_evaluations"]) == [8, 16, 24, 32]
+    assert all(history["hypervolume"].diff().dropna() >= 0)
+    assert generator.pareto_front.hypervolume == history["hypervolume"].iloc[-1]
+
+    # the front is tracked over all evaluated data, not only the population
+    data = pd.concat(data, ignore_index=True)
+    feasible = tnk_vocs.feasibility_data(data)["feasible"]
+    assert all(feasible.iloc[generator.pareto_front.positions])
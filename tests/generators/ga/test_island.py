@@ -0,0 +1,153 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+from xopt.generators.ga import deap_creator
+from xopt.generators.ga.island import IslandCNSGAGenerator
+from xopt.resources.test_functions.tnk import (
+    evaluate_TNK,
+    evaluate_TNK_dataframe,
+    tnk_vocs,
+)
+
+
+class TestIslandCNSGA:
+    def test_init(self):
+        options = IslandCNSGAGenerator.default_options()
+        options.n_islands = 3
+        generator = IslandCNSGAGenerator(tnk_vocs, options)
+        assert len(generator.islands) == 3
+
+        # islands share the DEAP classes of the vocs instead of replacing them
+        individuals = [name for name in dir(deap_creator) if "Individual" in name]
+        IslandCNSGAGenerator(tnk_vocs, options)
+        assert [
+            name for name in dir(deap_creator) if "Individual" in name
+        ] == individuals
+
+        options.n_migrants = options.population_size + 1
+        with pytest.raises(ValueError):
+            IslandCNSGAGenerator(tnk_vocs, options)
+
+    def test_generate(self):
+        options = IslandCNSGAGenerator.default_options()
+        options.n_islands = 3
+        generator = IslandCNSGAGenerator(tnk_vocs, options)
+
+        # candidates are taken from each island in turn
+        candidates = pd.DataFrame(generator.generate(4))
+        assert sorted(candidates["xopt_island"]) == [0, 0, 1, 2]
+        candidates = pd.DataFrame(generator.generate(2))
+        assert sorted(candidates["xopt_island"]) == [1, 2]
+
+    def test_migration(self):
+        options = IslandCNSGAGenerator.default_options()
+        options.population_size = 4
+        options.n_islands = 3
+        options.migration_interval = 1
+        options.n_migrants = 1
+        options.seed = 0
+        generator = IslandCNSGAGenerator(tnk_vocs, options)
+
+        index = 0
+        for generation in range(3):
+            inputs = pd.DataFrame(generator.generate(12))
+            inputs.index = np.arange(index, index + 12)
+            index += 12
+            generator.add_data(evaluate_TNK_dataframe(inputs))
+
+            for i, island in enumerate(generator.islands):
+                assert len(island.population) == 4
+            assert all(generator.n_evaluated == 4 * (generation + 1))
+
+        assert len(generator.population) == 12
+
+        # the best individuals of an island migrate to the next island
+        elite = generator.islands[0].population.copy()
+        elite.iloc[0, elite.columns.get_indexer(["y1", "y2", "c1", "c2"])] = [
+            -1.0,
+            -1.0,
+            1.0,
+            0.0,
+        ]
+        generator.islands[0].population = elite
+        generator.migrate(0)
+        assert elite.index[0] in generator.islands[1].population.index
+        assert len(generator.islands[1].population) == 4
+        assert all(generator.islands[1].population["xopt_island"] == 1)
+
+        # data without island labels is shared out between the islands
+        inputs = pd.DataFrame(tnk_vocs.random_inputs(6))
+        inputs.index = np.arange(100, 106)
+        generator.add_data(evaluate_TNK_dataframe(inputs))
+        assert generator.n_evaluated.sum() == 42
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_seed(self, max_workers):
+        options = IslandCNSGAGenerator.default_options()
+        options.population_size = 4
+        options.n_islands = 3
+        options.seed = 1
+
+        # islands give the same candidates whether they breed in this process or
+        # in worker processes
+        results = []
+        for workers in [1, max_workers]:
+            options.max_workers = workers
+            generator = IslandCNSGAGenerator(tnk_vocs, options)
+            inputs = pd.DataFrame(generator.generate(12))
+            generator.add_data(evaluate_TNK_dataframe(inputs))
+            assert generator.generation == 0
+            results.append(pd.DataFrame(generator.generate(12)))
+        pd.testing.assert_frame_equal(*results)
+
+    def test_population_file(self, tmp_path):
+        options = IslandCNSGAGenerator.default_options()
+        options.population_size = 4
+        options.n_islands = 3
+        options.output_path = str(tmp_path)
+        generator = IslandCNSGAGenerator(tnk_vocs, options)
+        inputs = pd.DataFrame(generator.generate(12))
+        generator.add_data(evaluate_TNK_dataframe(inputs))
+        assert os.listdir(tmp_path) == ["island_cnsga_population.npz"]
+        population = generator.population.drop(columns="some_array")
+
+        # resume each island from the archive
+        options.output_path = None
+        options.population_file = os.path.join(tmp_path, "island_cnsga_population.npz")
+        generator = IslandCNSGAGenerator(tnk_vocs, options)
+        assert generator.generation == 0
+        pd.testing.assert_frame_equal(
+            generator.population.drop(columns="some_array"), population
+        )
+        candidates = pd.DataFrame(generator.generate(3))
+        assert list(candidates["xopt_island"]) == [0, 1, 2]
+
+        # a CSV population is shared out as children
+        options.population_file = os.path.join(tmp_path, "population.csv")
+        generator.write_population(options.population_file)
+        generator = IslandCNSGAGenerator(tnk_vocs, options)
+        assert [len(island.children) for island in generator.islands] == [4, 4, 4]
+        candidates = pd.DataFrame(generator.generate(3))
+        assert list(candidates["xopt_island"]) == [0, 1, 2]
+
+    def test_worker_processes(self):
+        options = IslandCNSGAGenerator.default_options()
+        options.population_size = 4
+        options.n_islands = 3
+        options.max_workers = 3
+        X = Xopt(
+            generator=IslandCNSGAGenerator(tnk_vocs, options),
+            evaluator=Evaluator(function=evaluate_TNK, max_workers=6),
+            vocs=tnk_vocs,
+        )
+        for _ in range(6):
+            X.step()
+        assert len(X.data) == 36
+        assert set(X.data["xopt_island"]) == {0, 1, 2}
+        assert len(X.generator.population) == 12
+        assert [island.generation for island in X.generator.islands] == [2, 2, 2]
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+import pytest
+from deap import tools as deap_tools
+
+from xopt.generators.ga.cnsga import (
+    cnsga_individual,
+    cnsga_select,
+    cnsga_toolbox,
+    pop_from_data,
+)
+from xopt.generators.ga.selection import (
+    constrained_domination_matrix,
+    crowding_distance,
+    default_reference_partitions,
+    nondominated_sort,
+    select_nsga2,
+    select_nsga3,
+    uniform_reference_points,
+)
+from xopt.resources.test_functions.dtlz import evaluate_dtlz2, make_dtlz2_vocs
+from xopt.resources.test_functions.tnk import tnk_vocs
+from xopt.vocs import VOCS
+
+
+def random_data(vocs, n, seed, decimals=1):
+    # rounding creates duplicate objective values and ties in crowding distance
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(
+        rng.normal(size=(n, len(vocs.output_names))).round(decimals),
+        columns=vocs.output_names,
+    )
+    for name in vocs.variable_names:
+        data[name] = rng.random(n)
+    data.index = rng.permutation(n) + 100
+    return data
+
+
+def deap_pop(objectives, vocs):
+    individual = cnsga_individual(vocs)
+    pop = list(map(individual, np.zeros((len(objectives), 1))))
+    for i, ind in enumerate(pop):
+        ind.fitness.values = tuple(objectives[i])
+        ind.index = i
+    return pop
+
+
+class TestSelection:
+    def test_domination_matrix(self):
+        objectives = np.array([[0.0, 0.0], [1.0, 1.0], [0.0, 1.0], [-1.0, -1.0]])
+        constraints = np.array([[-1.0, -1.0], [-1.0, 0.0], [1.0, 2.0], [1.0, 1.0]])
+        dominates = constrained_domination_matrix(objectives, constraints)
+
+        # feasible individuals dominate infeasible ones
+        assert dominates[0, 1] and not dominates[1, 0]
+        assert dominates[1, 2] and dominates[1, 3]
+        # infeasible individuals are compared by their constraints
+        assert dominates[3, 2] and not dominates[2, 3]
+        assert not np.any(np.diag(dominates))
+
+        # pareto dominance without constraints
+        dominates = constrained_domination_matrix(objectives, np.zeros((4, 0)))
+        assert dominates[3].sum() == 3
+        assert not dominates[:, 3].any()
+        assert dominates[0, 2] and not dominates[2, 0]
+
+    def test_crowding_distance(self):
+        objectives = np.array([[0.0, 3.0], [1.0, 2.0], [2.0, 1.0], [4.0, 0.0]])
+        distances = crowding_distance(objectives)
+        assert np.isinf(distances[[0, 3]]).all()
+        assert np.allclose(
+            distances[1:3], [2.0 / 8.0 + 2.0 / 6.0, 3.0 / 8.0 + 2.0 / 6.0]
+        )
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_nsga2_with_constraints(self, seed):
+        vocs = tnk_vocs
+        toolbox = cnsga_toolbox(vocs, selection="nsga2")
+        data = random_data(vocs, 60, seed)
+
+        for n in [1, 10, 25, 60]:
+            expected = toolbox.select(pop_from_data(data, vocs), n)
+            selected = cnsga_select(data, n, vocs, toolbox)
+            assert list(selected.index) == [ind.index for ind in expected]
+
+    @pytest.mark.parametrize("n_objectives", [1, 2, 3])
+    def test_nsga2_without_constraints(self, n_objectives):
+        vocs = VOCS(
+            variables={"x": [0, 1]},
+            objectives={f"y{i}": "MINIMIZE" for i in range(n_objectives)},
+        )
+        objectives = random_data(vocs, 80, n_objectives).to_numpy()[:, :n_objectives]
+
+        for n in [5, 40, 79]:
+            expected = deap_tools.selNSGA2(deap_pop(objectives, vocs), n)
+            selected = select_nsga2(objectives, np.zeros((80, 0)), n)
+            assert list(selected) == [ind.index for ind in expected]
+
+        fronts = nondominated_sort(objectives, np.zeros((80, 0)))
+        expected = deap_tools.sortNondominated(deap_pop(objectives, vocs), 80)
+        assert [list(front) for front in fronts] == [
+            [ind.index for ind in front] for front in expected
+        ]
+
+    def test_spea2_uses_deap(self):
+        vocs = tnk_vocs
+        toolbox = cnsga_toolbox(vocs, selection="spea2")
+        data = random_data(vocs, 20, 0, decimals=3)
+        selected = cnsga_select(data, 10, vocs, toolbox)
+        assert len(selected) == 10
+
+    def test_reference_points(self):
+        for n_objectives, n_partitions in [(1, 3), (2, 5), (3, 12), (5, 6)]:
+            points = uniform_reference_points(n_objectives, n_partitions)
+            expected = deap_tools.uniform_reference_points(n_objectives, n_partitions)
+            assert points.shape == expected.shape
+            assert np.allclose(points.sum(axis=1), 1.0)
+            assert len(np.unique(points.round(9), axis=0)) == len(points)
+
+        assert default_reference_partitions(3, 91) == 12
+        assert default_reference_partitions(5, 209) == 5
+        assert default_reference_partitions(5, 210) == 6
+        assert default_reference_partitions(10, 2) == 1
+
+    @pytest.mark.parametrize("n_constraints", [0, 2])
+    def test_nsga3(self, n_constraints):
+        rng = np.random.default_rng(0)
+        objectives = rng.normal(size=(100, 4)).round(1)
+        constraints = rng.normal(size=(100, n_constraints))
+        reference_points = uniform_reference_points(4, 3)
+
+        fronts = nondominated_sort(objectives, constraints)
+        for k in [1, 10, 50, 100]:
+            selected = select_nsga3(
+                objectives, constraints, k, reference_points, rng=rng
+            )
+            assert len(np.unique(selected)) == len(selected) == k
+
+            # complete fronts are selected first
+            n_complete = 0
+            for front in fronts:
+                if n_complete + len(front) > k:
+                    assert set(selected[n_complete:]) <= set(front)
+                    break
+                assert set(selected[n_complete:][: len(front)]) == set(front)
+                n_complete += len(front)
+
+    def test_nsga3_niching(self):
+        # individuals on the same reference direction compete for a single niche
+        objectives = np.array([[0.0, 1.0], [0.01, 0.99], [1.0, 0.0], [0.5, 0.5]])
+        reference_points = uniform_reference_points(2, 2)
+        selected = select_nsga3(objectives, np.zeros((4, 0)), 3, reference_points)
+        assert set(selected) == {0, 2, 3}
+
+        # failed evaluations do not break normalization
+        objectives[1] = [-1.0, np.inf]
+        with np.errstate(all="raise"):
+            selected = select_nsga3(objectives, np.zeros((4, 0)), 3, reference_points)
+        assert len(set(selected)) == 3
+
+    def test_auto_selection(self):
+        assert cnsga_toolbox(tnk_vocs).selection == "nsga2"
+
+        vocs = make_dtlz2_vocs(4)
+        toolbox = cnsga_toolbox(vocs, reference_partitions=3)
+        assert toolbox.selection == "nsga3"
+        assert len(toolbox.reference_points) == 20
+
+        data = random_data(vocs, 30, 0, decimals=3)
+        selected = cnsga_select(data, 12, vocs, toolbox)
+        assert len(selected) == 12
+        assert selected.index.is_unique
+
+        # ties are broken with the given random number generator
+        objectives = vocs.objective_data(data).to_numpy()
+        expected = select_nsga3(
+            objectives,
+            np.zeros((30, 0)),
+            12,
+            toolbox.reference_points,
+            rng=np.random.default_rng(1),
+        )
+        selected = cnsga_select(data, 12, vocs, toolbox, rng=np.random.default_rng(1))
+        assert list(selected.index) == list(data.index[expected])
+
+        with pytest.raises(ValueError):
+            cnsga_toolbox(vocs, selection="nsga4")
+
+    def test_dtlz2(self):
+        vocs = make_dtlz2_vocs(3)
+        x = {name: 0.5 for name in vocs.variable_names}
+        outputs = evaluate_dtlz2(x)
+        assert list(outputs) == vocs.objective_names
+        assert np.isclose(np.linalg.norm(list(outputs.values())), 1.0)
@@ -0,0 +1,119 @@
+import random
+
+import numpy as np
+import pandas as pd
+from deap import algorithms as deap_algorithms
+
+from xopt.generators.ga.cnsga import (
+    CNSGAGenerator,
+    cnsga_individual,
+    cnsga_toolbox,
+    cnsga_variation,
+)
+from xopt.generators.ga.variation import (
+    polynomial_mutation,
+    sbx_crossover,
+    variation,
+)
+from xopt.resources.test_functions.tnk import tnk_vocs
+
+LOW = np.array([0.0, -1.0, 10.0])
+UP = np.array([1.0, 1.0, 20.0])
+
+
+def random_population(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return LOW + rng.random((n, 3)) * (UP - LOW)
+
+
+class TestVariation:
+    def test_sbx_crossover(self):
+        rng = np.random.default_rng(0)
+        parents1, parents2 = random_population(500, 1), random_population(500, 2)
+        parents2[0] = parents1[0]
+
+        offspring1, offspring2 = sbx_crossover(parents1, parents2, LOW, UP, 20.0, rng)
+        for offspring in [offspring1, offspring2]:
+            assert np.all((offspring >= LOW) & (offspring <= UP))
+
+        # about half of the variables are crossed, identical parents are not
+        crossed = offspring1 != parents1
+        assert 0.4 < crossed.mean() < 0.6
+        assert not np.any(crossed[0])
+
+        # a large eta gives children close to their parents
+        offspring1, offspring2 = sbx_crossover(parents1, parents2, LOW, UP, 1e6, rng)
+        assert np.allclose(
+            np.sort([offspring1, offspring2], axis=0),
+            np.sort([parents1, parents2], axis=0),
+            atol=1e-4,
+        )
+
+    def test_polynomial_mutation(self):
+        rng = np.random.default_rng(0)
+        individuals = random_population(1000)
+        individuals[0] = LOW
+        individuals[1] = UP
+
+        mutants = polynomial_mutation(individuals, LOW, UP, 20.0, 0.5, rng)
+        assert np.all((mutants >= LOW) & (mutants <= UP))
+        assert 0.45 < np.mean(mutants != individuals) < 0.55
+
+        # a large eta keeps mutants close to the original
+        mutants = polynomial_mutation(individuals, LOW, UP, 1e6, 1.0, rng)
+        assert np.allclose(mutants, individuals, atol=1e-4 * (UP - LOW))
+
+    def test_variation(self):
+        population = random_population(11)
+
+        # no variation
+        offspring = variation(population, LOW, UP, 0.0, 0.0)
+        assert np.array_equal(offspring, population)
+        assert offspring is not population
+
+        # reproducible with a seeded generator
+        results = [
+            variation(population, LOW, UP, 0.9, 1.0, rng=np.random.default_rng(1))
+            for _ in range(2)
+        ]
+        assert np.array_equal(*results)
+        assert results[0].shape == population.shape
+        assert not np.array_equal(results[0], population)
+
+    def test_same_distribution_as_deap(self):
+        # compare the mean absolute change of each variable with DEAP's varAnd
+        vocs = tnk_vocs
+        toolbox = cnsga_toolbox(vocs)
+        low, up = vocs.bounds
+        population = low + np.random.default_rng(0).random((20000, 2)) * (up - low)
+        population = pd.DataFrame(population, columns=vocs.variable_names)
+
+        children = cnsga_variation(
+            population, vocs, toolbox, rng=np.random.default_rng(0)
+        )[vocs.variable_names].to_numpy()
+
+        random.seed(0)
+        pop = list(map(cnsga_individual(vocs), population.to_numpy()))
+        expected = np.array(deap_algorithms.varAnd(pop, toolbox, 0.9, 1.0))
+
+        change = np.abs(children - population.to_numpy()).mean(axis=0)
+        expected_change = np.abs(expected - population.to_numpy()).mean(axis=0)
+        assert np.allclose(change, expected_change, rtol=0.05)
+        assert np.allclose(
+            (children != population.to_numpy()).mean(axis=0),
+            (expected != population.to_numpy()).mean(axis=0),
+            atol=0.01,
+        )
+
+    def test_seed(self):
+        def children(seed):
+            options = CNSGAGenerator.default_options()
+            options.population_size = 8
+            options.seed = seed
+            generator = CNSGAGenerator(tnk_vocs, options)
+            generator.population = pd.DataFrame(random_population(8)[:, :2] + 1.0)
+            generator.population.columns = tnk_vocs.variable_names
+            return pd.DataFrame(generator.generate(8))
+
+        pd.testing.assert_frame_equal(children(3), children(3))
+        assert not children(3).equals(children(4))
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+from xopt.generators.scipy.multistart_neldermead import MultiStartNelderMeadGenerator
+from xopt.resources.test_functions.rosenbrock import (
+    evaluate_rosenbrock,
+    evaluate_rosenbrock_dataframe,
+    rosenbrock2_vocs,
+)
+
+
+class TestMultiStartNelderMead:
+    def test_init(self):
+        options = MultiStartNelderMeadGenerator.default_options()
+        options.n_starts = 0
+        with pytest.raises(ValueError):
+            MultiStartNelderMeadGenerator(rosenbrock2_vocs, options)
+
+        options = MultiStartNelderMeadGenerator.default_options()
+        options.initial_step = 0.0
+        with pytest.raises(ValueError):
+            MultiStartNelderMeadGenerator(rosenbrock2_vocs, options)
+
+    def test_generate(self):
+        options = MultiStartNelderMeadGenerator.default_options()
+        options.seed = 0
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        generator = MultiStartNelderMeadGenerator(rosenbrock2_vocs, options)
+
+        # one simplex is started for each requested candidate, from quasi-random
+        # starting points after the initial point
+        candidates = pd.DataFrame(generator.generate(4))
+        assert list(candidates["xopt_start"]) == [0, 1, 2, 3]
+        assert list(candidates.iloc[0][["x0", "x1"]]) == [-1.0, -1.0]
+        assert len(candidates[["x0", "x1"]].drop_duplicates()) == 4
+        rosenbrock2_vocs.validate_input_data(candidates)
+
+        # results are returned to their simplex in any order, simplexes waiting
+        # for a result do not generate candidates
+        generator.add_data(evaluate_rosenbrock_dataframe(candidates.iloc[[2, 0]]))
+        candidates = pd.DataFrame(generator.generate(2))
+        assert sorted(candidates["xopt_start"]) == [0, 2]
+
+    def test_fixed_starts(self):
+        options = MultiStartNelderMeadGenerator.default_options()
+        options.seed = 0
+        options.n_starts = 2
+        options.max_starts = 3
+        generator = MultiStartNelderMeadGenerator(rosenbrock2_vocs, options)
+        candidates = generator.generate(4)
+        assert [ele["xopt_start"] for ele in candidates] == [0, 1]
+
+        while not generator.is_done:
+            generator.add_data(evaluate_rosenbrock_dataframe(pd.DataFrame(candidates)))
+            candidates = generator.generate(4)
+
+        results = generator.results
+        assert sorted(results["start"]) == [0, 1, 2]
+        assert set(results["status"]) <= {"converged", "stalled"}
+
+        # best result over all starts
+        best = generator.best
+        assert best["y"] == results["y"].min()
+        np.testing.assert_allclose([best["x0"], best["x1"]], [1.0, 1.0], atol=1e-2)
+
+    def test_stall(self):
+        options = MultiStartNelderMeadGenerator.default_options()
+        options.seed = 0
+        options.n_starts = 1
+        options.stall_evaluations = 5
+        generator = MultiStartNelderMeadGenerator(rosenbrock2_vocs, options)
+
+        # a constant objective never improves after the first evaluation
+        for _ in range(6):
+            generator.add_data(pd.DataFrame(generator.generate(1)).assign(y=1.0))
+
+        # the stalled simplex is replaced by a new start
+        assert list(generator.results["status"]) == ["stalled", "running"]
+        assert list(generator.runs) == [1]
+        assert generator.generate(1)[0]["xopt_start"] == 1
+
+    def test_unlabeled_data(self):
+        options = MultiStartNelderMeadGenerator.default_options()
+        options.seed = 0
+        X = Xopt(
+            generator=MultiStartNelderMeadGenerator(rosenbrock2_vocs, options),
+            evaluator=Evaluator(function=evaluate_rosenbrock, max_workers=4),
+            vocs=rosenbrock2_vocs,
+        )
+
+        # data that was not generated by a simplex is ignored
+        X.evaluate_data(pd.DataFrame(rosenbrock2_vocs.random_inputs(3)))
+        assert len(X.generator.runs) == 0
+
+        X.options.max_evaluations = 400
+        X.run()
+        assert len(X.generator.runs) == 4
+        assert X.data["xopt_start"].nunique() >= 4
+        assert X.generator.best["y"] < 1e-3
@@ -0,0 +1,157 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from xopt.base import Xopt
+from xopt.evaluator import Evaluator
+from xopt.generators.scipy.neldermead import NelderMeadGenerator
+from xopt.generators.scipy.parallel_neldermead import ParallelNelderMeadGenerator
+from xopt.resources.test_functions.rosenbrock import (
+    evaluate_rosenbrock,
+    evaluate_rosenbrock_dataframe,
+    make_rosenbrock_vocs,
+)
+
+
+def run(generator, n_candidates, shuffle=False):
+    """Step a generator until it is done, returns the candidates of each step"""
+    rng = np.random.default_rng(0)
+    steps = []
+    while True:
+        candidates = generator.generate(n_candidates)
+        if generator.is_done:
+            return steps
+        data = evaluate_rosenbrock_dataframe(pd.DataFrame(candidates))
+        if shuffle:
+            data = data.iloc[rng.permutation(len(data))]
+        generator.add_data(data)
+        steps.append(generator.vocs.variable_data(data.sort_index(), "").to_numpy())
+
+
+class TestParallelNelderMead:
+    def test_serial(self):
+        # one vertex at a time without speculation is the serial algorithm
+        vocs = make_rosenbrock_vocs(2)
+        options = NelderMeadGenerator.default_options()
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        serial = np.vstack(run(NelderMeadGenerator(vocs, options), 1))
+
+        options = ParallelNelderMeadGenerator.default_options()
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        options.n_vertices = 1
+        options.speculative = False
+        generator = ParallelNelderMeadGenerator(vocs, options)
+        steps = run(generator, 1)
+        assert generator.n_vertices == 1 and not generator.speculative
+        np.testing.assert_array_equal(np.vstack(steps), serial)
+        np.testing.assert_allclose(generator.state[0], [1.0, 1.0], atol=1e-3)
+
+        with pytest.raises(ValueError):
+            options.n_vertices = 0
+            ParallelNelderMeadGenerator(vocs, options)
+
+    def test_speculative(self):
+        vocs = make_rosenbrock_vocs(2)
+        options = ParallelNelderMeadGenerator.default_options()
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        options.n_vertices = 1
+        options.speculative = False
+        serial = ParallelNelderMeadGenerator(vocs, options)
+        n_serial = len(run(serial, 1))
+
+        # all trial points are evaluated at once, the simplex follows the same
+        # path in fewer steps
+        options.n_vertices = None
+        options.speculative = None
+        generator = ParallelNelderMeadGenerator(vocs, options)
+        steps = run(generator, 4, shuffle=True)
+        assert generator.speculative and generator.n_vertices == 1
+        assert max(len(ele) for ele in steps) == 4
+        assert len(steps) < 0.7 * n_serial
+        np.testing.assert_array_equal(generator.state, serial.state)
+
+    def test_vertices(self):
+        vocs = make_rosenbrock_vocs(6)
+        options = ParallelNelderMeadGenerator.default_options()
+        options.initial_point = {f"x{i}": 0.0 for i in range(6)}
+        generator = ParallelNelderMeadGenerator(vocs, options)
+        steps = run(generator, 8, shuffle=True)
+        assert generator.speculative and generator.n_vertices == 2
+        assert max(len(ele) for ele in steps) == 8
+        np.testing.assert_allclose(generator.state[0], np.ones(6), atol=1e-2)
+
+    def test_batches(self):
+        vocs = make_rosenbrock_vocs(2)
+        options = ParallelNelderMeadGenerator.default_options()
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        options.n_vertices = 1
+        options.speculative = True
+        generator = ParallelNelderMeadGenerator(vocs, options)
+
+        # candidates of an iteration can be requested in smaller batches, each
+        # labeled with its trial number
+        first = pd.DataFrame(generator.generate(2))
+        second = pd.DataFrame(generator.generate(2))
+        assert list(first["xopt_trial"]) == [0, 1]
+        assert list(second["xopt_trial"]) == [2]
+        assert generator.generate(1) == []
+        assert not generator.is_done
+
+        # unlabeled data and data of other trials is ignored
+        generator.add_data(
+            evaluate_rosenbrock_dataframe(first.drop(columns="xopt_trial"))
+        )
+        stale = evaluate_rosenbrock_dataframe(first.assign(xopt_trial=[5, -1]))
+        generator.add_data(stale)
+        assert np.all(np.isnan(generator._batch_values))
+
+        # the batch is complete once all labeled results are in, in any order
+        generator.add_data(evaluate_rosenbrock_dataframe(second))
+        generator.add_data(evaluate_rosenbrock_dataframe(first.iloc[::-1]))
+        assert generator._batch_values is None
+        np.testing.assert_array_equal(
+            generator.y,
+            evaluate_rosenbrock_dataframe(pd.concat([first, second]))["y"],
+        )
+        assert list(pd.DataFrame(generator.generate(4))["xopt_trial"]) == [3, 4, 5, 6]
+
+    def test_random_evaluate(self):
+        vocs = make_rosenbrock_vocs(2)
+        options = ParallelNelderMeadGenerator.default_options()
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        X = Xopt(
+            generator=ParallelNelderMeadGenerator(vocs, options),
+            evaluator=Evaluator(function=evaluate_rosenbrock, max_workers=4),
+            vocs=vocs,
+        )
+
+        # random evaluations in between steps do not disturb the simplex
+        X.step()
+        X.evaluate_data(pd.DataFrame(vocs.random_inputs(3)))
+        X.run()
+        assert X.generator.is_done
+        assert X.data["y"].min() < 1e-6
+        assert X.data["xopt_trial"].isna().sum() == 3
+
+    def test_asynch(self):
+        vocs = make_rosenbrock_vocs(2)
+        options = ParallelNelderMeadGenerator.default_options()
+        options.initial_point = {"x0": -1.0, "x1": -1.0}
+        X = Xopt(
+            generator=ParallelNelderMeadGenerator(vocs, options),
+            evaluator=Evaluator(
+                function=evaluate_rosenbrock,
+                executor=ThreadPoolExecutor(4),
+                max_workers=4,
+            ),
+            vocs=vocs,
+        )
+        X.options.asynch = True
+
+        # free workers wait while the rest of the current batch is evaluated
+        X.run()
+        assert X.generator.is_done
+        assert X.data["y"].min() < 1e-6
+        assert X.data["xopt_trial"].is_unique
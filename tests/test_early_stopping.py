@@ -0,0 +1,51 @@
+import pytest
+
+from xopt.early_stopping import SuccessiveHalving, SuccessiveHalvingOptions
+from xopt.resources.testing import TEST_VOCS_BASE
+from xopt.vocs import VOCS
+
+
+class TestSuccessiveHalving:
+    def test_rungs(self):
+        rule = SuccessiveHalving(TEST_VOCS_BASE, SuccessiveHalvingOptions(min_step=2.0))
+        assert rule.get_rung(1.0) == -1
+        assert rule.get_rung(2.0) == 0
+        assert rule.get_rung(5.9) == 0
+        assert rule.get_rung(6.0) == 1
+        assert rule.get_rung(18.0) == 2
+
+    def test_should_stop(self):
+        rule = SuccessiveHalving(TEST_VOCS_BASE, SuccessiveHalvingOptions())
+
+        # no decisions before min_rung_size evaluations reach a rung
+        assert not rule.should_stop(0, 1, {"y1": 1.0})
+        assert not rule.should_stop(1, 1, {"y1": 3.0})
+
+        # only the best third of evaluations continue
+        assert rule.should_stop(2, 1, {"y1": 2.0})
+        assert not rule.should_stop(3, 1, {"y1": 0.5})
+        assert rule.should_stop(4, 1, {"y1": 0.7})
+
+        # each rung is only checked once per evaluation
+        assert not rule.should_stop(2, 2, {"y1": 2.0})
+
+        # missing objective values are ignored
+        assert not rule.should_stop(5, 1, {"c1": 1.0})
+
+    def test_maximize(self):
+        vocs = VOCS(variables={"x": [0, 1]}, objectives={"f": "MAXIMIZE"})
+        rule = SuccessiveHalving(vocs, SuccessiveHalvingOptions(min_rung_size=2))
+        assert not rule.should_stop(0, 1, {"f": 1.0})
+        assert rule.should_stop(1, 1, {"f": 0.0})
+
+    def test_init(self):
+        vocs = VOCS(
+            variables={"x": [0, 1]}, objectives={"f": "MAXIMIZE", "g": "MINIMIZE"}
+        )
+        with pytest.raises(ValueError):
+            SuccessiveHalving(vocs, SuccessiveHalvingOptions())
+
+        with pytest.raises(ValueError):
+            SuccessiveHalving(
+                TEST_VOCS_BASE, SuccessiveHalvingOptions(reduction_factor=1.0)
+            )
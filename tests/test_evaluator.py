@@ -1,11 +1,19 @@
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import threading
+
 import numpy as np
 import pandas as pd
 
 from xopt import Evaluator
 
 
+def iterative_function(x, report_progress=None):
+    for step in range(1, 4):
+        report_progress(step, {"f": x["x1"] / step})
+    return {"f": 0.0}
+
+
 class TestEvaluator:
     @staticmethod
     def f(x, a=True):
@@ -103,3 +111,59 @@ class TestEvaluator:
             test_dict["executor"] = Executor()
             ev = Evaluator(**test_dict)
             ev.json()
+
+    def test_progress(self):
+        candidates = pd.DataFrame(np.random.rand(3, 2), columns=["x1", "x2"])
+        for Executor in [ThreadPoolExecutor, ProcessPoolExecutor]:
+            evaluator = Evaluator(
+                function=iterative_function,
+                executor=Executor(max_workers=2),
+                progress_kwarg="report_progress",
+            )
+            futures = evaluator.submit_data(candidates)
+            assert all(future.result()["f"] == 0.0 for future in futures)
+
+            # reports are received in order for each evaluation
+            reports = evaluator.get_progress()
+            assert len(reports) == 9
+            for future, x1 in zip(futures, candidates["x1"]):
+                steps = [step for ele, step, _ in reports if ele is future]
+                assert steps == [1, 2, 3]
+                outputs = [out for ele, _, out in reports if ele is future]
+                assert outputs[-1]["f"] == x1 / 3
+            assert evaluator.get_progress() == []
+
+        # evaluations that are not submitted ignore progress reports
+        assert evaluator.evaluate(candidates.iloc[0].to_dict())["f"] == 0.0
+        assert len(evaluator.evaluate_data(candidates)) == 3
+
+    def test_cancel(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def waiting_function(x, report_progress=None):
+            started.set()
+            release.wait(10.0)
+            report_progress(1, {"f": 1.0})
+            return {"f": 0.0}
+
+        evaluator = Evaluator(
+            function=waiting_function,
+            executor=ThreadPoolExecutor(max_workers=1),
+            progress_kwarg="report_progress",
+        )
+        candidates = pd.DataFrame(np.random.rand(2, 2), columns=["x1", "x2"])
+        running, pending = evaluator.submit_data(candidates)
+        started.wait(10.0)
+
+        # the pending evaluation is cancelled before it starts
+        evaluator.cancel(pending)
+        assert pending.cancelled()
+
+        # the running evaluation is stopped at the next progress report
+        evaluator.cancel(running)
+        release.set()
+        outputs = running.result()
+        assert outputs["xopt_error"]
+        assert outputs["xopt_cancelled"]
+        assert "f" not in outputs
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from botorch.utils.multi_objective.hypervolume import Hypervolume
+from botorch.utils.multi_objective.pareto import is_non_dominated
+
+from xopt.pareto import dominated_by, hypervolume, ParetoFront
+from xopt.resources.test_functions.tnk import evaluate_TNK, tnk_vocs
+from xopt.vocs import VOCS
+
+
+def exact_hypervolume(points, reference_point):
+    # botorch maximizes
+    points = points[np.all(points < reference_point, axis=-1)]
+    if len(points) == 0:
+        return 0.0
+    Y = -torch.tensor(points)
+    return Hypervolume(-torch.tensor(reference_point)).compute(Y[is_non_dominated(Y)])
+
+
+def make_vocs(n_objectives):
+    return VOCS(
+        variables={"x": [0, 1]},
+        objectives={f"f{i}": "MINIMIZE" for i in range(n_objectives)},
+    )
+
+
+def make_data(n_objectives, n, rng):
+    values = rng.random((n, n_objectives))
+    return pd.DataFrame(values, columns=[f"f{i}" for i in range(n_objectives)])
+
+
+class TestHypervolume:
+    @pytest.mark.parametrize("n_objectives", [2, 3])
+    def test_exact(self, n_objectives):
+        rng = np.random.default_rng(0)
+        reference_point = np.full(n_objectives, 0.9)
+        for n in [1, 10, 200]:
+            points = rng.random((n, n_objectives))
+            assert hypervolume(points, reference_point) == pytest.approx(
+                exact_hypervolume(points, reference_point)
+            )
+
+        # points outside the reference point do not contribute
+        assert hypervolume(np.ones((2, n_objectives)), reference_point) == 0.0
+
+        with pytest.raises(ValueError):
+            hypervolume(np.zeros((1, 4)), np.ones(4))
+
+    def test_dominated_by(self):
+        front = np.array([[0.0, 1.0], [1.0, 0.0]])
+        points = np.array([[1.0, 1.0], [0.5, 0.5], [0.0, 1.0]])
+        assert list(dominated_by(points, front, chunk_size=2)) == [True, False, False]
+
+
+class TestParetoFront:
+    @pytest.mark.parametrize("n_objectives", [2, 3, 4])
+    def test_incremental(self, n_objectives):
+        rng = np.random.default_rng(1)
+        vocs = make_vocs(n_objectives)
+        reference_point = {name: 1.0 for name in vocs.objective_names}
+        front = ParetoFront(vocs, reference_point, seed=0)
+        data = make_data(n_objectives, 300, rng)
+
+        for index in np.array_split(np.arange(300), 5):
+            front.add(data.iloc[index])
+
+            # compare to brute force non-dominated sorting
+            values = data.iloc[: index[-1] + 1].to_numpy()
+            expected = np.flatnonzero(is_non_dominated(-torch.tensor(values)))
+            assert set(front.positions) == set(expected)
+
+            # Monte Carlo estimate for more than 3 objectives
+            expected = exact_hypervolume(values, np.ones(n_objectives))
+            rel = 0.02 if n_objectives > 3 else 1e-9
+            assert front.hypervolume == pytest.approx(expected, rel=rel)
+
+        history = front.hypervolume_history
+        assert list(history["n_evaluations"]) == [60, 120, 180, 240, 300]
+        assert np.all(np.diff(history["hypervolume"]) >= 0)
+
+    def test_feasibility(self):
+        rng = np.random.default_rng(2)
+        x = rng.random((50, 2)) * 3.14159
+        data = pd.DataFrame([evaluate_TNK({"x1": a, "x2": b}) for a, b in x])
+        front = ParetoFront(tnk_vocs)
+        front.add(data)
+
+        # infeasible points are not part of the front, the default reference point
+        # is the worst feasible point
+        feasible = tnk_vocs.feasibility_data(data)["feasible"].to_numpy()
+        objectives = tnk_vocs.objective_data(data, "").to_numpy()
+        assert np.all(feasible[front.positions])
+        assert np.all(front.reference_point == objectives[feasible].max(axis=0))
+        assert front.hypervolume == pytest.approx(
+            exact_hypervolume(objectives[feasible], front.reference_point)
+        )
+
+        front.reset()
+        assert front.n_evaluations == 0
+        assert len(front.hypervolume_history) == 0
+
+    def test_reference_point(self):
+        vocs = VOCS(
+            variables={"x": [0, 1]},
+            objectives={"f0": "MINIMIZE", "f1": "MAXIMIZE"},
+        )
+        front = ParetoFront(vocs, {"f0": 1.0, "f1": 0.0})
+        assert list(front.reference_point) == [1.0, 0.0]
+        front.add(pd.DataFrame({"f0": [0.5], "f1": [0.5]}))
+        assert front.hypervolume == pytest.approx(0.25)
+
+        with pytest.raises(ValueError):
+            ParetoFront(vocs, {"f0": 1.0})
+
+    def test_duplicates(self):
+        front = ParetoFront(make_vocs(2), {"f0": 1.0, "f1": 1.0})
+        data = pd.DataFrame({"f0": [0.2, 0.5, 0.2], "f1": [0.5, 0.2, 0.5]})
+        front.add(data)
+        assert list(front.positions) == [0, 1]
+
+        # points equal to a point on the front are not added again
+        front.add(data.iloc[:1])
+        assert list(front.positions) == [0, 1]
+        assert front.hypervolume == pytest.approx(0.8 * 0.5 + 0.5 * 0.3)
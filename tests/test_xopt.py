@@ -1,4 +1,5 @@
 import math
+import time
 from abc import ABC
 from copy import copy, deepcopy
 from concurrent.futures import ThreadPoolExecutor
@@ -10,6 +11,7 @@ import yaml
 
 from xopt.evaluator import Evaluator
 from xopt.base import Xopt, XoptOptions
+from xopt.early_stopping import SuccessiveHalvingOptions
 from xopt.vocs import VOCS
 from xopt.errors import XoptError
 from xopt.generator import Generator
@@ -162,6 +164,44 @@ class TestXopt:
         with pytest.raises(XoptError):
             X2.step()
 
+    def test_early_stopping(self):
+        def iterative_callable(input_dict, report_progress=None):
+            for step in range(1, 10):
+                report_progress(step, {"y1": input_dict["x1"]})
+                time.sleep(0.02)
+            return {"y1": input_dict["x1"], "c1": input_dict["x2"]}
+
+        evaluator = Evaluator(
+            function=iterative_callable,
+            executor=ThreadPoolExecutor(max_workers=3),
+            max_workers=3,
+            progress_kwarg="report_progress",
+        )
+        options = XoptOptions(
+            early_stopping=SuccessiveHalvingOptions(poll_interval=0.005)
+        )
+        X = Xopt(
+            generator=RandomGenerator(deepcopy(TEST_VOCS_BASE)),
+            evaluator=evaluator,
+            vocs=deepcopy(TEST_VOCS_BASE),
+            options=options,
+        )
+        for _ in range(3):
+            X.step()
+
+        # some evaluations are stopped early, never the best one
+        assert len(X.data) == 9
+        cancelled = X.data["xopt_cancelled"].fillna(False).astype(bool)
+        assert cancelled.any()
+        assert not cancelled.loc[X.data["x1"].idxmin()]
+        assert X.data.loc[cancelled, "y1"].isna().all()
+        assert set(X.progress_data["xopt_index"]) == set(X.data.index)
+
+        # early stopping requires progress reports
+        X.evaluator.progress_kwarg = None
+        with pytest.raises(XoptError):
+            X.step()
+
     def test_random(self):
         evaluator = Evaluator(function=xtest_callable)
         generator = RandomGenerator(deepcopy(TEST_VOCS_BASE))
@@ -4,8 +4,9 @@ from copy import deepcopy
 from pydantic import Field
 
 from xopt import _version
+from xopt.early_stopping import SuccessiveHalving, SuccessiveHalvingOptions
 from xopt.errors import XoptError
-from xopt.evaluator import Evaluator, validate_outputs
+from xopt.evaluator import Evaluator, cancelled_outputs, validate_outputs
 from xopt.generator import Generator
 from xopt.pydantic import XoptBaseModel
 from xopt.utils import get_generator_and_defaults
@@ -16,6 +17,7 @@ __version__ = _version.get_versions()["version"]
 import concurrent
 import logging
 import os
+import time
 
 from typing import Dict
 
@@ -41,6 +43,11 @@ class XoptOptions(XoptBaseModel):
     max_evaluations: int = Field(
         None, description="maximum number of evaluations to perform"
     )
+    early_stopping: SuccessiveHalvingOptions = Field(
+        None,
+        description="options for stopping running evaluations based on intermediate "
+        "objective values reported through `evaluator.progress_kwarg`",
+    )
 
 
 class Xopt:
@@ -103,6 +110,8 @@ class Xopt:
         self._ix_last = len(self.data)  # index of last sample generated
         self._is_done = False
         self.n_unfinished_futures = 0
+        self._progress_data = []  # intermediate outputs of submitted evaluations
+        self._early_stopping = None
 
         # check internals
         self.check_components()
@@ -192,9 +201,11 @@ class Xopt:
 
         - determine the number of candidates to request from the generator
         - pass candidate request to generator
+        - wait until the generator release time (if applicable)
         - submit candidates to evaluator
         - wait until all (asynch == False) or at least one (asynch == True) evaluation
-            is finished
+            is finished, stopping evaluations early if `options.early_stopping` is
+            specified
         - update data storage and generator data storage (if applicable)
 
         """
@@ -217,14 +228,24 @@ class Xopt:
         logger.debug(f"Generating {n_generate} candidates")
         new_samples = pd.DataFrame(self.generator.generate(n_generate))
 
-        # generator is done when it returns no new samples
+        # generator is done when it returns no new samples, unless it is waiting
+        # for the results of pending evaluations
         if len(new_samples) == 0:
+            if self._futures:
+                logger.debug("Generator returned 0 samples, waiting for evaluations")
+                self.n_unfinished_futures = self.process_futures()
+                self.dump_state()
+                return
+
             logger.debug("Generator returned 0 samples => optimization is done.")
             assert self.generator.is_done
             return
 
+        # wait until candidates can be evaluated
+        self.wait_for_release(self.generator.release_time)
+
         #  Blocking submission/evaluation
-        if self.options.asynch:
+        if self.options.asynch or self.early_stopping is not None:
             # Submit data
             self.submit_data(new_samples)
             # Process futures
@@ -236,6 +257,29 @@ class Xopt:
         # dump data to file if specified
         self.dump_state()
 
+    def wait_for_release(self, release_time: float = None):
+        """
+        Block until `release_time` (see `time.time()`) without polling. Futures that
+        finish in the meantime are processed such that their results are available
+        to the generator when it is next called.
+        """
+        if release_time is None:
+            return
+
+        remaining = release_time - time.time()
+        while remaining > 0:
+            if self._futures:
+                finished_futures, _ = concurrent.futures.wait(
+                    self._futures.values(),
+                    remaining,
+                    concurrent.futures.FIRST_COMPLETED,
+                )
+                if finished_futures:
+                    self.n_unfinished_futures = self.process_futures()
+            else:
+                time.sleep(remaining)
+            remaining = release_time - time.time()
+
     def process_futures(self):
         """
         wait for futures to finish (specified by asynch) and then internal dataframes
@@ -250,10 +294,20 @@ class Xopt:
             return_when = concurrent.futures.ALL_COMPLETED
         logger.debug(f"done. {self.n_unfinished_futures} futures remaining")
 
-        # wait for futures to finish (depending on return_when)
-        finished_futures, unfinished_futures = concurrent.futures.wait(
-            self._futures.values(), None, return_when
-        )
+        # wait for futures to finish (depending on return_when), checking progress
+        # reports periodically if evaluations can be stopped early
+        timeout = None
+        if self.early_stopping is not None:
+            timeout = self.options.early_stopping.poll_interval
+        while True:
+            finished_futures, unfinished_futures = concurrent.futures.wait(
+                self._futures.values(), timeout, return_when
+            )
+            self.process_progress()
+            if not unfinished_futures or (
+                finished_futures and return_when == concurrent.futures.FIRST_COMPLETED
+            ):
+                break
 
         # Get done indexes.
         ix_done = [ix for ix, future in self._futures.items() if future.done()]
@@ -262,8 +316,12 @@ class Xopt:
         output_data = []
         for ix in ix_done:
             future = self._futures.pop(ix)  # remove from futures
+            if future.cancelled():
+                output_data.append(cancelled_outputs())
+                continue
+
             outputs = future.result()  # Exceptions are already handled by the evaluator
-            if self.options.strict:
+            if self.options.strict and not outputs.get("xopt_cancelled", False):
                 if future.exception() is not None:
                     raise future.exception()
                 validate_outputs(outputs)
@@ -294,6 +352,27 @@ class Xopt:
 
         return len(unfinished_futures)
 
+    def process_progress(self):
+        """
+        Store progress reports of running evaluations and cancel evaluations that
+        should be stopped according to `options.early_stopping`
+        """
+        reports = self.evaluator.get_progress()
+        if not reports:
+            return
+
+        index = {future: ix for ix, future in self._futures.items()}
+        for future, step, outputs in reports:
+            ix = index.get(future)
+            if ix is None:
+                continue
+
+            self._progress_data.append({"xopt_index": ix, "xopt_step": step, **outputs})
+            if self.early_stopping is not None and not future.done():
+                if self.early_stopping.should_stop(ix, step, outputs):
+                    logger.debug(f"Cancelling evaluation {ix} at step {step}")
+                    self.evaluator.cancel(future)
+
     def check_components(self):
         """check to make sure everything is in place to step"""
         if not isinstance(self.options, XoptOptions):
@@ -308,6 +387,13 @@ class Xopt:
         if self.vocs is None:
             raise XoptError("Xopt VOCS is not specified")
 
+        if self.options.early_stopping is not None:
+            if self.evaluator.progress_kwarg is None or self.evaluator.vectorized:
+                raise XoptError(
+                    "early stopping requires a non-vectorized evaluator with "
+                    "`progress_kwarg` specified"
+                )
+
     def dump_state(self):
         """dump data to file"""
         if self.options.dump_file is not None:
@@ -347,6 +433,28 @@ class Xopt:
     def is_done(self):
         return self._is_done or self.generator.is_done
 
+    @property
+    def early_stopping(self):
+        """successive halving rule specified by `options.early_stopping`"""
+        if self.options.early_stopping is None:
+            return None
+        if (
+            self._early_stopping is None
+            or self._early_stopping.options is not self.options.early_stopping
+        ):
+            self._early_stopping = SuccessiveHalving(
+                self.vocs, self.options.early_stopping
+            )
+        return self._early_stopping
+
+    @property
+    def progress_data(self):
+        """
+        DataFrame of intermediate outputs reported by submitted evaluations,
+        `xopt_index` refers to the index of the evaluation in `data`
+        """
+        return pd.DataFrame(self._progress_data)
+
     @property
     def new_data(self):
         return self._new_data
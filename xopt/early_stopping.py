@@ -0,0 +1,86 @@
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, Hashable
+
+from pydantic import Field
+
+from xopt.pydantic import XoptBaseModel
+from xopt.vocs import VOCS
+
+logger = logging.getLogger(__name__)
+
+
+class SuccessiveHalvingOptions(XoptBaseModel):
+    min_step: float = Field(
+        1.0,
+        description="step of the first rung, evaluations are never stopped before "
+        "reporting progress at this step",
+    )
+    reduction_factor: float = Field(
+        3.0,
+        description="rungs are located at steps `min_step * reduction_factor**k`, "
+        "only the best `1 / reduction_factor` of evaluations continue past each rung",
+    )
+    min_rung_size: int = Field(
+        3,
+        description="minimum number of evaluations recorded at a rung before "
+        "evaluations are stopped at that rung",
+    )
+    poll_interval: float = Field(
+        0.1, description="interval in seconds at which progress reports are checked"
+    )
+
+
+class SuccessiveHalving:
+    def __init__(self, vocs: VOCS, options: SuccessiveHalvingOptions):
+        """
+        Asynchronous successive halving (https://arxiv.org/abs/1810.05934) of
+        running evaluations based on intermediate values of the objective. The
+        first progress report of an evaluation at or beyond each rung is recorded,
+        the evaluation is stopped if its objective value is not among the best
+        `1 / reduction_factor` of all values recorded at that rung.
+        """
+        if vocs.n_objectives != 1:
+            raise ValueError("successive halving requires a single objective")
+        if options.reduction_factor <= 1.0:
+            raise ValueError("`reduction_factor` must be greater than 1")
+
+        self.options = options
+        self.objective_name = vocs.objective_names[0]
+        self._sign = 1.0 if vocs.objectives[self.objective_name] == "MINIMIZE" else -1.0
+
+        self._rungs = defaultdict(list)
+        self._last_rung = {}
+
+    def get_rung(self, step: float) -> int:
+        """returns the index of the highest rung reached at `step`, -1 if none"""
+        if step < self.options.min_step:
+            return -1
+        ratio = math.log(step / self.options.min_step)
+        return int(math.floor(ratio / math.log(self.options.reduction_factor) + 1e-9))
+
+    def should_stop(self, key: Hashable, step: float, outputs: Dict) -> bool:
+        """
+        Record the progress report of the evaluation identified by `key`, returns
+        True if the evaluation should be stopped
+        """
+        value = outputs.get(self.objective_name)
+        if value is None or math.isnan(value):
+            return False
+
+        rung = self.get_rung(step)
+        if rung <= self._last_rung.get(key, -1):
+            return False
+        self._last_rung[key] = rung
+
+        values = self._rungs[rung]
+        values.append(self._sign * value)
+        if len(values) < self.options.min_rung_size:
+            return False
+
+        n_continue = max(1, int(len(values) / self.options.reduction_factor))
+        stop = self._sign * value > sorted(values)[n_continue - 1]
+        if stop:
+            logger.debug(f"stopping evaluation {key} at step {step} (rung {rung})")
+        return stop
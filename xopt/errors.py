@@ -12,3 +12,7 @@ class GeneratorError(Exception):
 
 class VOCSError(Exception):
     pass
+
+
+class EvaluationCancelled(Exception):
+    pass
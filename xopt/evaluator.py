@@ -1,15 +1,18 @@
+import itertools
 import logging
+import multiprocessing
+import queue
 from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from enum import Enum
 from threading import Lock
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Tuple
 
 import pandas as pd
-from pydantic import BaseModel, Field, root_validator
+from pydantic import BaseModel, Field, PrivateAttr, root_validator
 
 import numpy as np
 
-from xopt.errors import XoptError
+from xopt.errors import EvaluationCancelled, XoptError
 from xopt.pydantic import JSON_ENCODERS, NormalExecutor
 from xopt.utils import (
     get_function,
@@ -42,6 +45,11 @@ class Evaluator(BaseModel):
         NormalExecutor or any instantiated Executor object
     vectorized : bool, default=False
         If true,
+    progress_kwarg : str, default=None
+        If specified, the function is passed a callback `report(step, outputs)`
+        under this keyword argument to report intermediate outputs of long
+        running evaluations. The callback raises `EvaluationCancelled` once the
+        evaluation has been cancelled, see `Evaluator.cancel`.
     """
 
     function: Callable
@@ -49,6 +57,10 @@ class Evaluator(BaseModel):
     executor: NormalExecutor = Field(exclude=True)  # Do not serialize
     function_kwargs: dict = {}
     vectorized: bool = False
+    progress_kwarg: str = None
+
+    _progress_channel = PrivateAttr(None)
+    _progress_futures: dict = PrivateAttr(default_factory=dict)
 
     class Config:
         """config"""
@@ -99,20 +111,21 @@ class Evaluator(BaseModel):
             function(input, **function_kwargs_updated)
 
         """
-        return self.safe_function(input, **{**self.function_kwargs, **kwargs})
+        kwargs = {**self._get_function_kwargs(), **kwargs}
+        return self.safe_function(input, **kwargs)
 
     def evaluate_data(self, input_data: pd.DataFrame):
         """evaluate dataframe of inputs"""
         input_data = pd.DataFrame(input_data)
 
         if self.vectorized:
-            output_data = self.safe_function(input_data, **self.function_kwargs)
+            output_data = self.safe_function(input_data, **self._get_function_kwargs())
         else:
             # This construction is needed to avoid a pickle error
             inputs = input_data.to_dict("records")
 
             funcs = [self.function] * len(inputs)
-            kwargs = [self.function_kwargs] * len(inputs)
+            kwargs = [self._get_function_kwargs()] * len(inputs)
 
             output_data = self.executor.map(
                 safe_function1_for_map,
@@ -147,9 +160,20 @@ class Evaluator(BaseModel):
         # return self.executor.submit(self.function, input, **self.function_kwargs)
         # Must call a function outside of the classs
         # See: https://stackoverflow.com/questions/44144584/typeerror-cant-pickle-thread-lock-objects
-        return self.executor.submit(
-            safe_function, self.function, input, **self.function_kwargs
+        if self.progress_kwarg is None:
+            return self.executor.submit(
+                safe_function, self.function, input, **self.function_kwargs
+            )
+
+        key, reporter = self.progress_channel.create_reporter()
+        future = self.executor.submit(
+            safe_function,
+            self.function,
+            input,
+            **{**self.function_kwargs, self.progress_kwarg: reporter},
         )
+        self._progress_futures[key] = future
+        return future
 
     def submit_data(self, input_data: pd.DataFrame):
         """submit dataframe of inputs to executor"""
@@ -167,6 +191,117 @@ class Evaluator(BaseModel):
 
         return futures
 
+    @property
+    def progress_channel(self):
+        """channel used to pass progress reports and cancellations"""
+        if self._progress_channel is None:
+            # processes can only communicate through a manager process
+            manager = None
+            if isinstance(self.executor.executor, ProcessPoolExecutor):
+                manager = multiprocessing.Manager()
+            self._progress_channel = ProgressChannel(manager)
+        return self._progress_channel
+
+    def get_progress(self) -> List[Tuple[Future, float, Dict]]:
+        """
+        Returns a list of (future, step, outputs) tuples, one for each progress
+        report received from submitted evaluations since the last call
+        """
+        if self._progress_channel is None:
+            return []
+
+        reports = [
+            (self._progress_futures[key], step, outputs)
+            for key, step, outputs in self._progress_channel.get_reports()
+            if key in self._progress_futures
+        ]
+
+        # reports are sent before evaluations finish, forget finished evaluations
+        for key, future in list(self._progress_futures.items()):
+            if future.done():
+                del self._progress_futures[key]
+                self._progress_channel.forget(key)
+
+        return reports
+
+    def cancel(self, future: Future):
+        """
+        Cancel a submitted evaluation. Evaluations that have not started are
+        cancelled directly, running evaluations are stopped by raising
+        `EvaluationCancelled` the next time they report progress.
+        """
+        if future.cancel():
+            return
+
+        for key, ele in self._progress_futures.items():
+            if ele is future:
+                self._progress_channel.cancel(key)
+
+    def _get_function_kwargs(self):
+        # evaluations that are not submitted cannot be cancelled
+        if self.progress_kwarg is None:
+            return self.function_kwargs
+        return {**self.function_kwargs, self.progress_kwarg: ProgressReporter()}
+
+
+class ProgressReporter:
+    def __init__(self, reports=None, cancelled=None, key=None):
+        """
+        Callback passed to evaluation functions to report intermediate outputs.
+        Reports are discarded if no channel is specified.
+        """
+        self._reports = reports
+        self._cancelled = cancelled
+        self._key = key
+
+    def __call__(self, step: float, outputs: Dict):
+        """
+        Report intermediate `outputs` at `step` (iteration, epoch, turn etc.),
+        raises `EvaluationCancelled` if the evaluation has been cancelled
+        """
+        if self._reports is None:
+            return
+
+        self._reports.put((self._key, step, dict(outputs)))
+        if self._key in self._cancelled:
+            raise EvaluationCancelled(f"evaluation cancelled at step {step}")
+
+
+class ProgressChannel:
+    def __init__(self, manager=None):
+        """
+        Queue of progress reports sent from evaluations and set of cancelled
+        evaluations, uses shared objects from `manager` if specified (required
+        for process pools).
+        """
+        if manager is None:
+            self._reports = queue.Queue()
+            self._cancelled = {}
+        else:
+            self._reports = manager.Queue()
+            self._cancelled = manager.dict()
+        self._manager = manager
+        self._keys = itertools.count()
+
+    def create_reporter(self) -> Tuple[int, ProgressReporter]:
+        key = next(self._keys)
+        return key, ProgressReporter(self._reports, self._cancelled, key)
+
+    def get_reports(self) -> List[Tuple[int, float, Dict]]:
+        """returns all reports received so far without blocking"""
+        reports = []
+        while True:
+            try:
+                reports.append(self._reports.get_nowait())
+            except queue.Empty:
+                return reports
+
+    def cancel(self, key: int):
+        self._cancelled[key] = True
+
+    def forget(self, key: int):
+        self._cancelled.pop(key, None)
+
 
 def safe_function1_for_map(function, inputs, kwargs):
     """
@@ -204,9 +339,25 @@ def process_safe_outputs(outputs: Dict):
     o["xopt_error"] = error
     if error:
         o["xopt_error_str"] = error_str
+    if outputs["exception"] and issubclass(
+        outputs["exception"][0], EvaluationCancelled
+    ):
+        o["xopt_cancelled"] = True
     return o
 
 
+def cancelled_outputs():
+    """
+    Returns the outputs of an evaluation that was cancelled before it started
+    """
+    return {
+        "xopt_runtime": 0.0,
+        "xopt_error": True,
+        "xopt_error_str": "evaluation cancelled before it started",
+        "xopt_cancelled": True,
+    }
+
+
 def validate_outputs(outputs):
     """
     Looks for Xopt errors in the outputs and raises XoptError if found.
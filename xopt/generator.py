@@ -80,6 +80,14 @@ class Generator(ABC):
     def is_done(self):
         return self._is_done
 
+    @property
+    def release_time(self):
+        """
+        Time (see `time.time()`) at which the last generated candidates should be
+        evaluated, None if candidates can be evaluated immediately
+        """
+        return None
+
     @property
     def data(self):
         return self._data
@@ -1,11 +1,17 @@
 from xopt.generators.bayesian.bayesian_exploration import BayesianExplorationGenerator
 from xopt.generators.bayesian.mobo import MOBOGenerator
+from xopt.generators.bayesian.multi_fidelity import MultiFidelityGenerator
+from xopt.generators.bayesian.parego import ParEGOGenerator
 from xopt.generators.bayesian.upper_confidence_bound import \
     UpperConfidenceBoundGenerator, TDUpperConfidenceBoundGenerator
 from xopt.generators.bayesian.expected_improvement import ExpectedImprovementGenerator
+from xopt.generators.bayesian.turbo import TurboGenerator
 from xopt.generators.scipy.neldermead import NelderMeadGenerator
+from xopt.generators.scipy.parallel_neldermead import ParallelNelderMeadGenerator
+from xopt.generators.scipy.multistart_neldermead import \
+    MultiStartNelderMeadGenerator
 
-from xopt.generators.ga import CNSGAGenerator
+from xopt.generators.ga import CNSGAGenerator, IslandCNSGAGenerator
 from xopt.generators.random import RandomGenerator
 
 # add generators here to be registered
@@ -18,6 +24,12 @@ registered_generators = [
     NelderMeadGenerator,
     TDUpperConfidenceBoundGenerator,
     ExpectedImprovementGenerator,
+    TurboGenerator,
+    ParEGOGenerator,
+    MultiFidelityGenerator,
+    IslandCNSGAGenerator,
+    ParallelNelderMeadGenerator,
+    MultiStartNelderMeadGenerator,
 ]
 
 generators = {gen.alias: gen for gen in registered_generators}
@@ -1,15 +1,21 @@
 from xopt.generators.bayesian.bayesian_exploration import BayesianExplorationGenerator
 from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
 from xopt.generators.bayesian.mobo import MOBOGenerator
+from xopt.generators.bayesian.multi_fidelity import MultiFidelityGenerator
+from xopt.generators.bayesian.parego import ParEGOGenerator
 from xopt.generators.bayesian.upper_confidence_bound import (
     UpperConfidenceBoundGenerator,
 )
 from xopt.generators.bayesian.expected_improvement import ExpectedImprovementGenerator
+from xopt.generators.bayesian.turbo import TurboGenerator
 
 __all__ = [
     "BayesianGenerator",
     "BayesianExplorationGenerator",
     "MOBOGenerator",
+    "MultiFidelityGenerator",
+    "ParEGOGenerator",
     "UpperConfidenceBoundGenerator",
     "ExpectedImprovementGenerator",
+    "TurboGenerator",
 ]
@@ -9,12 +9,15 @@ from torch import Tensor
 
 from xopt.generator import GeneratorOptions
 from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
+from xopt.generators.bayesian.custom_botorch.analytic import AnalyticPosteriorVariance
 from xopt.generators.bayesian.custom_botorch.constrained_acqusition import (
     ConstrainedMCAcquisitionFunction,
 )
 from xopt.generators.bayesian.objectives import (
     create_constraint_callables,
+    create_constraint_indices,
     create_mc_objective,
+    create_objective_weights,
 )
 from xopt.generators.bayesian.options import BayesianOptions
 from xopt.vocs import VOCS
@@ -51,6 +54,13 @@ class BayesianExplorationGenerator(BayesianGenerator):
         return BayesianOptions()
 
     def _get_acquisition(self, model):
+        if self.use_analytic:
+            return AnalyticPosteriorVariance(
+                model,
+                objective_weights=create_objective_weights(self.vocs, self._tkwargs),
+                constraint_indices=create_constraint_indices(self.vocs),
+            )
+
         qPV = qPosteriorVariance(
             model,
             sampler=self.sampler,
@@ -66,6 +76,13 @@ class BayesianExplorationGenerator(BayesianGenerator):
     def _get_objective(self):
         return create_mc_objective(self.vocs)
 
+    def _check_options(self, options: BayesianOptions):
+        super()._check_options(options)
+        if options.acq.cost_aware:
+            raise ValueError(
+                "cost aware acquisition is not supported by bayesian exploration"
+            )
+
 
 class qPosteriorVariance(MCAcquisitionFunction):
     def __init__(
@@ -113,6 +130,12 @@ class qPosteriorVariance(MCAcquisitionFunction):
             X=X, posterior_transform=self.posterior_transform
         )
         samples = self.sampler(posterior)
+        return self.sample_forward(samples, X)
+
+    def sample_forward(self, samples: Tensor, X: Tensor) -> Tensor:
+        r"""Evaluate qPosteriorVariance from `sample_shape x batch_shape x q x m`-dim
+        posterior samples at `X`.
+        """
         obj = self.objective(samples, X=X)
         mean = obj.mean(dim=0)
         variance_samples = (obj - mean).abs()
@@ -1,17 +1,35 @@
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 import torch
-from botorch.acquisition import ProximalAcquisitionFunction
+from botorch.acquisition import (
+    OneShotAcquisitionFunction,
+    ProximalAcquisitionFunction,
+)
 from botorch.optim import optimize_acqf
 from botorch.optim.initializers import sample_truncated_normal_perturbations
 from botorch.sampling import SobolQMCNormalSampler
 from gpytorch import Module
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 
 from xopt.generator import Generator
-from xopt.generators.bayesian.models.standard import create_standard_model
+from xopt.generators.bayesian.custom_botorch.cost_aware import (
+    CostAwareAcquisitionFunction,
+)
+from xopt.generators.bayesian.custom_botorch.optimize import (
+    optimize_acqf_dense,
+    optimize_acqf_with_deadline,
+)
+from xopt.generators.bayesian.models.standard import (
+    create_cost_model,
+    create_standard_model,
+)
 from xopt.generators.bayesian.options import BayesianOptions
 from xopt.vocs import VOCS
 
@@ -25,12 +43,18 @@ class BayesianGenerator(Generator, ABC):
 
         super().__init__(vocs, options)
 
+        # torch threads are a process wide setting, applied once here
+        if self.options.n_threads is not None:
+            torch.set_num_threads(self.options.n_threads)
+
         self._model = None
+        self._cost_model = None
         self._acquisition = None
         self.sampler = SobolQMCNormalSampler(self.options.acq.monte_carlo_samples)
         self.objective = self._get_objective()
 
-        self._tkwargs = {"dtype": torch.double, "device": "cpu"}
+        # flag to specify if the last call to generate hit the time budget
+        self.time_budget_reached = False
 
     @staticmethod
     def default_options() -> BayesianOptions:
@@ -51,38 +75,72 @@ class BayesianGenerator(Generator, ABC):
             return self.vocs.random_inputs(self.options.n_initial)
 
         else:
-            bounds = self._get_bounds()
+            deadline = self._get_deadline(time.time())
 
             # update internal model with internal data
             self.train_model(self.data)
 
-            if self.options.optim.use_nearby_initial_points:
-                # generate starting points for optimization (note in real domain)
-                inputs = self.get_input_data(self.data)
-                batch_initial_points = sample_truncated_normal_perturbations(
-                    inputs[-1].unsqueeze(0),
-                    n_discrete_points=self.options.optim.raw_samples,
-                    sigma=0.5,
-                    bounds=bounds,
-                ).unsqueeze(-2)
-                raw_samples = None
-            else:
-                batch_initial_points = None
-                raw_samples = self.options.optim.raw_samples
-
+            bounds = self._get_bounds()
             acq_funct = self.get_acquisition(self._model)
 
             # get candidates in real domain
+            candidates = self.optimize_acquisition(acq_funct, bounds, deadline)
+            return self._convert_candidates_to_inputs(candidates)
+
+    def optimize_acquisition(self, acq_funct, bounds, deadline: float = None):
+        """
+        Returns a single candidate that maximizes the acquisition function inside
+        of `bounds`, optimization is stopped at `deadline` if specified
+        """
+        budget_reached = False
+        if self.options.optim.dense_samples is not None:
+            # evaluate acquisition function on a dense set of points
+            candidates, out, budget_reached = optimize_acqf_dense(
+                acq_function=acq_funct,
+                bounds=bounds,
+                n_samples=self.options.optim.dense_samples,
+                batch_size=self.options.optim.dense_batch_size,
+                num_polish=self.options.optim.dense_polish,
+                deadline=deadline,
+            )
+        elif deadline is None:
+            batch_initial_points, raw_samples = self._get_initial_conditions(bounds)
             candidates, out = optimize_acqf(
                 acq_function=acq_funct,
                 bounds=bounds,
-                q=n_candidates,
+                q=1,
                 raw_samples=raw_samples,
                 batch_initial_conditions=batch_initial_points,
                 num_restarts=self.options.optim.num_restarts,
             )
-            logger.debug("Best candidate from optimize", candidates, out)
-            return self.vocs.convert_numpy_to_inputs(candidates.detach().numpy())
+        else:
+            batch_initial_points, raw_samples = self._get_initial_conditions(bounds)
+
+            # one-shot acquisition functions jointly optimize additional points
+            q = 1
+            if isinstance(acq_funct, OneShotAcquisitionFunction):
+                q = acq_funct.get_augmented_q_batch_size(1)
+
+            candidates, out, budget_reached = optimize_acqf_with_deadline(
+                acq_function=acq_funct,
+                bounds=bounds,
+                num_restarts=self.options.optim.num_restarts,
+                deadline=deadline,
+                raw_samples=raw_samples,
+                batch_initial_conditions=batch_initial_points,
+                q=q,
+            )
+            if isinstance(acq_funct, OneShotAcquisitionFunction):
+                candidates = acq_funct.extract_candidates(candidates)
+
+        self.time_budget_reached |= budget_reached
+        if budget_reached:
+            logger.warning(
+                "time budget reached during acquisition function "
+                "optimization, returning best candidate found so far"
+            )
+        logger.debug("Best candidate from optimize", candidates, out)
+        return candidates
 
     def train_model(self, data: pd.DataFrame = None, update_internal=True) -> Module:
         """
@@ -98,6 +156,14 @@ class BayesianGenerator(Generator, ABC):
             pd.unique(self.vocs.variable_names + self.vocs.output_names)
         ].dropna()
 
+        # select local subset of data if requested
+        valid_data = self.get_training_subset(valid_data)
+
+        # average repeated measurements if requested
+        n_repeats, sum_squares = None, None
+        if self.options.training.aggregate_duplicates:
+            valid_data, n_repeats, sum_squares = self.aggregate_duplicates(valid_data)
+
         # create dataframes for processed data
         variable_data = self.vocs.variable_data(valid_data, "")
         objective_data = self.vocs.objective_data(valid_data, "")
@@ -109,24 +175,130 @@ class BayesianGenerator(Generator, ABC):
             constraint_data,
             bounds=self.vocs.bounds,
             tkwargs=self._tkwargs,
+            n_repeats=n_repeats,
+            sum_squares=sum_squares,
             **self.options.model.dict(),
         )
 
         if update_internal:
             self._model = _model
+            if self.options.acq.cost_aware:
+                self._cost_model = self.train_cost_model(data)
         return _model
 
+    def train_cost_model(self, data: pd.DataFrame = None) -> Module:
+        """
+        Returns a model of the logarithm of the evaluation cost (`xopt_runtime`)
+        """
+        if data is None:
+            data = self.data
+
+        if "xopt_runtime" not in data:
+            raise ValueError("cost aware acquisition requires `xopt_runtime` data")
+
+        valid_data = data[self.vocs.variable_names + ["xopt_runtime"]].dropna()
+        valid_data = self.get_training_subset(valid_data)
+
+        return create_cost_model(
+            self.vocs.variable_data(valid_data, ""),
+            valid_data["xopt_runtime"],
+            bounds=self.vocs.bounds,
+            tkwargs=self._tkwargs,
+        )
+
+    def get_training_subset(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the subset of data used to train the model, specified by
+        `options.training`. Points are selected by querying a KD-tree built from
+        inputs normalized to the [0,1] domain, centered on the last point in
+        `self.data`, such that the cost of training and acquisition function
+        optimization is bounded regardless of the number of samples.
+        """
+        n_neighbors = self.options.training.n_nearest_neighbors
+        radius = self.options.training.neighborhood_radius
+        if (n_neighbors is None and radius is None) or self.data.empty:
+            return data
+
+        lower, upper = self.vocs.bounds
+        inputs = (data[self.vocs.variable_names].to_numpy() - lower) / (upper - lower)
+        center = (self._get_training_center() - lower) / (upper - lower)
+        tree = cKDTree(inputs)
+
+        if n_neighbors is not None:
+            n_neighbors = min(n_neighbors, len(data))
+            distance_upper_bound = np.inf if radius is None else radius
+            distances, index = tree.query(
+                center, k=n_neighbors, distance_upper_bound=distance_upper_bound
+            )
+            index = np.atleast_1d(index)[np.isfinite(np.atleast_1d(distances))]
+        else:
+            index = tree.query_ball_point(center, radius)
+
+        return data.iloc[np.sort(index)]
+
+    def aggregate_duplicates(self, data: pd.DataFrame):
+        """
+        Returns a tuple of (aggregated_data, n_repeats, sum_squares) where rows of
+        data with equal variable values, up to `options.training.duplicate_tolerance`
+        in every normalized variable, are replaced by their mean. Groups are
+        chained, i.e. two rows are in the same group if they are connected by a
+        sequence of rows within the tolerance of each other. `n_repeats` contains
+        the number of rows averaged for each aggregated row and `sum_squares` the
+        sum of squared deviations of each output from its mean in each group.
+        """
+        lower, upper = self.vocs.bounds
+        inputs = (data[self.vocs.variable_names].to_numpy() - lower) / (upper - lower)
+
+        tolerance = self.options.training.duplicate_tolerance
+        pairs = cKDTree(inputs).query_pairs(tolerance, p=np.inf, output_type="ndarray")
+        adjacency = coo_matrix(
+            (np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])),
+            shape=(len(data), len(data)),
+        )
+        _, groups = connected_components(adjacency, directed=False)
+
+        grouped = data.groupby(groups)
+        n_repeats = grouped.size().to_numpy()
+        output_names = list(data.columns.difference(self.vocs.variable_names))
+        sum_squares = grouped[output_names].var(ddof=0).mul(n_repeats, axis=0)
+        return grouped.mean(), n_repeats, sum_squares
+
+    def _get_training_center(self) -> np.ndarray:
+        """Returns the center of the local training subset in the real domain"""
+        return self.data[self.vocs.variable_names].iloc[-1].to_numpy()
+
+    def _get_deadline(self, start_time: float):
+        """
+        Returns the time (see `time.time()`) at which acquisition function
+        optimization is stopped, None if `options.optim.time_budget` is not specified
+        """
+        self.time_budget_reached = False
+        if self.options.optim.time_budget is None:
+            return None
+        return start_time + self.options.optim.time_budget
+
     def get_acquisition(self, model):
         """
         Returns a function that can be used to evaluate the acquisition function
         """
-        # re-create sampler/objective from options
-        self.sampler = SobolQMCNormalSampler(self.options.acq.monte_carlo_samples)
-        self.objective = self._get_objective()
+        # re-create sampler if the number of samples was changed in options
+        if self.sampler.sample_shape != torch.Size(
+            [self.options.acq.monte_carlo_samples]
+        ):
+            self.sampler = SobolQMCNormalSampler(self.options.acq.monte_carlo_samples)
+
+        # match the precision of the objective to the model
+        self.objective.to(**self._tkwargs)
 
         # get base acquisition function
         acq = self._get_acquisition(model)
 
+        # maximize acquisition value per unit cost if requested
+        if self.options.acq.cost_aware:
+            acq = CostAwareAcquisitionFunction(
+                acq, self._cost_model, log=getattr(acq, "log", False)
+            )
+
         # add proximal biasing if requested
         if self.options.acq.proximal_lengthscales is not None:
             acq = ProximalAcquisitionFunction(
@@ -137,6 +309,36 @@ class BayesianGenerator(Generator, ABC):
 
         return acq
 
+    def _get_initial_conditions(self, bounds):
+        """
+        Returns a tuple of (batch_initial_points, raw_samples) used to start
+        acquisition function optimization
+        """
+        if self.options.optim.use_nearby_initial_points:
+            # generate starting points for optimization (note in real domain)
+            inputs = self.get_input_data(self.data)
+            batch_initial_points = sample_truncated_normal_perturbations(
+                inputs[-1].unsqueeze(0),
+                n_discrete_points=self.options.optim.raw_samples,
+                sigma=0.5,
+                bounds=bounds,
+            ).unsqueeze(-2)
+            raw_samples = None
+        else:
+            batch_initial_points = None
+            raw_samples = self.options.optim.raw_samples
+
+        return batch_initial_points, raw_samples
+
+    def _convert_candidates_to_inputs(self, candidates):
+        """
+        Returns candidates in the real domain as inputs, clipped to the variable
+        bounds to remove round off errors when using single precision
+        """
+        lower, upper = self.vocs.bounds
+        candidates = np.clip(candidates.detach().double().numpy(), lower, upper)
+        return self.vocs.convert_numpy_to_inputs(candidates)
+
     def get_training_data(self, data: pd.DataFrame):
         return self.get_input_data(data), self.get_outcome_data(data)
 
@@ -158,6 +360,17 @@ class BayesianGenerator(Generator, ABC):
     def model(self):
         return self._model
 
+    @property
+    def use_analytic(self) -> bool:
+        """
+        Returns True if analytic acquisition functions are used
+        """
+        return self.options.acq.use_analytic
+
+    @property
+    def _tkwargs(self):
+        return {"dtype": getattr(torch, self.options.dtype), "device": "cpu"}
+
     def _get_bounds(self):
         bounds = torch.tensor(self.vocs.bounds, **self._tkwargs)
         # if specified modify bounds to limit maximum travel distances
@@ -196,6 +409,9 @@ class BayesianGenerator(Generator, ABC):
         return bounds
 
     def _check_options(self, options: BayesianOptions):
+        if options.dtype not in ["float32", "float64"]:
+            raise ValueError("`options.dtype` must be one of `float32`, `float64`")
+
         if options.acq.proximal_lengthscales is not None:
             n_lengthscales = len(options.acq.proximal_lengthscales)
 
@@ -0,0 +1,214 @@
+import math
+from abc import ABC
+from typing import List, Optional, Tuple, Union
+
+import torch
+from botorch.acquisition import AcquisitionFunction
+from botorch.models import ModelListGP
+from botorch.models.model import Model
+from botorch.models.utils import gpt_posterior_settings
+from botorch.utils.transforms import t_batch_mode_transform
+from torch import Tensor
+
+
+class ConstrainedAnalyticAcquisitionFunction(AcquisitionFunction, ABC):
+    def __init__(
+        self,
+        model: ModelListGP,
+        objective_weights: Tensor,
+        constraint_indices: Optional[List[int]] = None,
+        infeasible_shift: float = 5.0,
+    ) -> None:
+        r"""Base class for analytic (q=1) acquisition functions of a linear
+        objective over the outputs of a ModelListGP with independent objective and
+        constraint models, weighted by the probability of feasibility.
+
+        Args:
+            model: A fitted ModelListGP.
+            objective_weights: A `m`-dim Tensor of weights defining a linear
+                objective (assuming maximization) over the model outputs.
+            constraint_indices: Indices of the model outputs that are constraints,
+                constraints are satisfied when the output is negative.
+            infeasible_shift: Shift applied to constraint outputs whose median is
+                infeasible, as in `constraint_function` with `quantile_cutoff=0.5`.
+        """
+        super().__init__(model=model)
+        self.register_buffer("objective_weights", objective_weights)
+        self.constraint_indices = constraint_indices or []
+        self.infeasible_shift = infeasible_shift
+
+    def _objective_posterior(self, X: Tensor) -> Tuple[Tensor, Tensor]:
+        r"""Returns the mean and standard deviation of the linear objective at `X`
+        (a `batch_shape x 1 x d`-dim Tensor), each with shape `batch_shape`.
+        """
+        mean, variance = 0.0, 0.0
+        for idx, weight in enumerate(self.objective_weights):
+            if weight == 0:
+                continue
+            posterior = self.model.models[idx].posterior(X)
+            output_mean = posterior.mean.squeeze(-1).squeeze(-1)
+            output_variance = posterior.variance.squeeze(-1).squeeze(-1)
+            mean = mean + weight * output_mean
+            variance = variance + weight**2 * output_variance
+
+        return mean, variance.clamp_min(1e-12).sqrt()
+
+    def _log_feasibility(self, X: Tensor) -> Tensor:
+        r"""Returns the log probability that all constraints are satisfied at `X`,
+        equivalent to the feasibility weighting of the monte carlo acquisition
+        functions with the default `create_constraint_callables`.
+
+        Constraint models are Gaussian in their Bilog transformed outcome space.
+        Since the Bilog transform is monotonic and preserves the sign of the
+        outcome, each constraint is satisfied with probability `Phi(-mean / sigma)`
+        of the latent posterior. Where the median of a constraint is infeasible
+        (`mean > 0`), the monte carlo weighting shifts the outcome by
+        `infeasible_shift`, which corresponds to the threshold
+        `bilog(-infeasible_shift)` in the latent space.
+        """
+        threshold = -math.log1p(self.infeasible_shift)
+        log_feasibility = torch.zeros(X.shape[:-2]).to(X)
+        for idx in self.constraint_indices:
+            mean, sigma = latent_posterior(self.model.models[idx], X)
+            upper = torch.where(mean > 0, threshold, 0.0)
+            log_feasibility = log_feasibility + torch.special.log_ndtr(
+                (upper - mean) / sigma
+            )
+
+        return log_feasibility
+
+
+class AnalyticUpperConfidenceBound(ConstrainedAnalyticAcquisitionFunction):
+    def __init__(
+        self,
+        model: ModelListGP,
+        beta: Union[float, Tensor],
+        objective_weights: Tensor,
+        constraint_indices: Optional[List[int]] = None,
+    ) -> None:
+        r"""Analytic Upper Confidence Bound weighted by the probability of
+        feasibility, equivalent to the constrained `qUpperConfidenceBound` for
+        `q=1`.
+
+        Args:
+            model: A fitted ModelListGP.
+            beta: Either a scalar or a one-dim tensor with `b` elements (batch mode)
+                representing the trade-off parameter between mean and covariance
+            objective_weights: A `m`-dim Tensor of weights defining a linear
+                objective (assuming maximization) over the model outputs.
+            constraint_indices: Indices of the model outputs that are constraints.
+        """
+        super().__init__(model, objective_weights, constraint_indices)
+        self.register_buffer("beta", torch.as_tensor(beta).to(objective_weights))
+
+    @t_batch_mode_transform(expected_q=1)
+    def forward(self, X: Tensor) -> Tensor:
+        mean, sigma = self._objective_posterior(X)
+        ucb = mean + self.beta.sqrt() * sigma
+        return ucb * self._log_feasibility(X).exp()
+
+
+class AnalyticExpectedImprovement(ConstrainedAnalyticAcquisitionFunction):
+    def __init__(
+        self,
+        model: ModelListGP,
+        best_f: Union[float, Tensor],
+        objective_weights: Tensor,
+        constraint_indices: Optional[List[int]] = None,
+        log: bool = True,
+    ) -> None:
+        r"""Analytic Expected Improvement weighted by the probability of
+        feasibility. By default the logarithm of the acquisition function is
+        returned, which is numerically stable far from the incumbent, see
+        (https://arxiv.org/abs/2310.20708) for details.
+
+        Args:
+            model: A fitted ModelListGP.
+            best_f: Either a scalar or a `b`-dim Tensor (batch mode) representing
+                the best function value observed so far (assumed noiseless).
+            objective_weights: A `m`-dim Tensor of weights defining a linear
+                objective (assuming maximization) over the model outputs.
+            constraint_indices: Indices of the model outputs that are constraints.
+            log: If True, return log(EI * P(feasible)), otherwise return
+                EI * P(feasible) (required if the acquisition function is
+                multiplied by positive weights, e.g. proximal biasing).
+        """
+        super().__init__(model, objective_weights, constraint_indices)
+        self.register_buffer("best_f", torch.as_tensor(best_f).to(objective_weights))
+        self.log = log
+
+    @t_batch_mode_transform(expected_q=1)
+    def forward(self, X: Tensor) -> Tensor:
+        mean, sigma = self._objective_posterior(X)
+        u = (mean - self.best_f.expand_as(mean)) / sigma
+        log_acq = log_ei_helper(u) + sigma.log() + self._log_feasibility(X)
+        return log_acq if self.log else log_acq.exp()
+
+
+class AnalyticPosteriorVariance(ConstrainedAnalyticAcquisitionFunction):
+    r"""Analytic posterior deviation weighted by the probability of feasibility,
+    equivalent to the constrained `qPosteriorVariance` for `q=1`, which estimates
+    `E|f(x) - mean(x)| = sqrt(2 / pi) * sigma(x)`.
+    """
+
+    @t_batch_mode_transform(expected_q=1)
+    def forward(self, X: Tensor) -> Tensor:
+        _, sigma = self._objective_posterior(X)
+        return math.sqrt(2.0 / math.pi) * sigma * self._log_feasibility(X).exp()
+
+
+def latent_posterior(model: Model, X: Tensor) -> Tuple[Tensor, Tensor]:
+    r"""Returns the mean and standard deviation of a single output GP model at
+    `X` (a `batch_shape x 1 x d`-dim Tensor) in the transformed outcome space,
+    ie. without applying `untransform_posterior` of the outcome transform.
+    """
+    model.eval()
+    X = model.transform_inputs(X)
+    with gpt_posterior_settings():
+        mvn = model(X)
+    mean = mvn.mean.squeeze(-1)
+    sigma = mvn.variance.clamp_min(1e-12).sqrt().squeeze(-1)
+    return mean, sigma
+
+
+_neg_inv_sqrt_eps = -1e6
+_log_sqrt_2pi = math.log(2 * math.pi) / 2
+_log_sqrt_pi_div_2 = math.log(math.pi / 2) / 2
+
+
+def log_ei_helper(u: Tensor) -> Tensor:
+    r"""Numerically stable computation of log(phi(u) + u * Phi(u)), where phi and
+    Phi are the standard normal pdf and cdf respectively.
+    """
+    normal = torch.distributions.Normal(torch.zeros_like(u), torch.ones_like(u))
+
+    # direct computation is accurate for u > -1
+    u_upper = u.clamp_min(-1.0)
+    direct = torch.log(normal.log_prob(u_upper).exp() + u_upper * normal.cdf(u_upper))
+
+    # asymptotic expansion in terms of the scaled complementary error function
+    u_lower = u.clamp(_neg_inv_sqrt_eps, -1.0)
+    log_erfcx = torch.special.erfcx(-u_lower / math.sqrt(2)).log()
+    asymptotic = (
+        -(u_lower**2) / 2
+        - _log_sqrt_2pi
+        + _log1mexp(u_lower.abs().log() + log_erfcx + _log_sqrt_pi_div_2)
+    )
+
+    # for very negative u, log(1 - sqrt(pi / 2) |u| erfcx(-u / sqrt(2))) ~ -2log|u|
+    u_tail = u.clamp_max(_neg_inv_sqrt_eps)
+    tail = -(u_tail**2) / 2 - _log_sqrt_2pi - 2 * u_tail.abs().log()
+
+    return torch.where(
+        u > -1.0, direct, torch.where(u > _neg_inv_sqrt_eps, asymptotic, tail)
+    )
+
+
+def _log1mexp(x: Tensor) -> Tensor:
+    r"""Numerically stable computation of log(1 - exp(x)) for x < 0"""
+    log2 = math.log(2)
+    return torch.where(
+        x > -log2,
+        torch.log(-torch.expm1(x.clamp_max(-1e-12))),
+        torch.log1p(-torch.exp(x.clamp_max(-log2))),
+    )
@@ -1,9 +1,7 @@
 from typing import Callable, List, Optional
 
 import torch
-from botorch.acquisition import (
-    MCAcquisitionFunction,
-)
+from botorch.acquisition import MCAcquisitionFunction
 from botorch.acquisition.objective import GenericMCObjective, PosteriorTransform
 from botorch.models.model import Model
 from botorch.utils import apply_constraints
@@ -78,7 +76,28 @@ class ConstrainedMCAcquisitionFunction(MCAcquisitionFunction):
         samples = self.sampler(posterior)
         obj = self.objective(samples, X=X)
 
+        # evaluate the base acquisition function using the same posterior samples
+        base_value = self._base_acquisition_from_samples(samples, X)
+        if base_value is None:
+            base_value = self.base_acqusition(X)
+
         # multiply the output of the base acquisition function by the feasibility
-        return (self.base_acqusition(X) + self.infeasible_cost) * obj.max(dim=-1)[
-            0
-        ].mean(dim=0)
+        return (base_value + self.infeasible_cost) * obj.max(dim=-1)[0].mean(dim=0)
+
+    def _base_acquisition_from_samples(
+        self, samples: Tensor, X: Tensor
+    ) -> Optional[Tensor]:
+        r"""Evaluate the base acquisition function from posterior samples drawn by
+        the (shared) sampler, avoiding a second posterior computation.
+
+        Returns None if the base acquisition function does not implement
+        `sample_forward(samples, X)`, in which case it should be called directly.
+        """
+        base = self.base_acqusition
+        if base.posterior_transform is not self.posterior_transform:
+            return None
+
+        if hasattr(base, "sample_forward"):
+            return base.sample_forward(samples, X)
+
+        return None
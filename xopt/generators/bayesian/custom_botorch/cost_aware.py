@@ -0,0 +1,60 @@
+import math
+
+import torch
+from botorch.acquisition import AcquisitionFunction
+from botorch.models.model import Model
+from torch import Tensor
+
+
+class CostAwareAcquisitionFunction(AcquisitionFunction):
+    def __init__(
+        self,
+        acq_function: AcquisitionFunction,
+        cost_model: Model,
+        log: bool = False,
+        min_cost: float = 1e-2,
+    ) -> None:
+        r"""Acquisition function value per unit of expected evaluation cost.
+
+        The cost model is a GP fit to the logarithm of the evaluation cost, such
+        that the expected cost of a point is `exp(mean + variance / 2)`. The base
+        acquisition value is divided by the expected cost, clamped below by
+        `min_cost` (as in `InverseCostWeightedUtility`), which requires a
+        non-negative base acquisition function such as expected improvement. Log
+        acquisition functions subtract the log expected cost instead.
+
+        Args:
+            acq_function: The base acquisition function, returning non-negative
+                values or the logarithm of non-negative values.
+            cost_model: A single output model of the log evaluation cost.
+            log: If True, the base acquisition function returns the logarithm of
+                the acquisition value and the log expected cost is subtracted.
+            min_cost: A lower bound on the expected cost, in units of the
+                evaluation cost.
+        """
+        super().__init__(model=acq_function.model)
+        self.acq_func = acq_function
+        self.cost_model = cost_model
+        self.log = log
+        self.min_cost = min_cost
+        if hasattr(acq_function, "X_pending"):
+            self.X_pending = acq_function.X_pending
+
+    def forward(self, X: Tensor) -> Tensor:
+        value = self.acq_func(X)
+        log_cost = self.log_expected_cost(X)
+        if self.log:
+            return value - log_cost
+
+        return value / log_cost.exp()
+
+    def log_expected_cost(self, X: Tensor) -> Tensor:
+        r"""Returns the log of the total expected cost of evaluating each t-batch
+        of `X` (a `batch_shape x q x d`-dim Tensor), clamped below by the log of
+        `min_cost`.
+        """
+        posterior = self.cost_model.posterior(X)
+        mean = posterior.mean.squeeze(-1)
+        variance = posterior.variance.squeeze(-1)
+        log_cost = torch.logsumexp(mean + variance / 2.0, dim=-1)
+        return log_cost.clamp_min(math.log(self.min_cost))
@@ -0,0 +1,132 @@
+import math
+from typing import Any, List, Optional
+
+import torch
+from botorch.models.gp_regression import MIN_INFERRED_NOISE_LEVEL
+from gpytorch.constraints import GreaterThan
+from gpytorch.lazy import DiagLazyTensor
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.likelihoods.noise_models import HomoskedasticNoise
+from gpytorch.mlls import AddedLossTerm
+from gpytorch.priors import GammaPrior, Prior
+from torch import Tensor
+
+
+class RepeatedMeasurementNoise(HomoskedasticNoise):
+    def __init__(
+        self,
+        n_repeats: Tensor,
+        noise_prior: Optional[Prior] = None,
+        noise_constraint: Optional[GreaterThan] = None,
+    ) -> None:
+        r"""Homoskedastic noise model for training points that are the mean of
+        repeated measurements, the learned noise of a single measurement is divided
+        by the number of repeats of each training point.
+
+        The training inputs and the spread of the repeated measurements are set
+        with `set_train_data`. Noise is only scaled for inputs that match the
+        training inputs, new observations at any other inputs have the noise of a
+        single measurement. The spread of the repeated measurements is added to
+        the marginal log likelihood, such that the noise level is inferred from
+        both the aggregated training points and the repeated measurements.
+
+        Args:
+            n_repeats: A `n`-dim Tensor containing the number of measurements
+                averaged for each training point.
+            noise_prior: Prior for the noise of a single measurement.
+            noise_constraint: Constraint for the noise of a single measurement.
+        """
+        super().__init__(noise_prior=noise_prior, noise_constraint=noise_constraint)
+        self.register_buffer("n_repeats", n_repeats)
+        self.register_buffer("train_inputs", None)
+        self.register_buffer("sum_squares", None)
+        self.register_added_loss_term("repeated_measurements")
+
+    def set_train_data(
+        self, train_inputs: List[Tensor], sum_squares: Optional[Tensor] = None
+    ):
+        r"""Set the training inputs and the spread of the repeated measurements.
+
+        Args:
+            train_inputs: `n x d`-dim Tensors of the training inputs, in each form
+                that is passed to the likelihood (e.g. with and without input
+                transforms applied).
+            sum_squares: A `n`-dim Tensor containing the sum of squared deviations
+                of the repeated measurements from their mean for each training
+                point, in the outcome space of the model.
+        """
+        self.train_inputs = torch.stack(train_inputs)
+        self.sum_squares = sum_squares
+        if sum_squares is not None:
+            self.update_added_loss_term(
+                "repeated_measurements", RepeatedMeasurementLoss(self)
+            )
+
+    def forward(
+        self, *params: Any, shape: Optional[torch.Size] = None, **kwargs: Any
+    ) -> DiagLazyTensor:
+        noise_covar = super().forward(*params, shape=shape, **kwargs)
+        if "noise" in kwargs or not params or self.train_inputs is None:
+            return noise_covar
+
+        # only scale the noise of inputs that match the training inputs
+        X = params[0][0] if isinstance(params[0], (list, tuple)) else params[0]
+        if X.shape[-2:] != self.train_inputs.shape[-2:]:
+            return noise_covar
+
+        match = torch.zeros(X.shape[:-1], dtype=torch.bool, device=X.device)
+        for train_inputs in self.train_inputs.to(X):
+            match |= torch.isclose(X, train_inputs).all(dim=-1)
+
+        n_repeats = torch.where(match, self.n_repeats.to(X), torch.ones_like(X[..., 0]))
+        return DiagLazyTensor(noise_covar.diag() / n_repeats)
+
+    def repeated_measurement_log_likelihood(self) -> Tensor:
+        r"""Log likelihood of the deviations of the repeated measurements from
+        their mean, given the noise of a single measurement. Together with the
+        marginal log likelihood of the aggregated training points, this is the
+        marginal log likelihood of all measurements.
+        """
+        noise = self.noise.squeeze(-1)
+        n_deviations = (self.n_repeats - 1).sum()
+        return -0.5 * (
+            self.sum_squares.sum() / noise
+            + n_deviations * torch.log(2 * math.pi * noise)
+            + self.n_repeats.log().sum()
+        )
+
+
+class RepeatedMeasurementLoss(AddedLossTerm):
+    def __init__(self, noise_covar: RepeatedMeasurementNoise):
+        """Adds the spread of repeated measurements to the marginal log likelihood"""
+        self.noise_covar = noise_covar
+
+    def loss(self, *params) -> Tensor:
+        return self.noise_covar.repeated_measurement_log_likelihood()
+
+
+def create_repeated_measurement_likelihood(
+    n_repeats: Tensor, noise_prior: Optional[Prior] = None
+) -> GaussianLikelihood:
+    """
+    Returns a GaussianLikelihood using `RepeatedMeasurementNoise`, by default with
+    the same noise prior and constraint as botorch's SingleTaskGP
+    """
+    if noise_prior is None:
+        noise_prior = GammaPrior(1.1, 0.05)
+        noise_prior_mode = (noise_prior.concentration - 1) / noise_prior.rate
+        noise_constraint = GreaterThan(
+            MIN_INFERRED_NOISE_LEVEL,
+            transform=None,
+            initial_value=noise_prior_mode,
+        )
+    else:
+        noise_constraint = GreaterThan(1e-4)
+
+    likelihood = GaussianLikelihood(
+        noise_prior=noise_prior, noise_constraint=noise_constraint
+    )
+    likelihood.noise_covar = RepeatedMeasurementNoise(
+        n_repeats, noise_prior=noise_prior, noise_constraint=noise_constraint
+    )
+    return likelihood
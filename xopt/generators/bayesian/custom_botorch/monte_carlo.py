@@ -0,0 +1,114 @@
+import math
+from typing import Optional, Union
+
+import torch
+from botorch.acquisition import MCAcquisitionFunction
+from botorch.acquisition.objective import MCAcquisitionObjective, PosteriorTransform
+from botorch.models.model import Model
+from botorch.sampling import MCSampler
+from botorch.utils.transforms import concatenate_pending_points, t_batch_mode_transform
+from torch import Tensor
+
+
+class qUpperConfidenceBound(MCAcquisitionFunction):
+    def __init__(
+        self,
+        model: Model,
+        beta: float,
+        sampler: Optional[MCSampler] = None,
+        objective: Optional[MCAcquisitionObjective] = None,
+        posterior_transform: Optional[PosteriorTransform] = None,
+        X_pending: Optional[Tensor] = None,
+    ) -> None:
+        r"""q-Upper Confidence Bound, same as botorch's `qUpperConfidenceBound` but
+        can also be evaluated from posterior samples drawn elsewhere, see
+        `sample_forward`.
+
+        Args:
+            model: A fitted model.
+            beta: Controls tradeoff between mean and standard deviation in UCB.
+            sampler: The sampler used to draw base samples.
+            objective: The MCAcquisitionObjective under which the samples are
+                evaluated.
+            posterior_transform: A PosteriorTransform (optional).
+            X_pending: A `m x d`-dim Tensor of `m` design points that have been
+                submitted for function evaluation but have not yet been evaluated.
+        """
+        super().__init__(
+            model=model,
+            sampler=sampler,
+            objective=objective,
+            posterior_transform=posterior_transform,
+            X_pending=X_pending,
+        )
+        self.beta = beta
+
+    @concatenate_pending_points
+    @t_batch_mode_transform()
+    def forward(self, X: Tensor) -> Tensor:
+        posterior = self.model.posterior(
+            X=X, posterior_transform=self.posterior_transform
+        )
+        samples = self.sampler(posterior)
+        return self.sample_forward(samples, X)
+
+    def sample_forward(self, samples: Tensor, X: Tensor) -> Tensor:
+        r"""Evaluate qUpperConfidenceBound from `sample_shape x batch_shape x q x m`
+        -dim posterior samples at `X`.
+        """
+        obj = self.objective(samples, X=X)
+        mean = obj.mean(dim=0)
+        beta_prime = math.sqrt(self.beta * math.pi / 2)
+        ucb_samples = mean + beta_prime * (obj - mean).abs()
+        return ucb_samples.max(dim=-1)[0].mean(dim=0)
+
+
+class qExpectedImprovement(MCAcquisitionFunction):
+    def __init__(
+        self,
+        model: Model,
+        best_f: Union[float, Tensor],
+        sampler: Optional[MCSampler] = None,
+        objective: Optional[MCAcquisitionObjective] = None,
+        posterior_transform: Optional[PosteriorTransform] = None,
+        X_pending: Optional[Tensor] = None,
+    ) -> None:
+        r"""q-Expected Improvement, same as botorch's `qExpectedImprovement` but can
+        also be evaluated from posterior samples drawn elsewhere, see
+        `sample_forward`.
+
+        Args:
+            model: A fitted model.
+            best_f: The best objective value observed so far (assumed noiseless).
+            sampler: The sampler used to draw base samples.
+            objective: The MCAcquisitionObjective under which the samples are
+                evaluated.
+            posterior_transform: A PosteriorTransform (optional).
+            X_pending: A `m x d`-dim Tensor of `m` design points that have been
+                submitted for function evaluation but have not yet been evaluated.
+        """
+        super().__init__(
+            model=model,
+            sampler=sampler,
+            objective=objective,
+            posterior_transform=posterior_transform,
+            X_pending=X_pending,
+        )
+        self.register_buffer("best_f", torch.as_tensor(best_f, dtype=float))
+
+    @concatenate_pending_points
+    @t_batch_mode_transform()
+    def forward(self, X: Tensor) -> Tensor:
+        posterior = self.model.posterior(
+            X=X, posterior_transform=self.posterior_transform
+        )
+        samples = self.sampler(posterior)
+        return self.sample_forward(samples, X)
+
+    def sample_forward(self, samples: Tensor, X: Tensor) -> Tensor:
+        r"""Evaluate qExpectedImprovement from `sample_shape x batch_shape x q x m`
+        -dim posterior samples at `X`.
+        """
+        obj = self.objective(samples, X=X)
+        obj = (obj - self.best_f.unsqueeze(-1).to(obj)).clamp_min(0)
+        return obj.max(dim=-1)[0].mean(dim=0)
@@ -0,0 +1,185 @@
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import torch
+from botorch.acquisition import AcquisitionFunction
+from botorch.optim import optimize_acqf
+from botorch.optim.initializers import gen_batch_initial_conditions
+from botorch.optim.utils import columnwise_clamp
+from botorch.utils.sampling import draw_sobol_samples
+from scipy.optimize import minimize
+from torch import Tensor
+
+
+class DeadlineReached(Exception):
+    pass
+
+
+def optimize_acqf_with_deadline(
+    acq_function: AcquisitionFunction,
+    bounds: Tensor,
+    num_restarts: int,
+    deadline: float,
+    raw_samples: Optional[int] = None,
+    batch_initial_conditions: Optional[Tensor] = None,
+    q: int = 1,
+    maxiter: int = 200,
+) -> Tuple[Tensor, Tensor, bool]:
+    r"""Optimize the acquisition function from multiple restarts with L-BFGS-B,
+    stopping once `deadline` (in seconds since the epoch, see `time.time()`) is
+    reached.
+
+    All restarts are optimized jointly, the best point evaluated for each restart
+    is tracked during optimization such that the best candidate found so far is
+    returned when the deadline is reached. The acquisition function is always
+    evaluated at least once at the initial conditions.
+
+    Args:
+        acq_function: An AcquisitionFunction.
+        bounds: A `2 x d` tensor of lower and upper bounds for each column of `X`.
+        num_restarts: The number of starting points for multistart acquisition
+            function optimization.
+        deadline: Time at which optimization is stopped.
+        raw_samples: The number of samples for initialization, required if
+            `batch_initial_conditions` is not specified.
+        batch_initial_conditions: A tensor to specify the initial conditions.
+        q: The number of candidates.
+        maxiter: Maximum number of L-BFGS-B iterations.
+
+    Returns:
+        A three-element tuple containing
+
+        - a `q x d`-dim tensor of the best candidate found
+        - the acquisition value of the best candidate
+        - True if optimization was stopped by the deadline
+    """
+    if batch_initial_conditions is None:
+        batch_initial_conditions = gen_batch_initial_conditions(
+            acq_function,
+            bounds,
+            q=q,
+            num_restarts=num_restarts,
+            raw_samples=raw_samples,
+        )
+
+    X0 = columnwise_clamp(batch_initial_conditions, bounds[0], bounds[1]).detach()
+    with torch.no_grad():
+        best_values = acq_function(X0)
+    best_X = X0.clone()
+
+    def f_np_wrapper(x: np.ndarray):
+        if time.time() > deadline:
+            raise DeadlineReached()
+
+        X = torch.from_numpy(x).to(X0).view(X0.shape).requires_grad_(True)
+        values = acq_function(X)
+        loss = -values.sum()
+        gradf = torch.autograd.grad(loss, X)[0].contiguous().view(-1)
+
+        # keep track of the best point evaluated for each restart
+        with torch.no_grad():
+            improved = values > best_values
+            best_values[improved] = values[improved]
+            best_X[improved] = X[improved]
+
+        return loss.item(), gradf.cpu().numpy().astype(np.float64)
+
+    scipy_bounds = list(
+        zip(
+            bounds[0].expand(X0.shape).reshape(-1).cpu().numpy(),
+            bounds[1].expand(X0.shape).reshape(-1).cpu().numpy(),
+        )
+    )
+
+    deadline_reached = False
+    try:
+        minimize(
+            f_np_wrapper,
+            X0.view(-1).cpu().numpy().astype(np.float64),
+            method="L-BFGS-B",
+            jac=True,
+            bounds=scipy_bounds,
+            options={"maxiter": maxiter},
+        )
+    except DeadlineReached:
+        deadline_reached = True
+
+    best = torch.argmax(best_values)
+    return best_X[best], best_values[best], deadline_reached
+
+
+def optimize_acqf_dense(
+    acq_function: AcquisitionFunction,
+    bounds: Tensor,
+    n_samples: int,
+    batch_size: int = 1024,
+    num_polish: int = 0,
+    deadline: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> Tuple[Tensor, Tensor, bool]:
+    r"""Optimize the acquisition function by evaluating it on a dense scrambled
+    Sobol set of single point candidates, intended for low dimensional problems.
+
+    Candidates are evaluated in batches of at most `batch_size` points to bound
+    memory usage. The best `num_polish` candidates are then used as initial
+    conditions for gradient based optimization. If `deadline` (in seconds since
+    the epoch, see `time.time()`) is reached the best candidate found so far is
+    returned, at least one batch of candidates is always evaluated.
+
+    Args:
+        acq_function: An AcquisitionFunction.
+        bounds: A `2 x d` tensor of lower and upper bounds for each column of `X`.
+        n_samples: The number of candidates in the Sobol set.
+        batch_size: The maximum number of candidates evaluated in a single call
+            of the acquisition function.
+        num_polish: The number of best candidates optimized with L-BFGS-B.
+        deadline: Time at which optimization is stopped.
+        seed: The seed used to scramble the Sobol set.
+
+    Returns:
+        A three-element tuple containing
+
+        - a `1 x d`-dim tensor of the best candidate found
+        - the acquisition value of the best candidate
+        - True if optimization was stopped by the deadline
+    """
+    X = draw_sobol_samples(bounds, n=n_samples, q=1, seed=seed)
+
+    deadline_reached = False
+    values = []
+    with torch.no_grad():
+        for X_batch in X.split(batch_size):
+            if values and deadline is not None and time.time() > deadline:
+                deadline_reached = True
+                break
+            values.append(acq_function(X_batch))
+    values = torch.cat(values)
+    X = X[: len(values)]
+
+    best = torch.argmax(values)
+    best_X, best_value = X[best], values[best]
+    if num_polish == 0 or deadline_reached:
+        return best_X, best_value, deadline_reached
+
+    initial_conditions = X[torch.topk(values, min(num_polish, len(values))).indices]
+    if deadline is None:
+        polished_X, polished_value = optimize_acqf(
+            acq_function,
+            bounds,
+            q=1,
+            num_restarts=len(initial_conditions),
+            batch_initial_conditions=initial_conditions,
+        )
+    else:
+        polished_X, polished_value, deadline_reached = optimize_acqf_with_deadline(
+            acq_function,
+            bounds,
+            len(initial_conditions),
+            deadline,
+            batch_initial_conditions=initial_conditions,
+        )
+
+    if polished_value > best_value:
+        return polished_X, polished_value, deadline_reached
+    return best_X, best_value, deadline_reached
@@ -1,14 +1,19 @@
 import pandas as pd
 import torch
-from botorch.acquisition import qExpectedImprovement
 
 from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
+from xopt.generators.bayesian.custom_botorch.analytic import (
+    AnalyticExpectedImprovement,
+)
 from xopt.generators.bayesian.custom_botorch.constrained_acqusition import (
     ConstrainedMCAcquisitionFunction,
 )
+from xopt.generators.bayesian.custom_botorch.monte_carlo import qExpectedImprovement
 from xopt.generators.bayesian.objectives import (
     create_constraint_callables,
+    create_constraint_indices,
     create_mc_objective,
+    create_objective_weights,
 )
 from xopt.generators.bayesian.options import BayesianOptions
 from xopt.vocs import VOCS
@@ -52,6 +57,17 @@ class ExpectedImprovementGenerator(BayesianGenerator):
 
         best_f = torch.tensor(objective_data.max(), **self._tkwargs)
 
+        if self.use_analytic:
+            # proximal biasing multiplies the acquisition function by positive
+            # weights, so the log transform cannot be used
+            return AnalyticExpectedImprovement(
+                model,
+                best_f=best_f,
+                objective_weights=create_objective_weights(self.vocs, self._tkwargs),
+                constraint_indices=create_constraint_indices(self.vocs),
+                log=self.options.acq.proximal_lengthscales is None,
+            )
+
         qEI = qExpectedImprovement(
             model,
             best_f=best_f,
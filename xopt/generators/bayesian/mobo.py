@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy as np
+import pandas as pd
 import torch
 from botorch.acquisition.multi_objective import qNoisyExpectedHypervolumeImprovement
 from pydantic import Field
@@ -8,8 +10,9 @@ from xopt.generators.bayesian.objectives import (
     create_constraint_callables,
     create_mobo_objective,
 )
+from xopt.pareto import ParetoFront
 
-from xopt.vocs import VOCS
+from xopt.vocs import OBJECTIVE_WEIGHT, VOCS
 from .bayesian_generator import BayesianGenerator
 from .options import AcqOptions, BayesianOptions
 
@@ -22,6 +25,18 @@ class MOBOAcqOptions(AcqOptions):
         True,
         description="flag to determine if the dataset determines the reference point",
     )
+    partitioning_alpha: float = Field(
+        None,
+        description="approximation level of the non-dominated partitioning used to "
+        "compute hypervolume improvement (0.0 is exact), defaults to exact "
+        "partitioning for up to 3 objectives and 10**(n_objectives - 8) otherwise",
+    )
+    max_baseline_points: int = Field(
+        None,
+        description="maximum number of observed points used as the baseline for "
+        "noisy hypervolume improvement, observed pareto optimal points are selected "
+        "first followed by the most recent points",
+    )
 
 
 class MOBOOptions(BayesianOptions):
@@ -32,21 +47,74 @@ class MOBOGenerator(BayesianGenerator):
     alias = "mobo"
 
     def __init__(self, vocs: VOCS, options: MOBOOptions = MOBOOptions()):
+        """
+        Generator using the noisy expected hypervolume improvement (qNEHVI)
+        acquisition function.
+
+        The observed feasible pareto front is maintained incrementally in
+        `pareto_front` as data is added, and is used to select the baseline points
+        when `options.acq.max_baseline_points` is specified. The box decompositions
+        used by qNEHVI are computed from posterior samples of the model, which is
+        retrained every step, so they are recomputed at each step, their cost is
+        bounded by `options.acq.partitioning_alpha` and the baseline size.
+
+        Parameters
+        ----------
+        vocs: dict
+            Standard vocs dictionary for xopt
+
+        options: MOBOOptions
+            Specific options for this generator
+        """
         if not isinstance(options, MOBOOptions):
             raise ValueError("options must be a MOBOOptions object")
 
         super().__init__(vocs, options)
 
+        # observed feasible pareto optimal points in `self.data`, the hypervolume
+        # is tracked with the acquisition reference point if it is fixed
+        reference_point = None
+        if not options.acq.use_data_as_reference and options.acq.ref_point:
+            # acquisition reference point is in botorch (maximization) form
+            reference_point = {
+                name: -value * OBJECTIVE_WEIGHT[vocs.objectives[name].upper()]
+                for name, value in zip(vocs.objective_names, options.acq.ref_point)
+            }
+        self.pareto_front = ParetoFront(vocs, reference_point)
+
     @staticmethod
     def default_options() -> MOBOOptions:
         return MOBOOptions()
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, value: pd.DataFrame):
+        # replaced data invalidates the cached pareto front
+        self._data = pd.DataFrame(value)
+        self.pareto_front.reset()
+
+    def add_data(self, new_data: pd.DataFrame):
+        self._data = pd.concat([self.data, new_data], axis=0)
+        self.get_pareto_front_positions()
+
+    @property
+    def hypervolume_history(self) -> pd.DataFrame:
+        """
+        Hypervolume of the observed feasible pareto front against the number of
+        evaluations
+        """
+        self.get_pareto_front_positions()
+        return self.pareto_front.hypervolume_history
+
     def _get_objective(self):
-        return create_mobo_objective(self.vocs)
+        return create_mobo_objective(self.vocs, self._tkwargs)
 
     def _get_acquisition(self, model):
         # get reference point from data
-        inputs = self.get_input_data(self.data)
+        inputs = self.get_input_data(self.get_baseline_data())
         outcomes = self.get_outcome_data(self.data)
 
         if self.options.acq.use_data_as_reference:
@@ -66,6 +134,45 @@ class MOBOGenerator(BayesianGenerator):
             ref_point=self.options.acq.ref_point,
             sampler=self.sampler,
             objective=self.objective,
+            alpha=self.get_partitioning_alpha(),
         )
 
         return acq
+
+    def get_partitioning_alpha(self) -> float:
+        """
+        Returns the approximation level used for box decompositions, exact
+        partitioning becomes prohibitively expensive for more than 3 objectives
+        """
+        alpha = self.options.acq.partitioning_alpha
+        if alpha is None:
+            n_objectives = self.vocs.n_objectives
+            alpha = 0.0 if n_objectives <= 3 else 10.0 ** (n_objectives - 8)
+        return alpha
+
+    def get_baseline_data(self) -> pd.DataFrame:
+        """
+        Returns the data used as the baseline for noisy hypervolume improvement,
+        limited to `options.acq.max_baseline_points` if specified. Observed pareto
+        optimal points are selected first, followed by the most recent points.
+        """
+        data = self.get_training_subset(self.data)
+        max_points = self.options.acq.max_baseline_points
+        if max_points is None or len(data) <= max_points:
+            return data
+
+        pareto_index = self.data.index[self.get_pareto_front_positions()]
+        on_front = np.asarray(data.index.isin(pareto_index))
+        priority = on_front * len(data) + np.arange(len(data))
+        return data.iloc[np.sort(np.argsort(priority)[-max_points:])]
+
+    def get_pareto_front_positions(self) -> np.ndarray:
+        """
+        Returns the positions of observed feasible pareto optimal points in
+        `self.data`. The non-dominated set is maintained by `self.pareto_front` and
+        only updated with points added since the last call, it is reset when
+        `self.data` is replaced.
+        """
+        start = self.pareto_front.n_evaluations
+        self.pareto_front.add(self.data.iloc[start:])
+        return self.pareto_front.positions
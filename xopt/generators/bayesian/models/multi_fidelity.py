@@ -0,0 +1,63 @@
+import pandas as pd
+import torch
+from botorch import fit_gpytorch_model
+from botorch.models import ModelListGP, SingleTaskMultiFidelityGP
+from botorch.models.transforms import Bilog, Normalize, Standardize
+from gpytorch import ExactMarginalLogLikelihood
+
+from xopt.generators.bayesian.models.standard import create_likelihood
+
+
+def create_multi_fidelity_model(
+    input_data: pd.DataFrame,
+    objective_data: pd.DataFrame,
+    constraint_data: pd.DataFrame,
+    bounds,
+    fidelity_index: int,
+    use_low_noise_prior: bool = False,
+    tkwargs: dict = None,
+    fit: bool = True,
+    **kwargs,
+) -> ModelListGP:
+    """
+    Generate a ModelListGP that models outputs jointly across fidelities
+    - the fidelity parameter is the input column `fidelity_index`, after
+        normalization the fidelity kernel assumes that the highest fidelity is 1
+    - model outputs are transformed in the same way as `create_standard_model`
+    - model hyperparameters are trained by maximizing the marginal log likelihood
+        unless `fit` is False
+    - conservative prior options of the standard model are ignored
+    """
+    tkwargs = tkwargs or {"dtype": torch.double, "device": "cpu"}
+
+    # validate data
+    if len(input_data) == 0:
+        raise ValueError("input_data is empty/all Nans, cannot create model")
+
+    train_X = torch.tensor(input_data.to_numpy(), **tkwargs)
+    bounds = torch.tensor(bounds, **tkwargs)
+    normalize = Normalize(train_X.shape[-1], bounds=bounds)
+
+    outcomes = [(objective_data[name], Standardize(1)) for name in objective_data]
+    outcomes += [(constraint_data[name], Bilog()) for name in constraint_data]
+
+    models = []
+    for outcome, outcome_transform in outcomes:
+        train_Y = torch.tensor(outcome.to_numpy(), **tkwargs).unsqueeze(-1)
+
+        models.append(
+            SingleTaskMultiFidelityGP(
+                train_X,
+                train_Y,
+                data_fidelity=fidelity_index,
+                input_transform=normalize,
+                outcome_transform=outcome_transform,
+                likelihood=create_likelihood(use_low_noise_prior),
+            )
+        )
+        if fit:
+            mll = ExactMarginalLogLikelihood(models[-1].likelihood, models[-1])
+            fit_gpytorch_model(mll)
+
+    # create model list
+    return ModelListGP(*models)
@@ -8,6 +8,10 @@ from gpytorch.kernels import MaternKernel, ScaleKernel
 from gpytorch.likelihoods import GaussianLikelihood
 from gpytorch.priors import GammaPrior
 
+from xopt.generators.bayesian.custom_botorch.likelihoods import (
+    create_repeated_measurement_likelihood,
+)
+
 
 def create_standard_model(
     input_data: pd.DataFrame,
@@ -18,6 +22,9 @@ def create_standard_model(
     use_conservative_prior_mean: bool = False,
     use_low_noise_prior: bool = False,
     tkwargs: dict = None,
+    fit: bool = True,
+    n_repeats=None,
+    sum_squares: pd.DataFrame = None,
 ) -> ModelListGP:
     """
     Generate a standard ModelListGP for use in optimization
@@ -27,6 +34,12 @@ def create_standard_model(
         - constraints are transformed according to `vocs` such that negative values
             imply feasibility and extreme values are damped using a Bilog transform (
             see (https://arxiv.org/abs/2002.08526) for details
+    - model hyperparameters are trained by maximizing the marginal log likelihood
+        unless `fit` is False
+    - if `n_repeats` is specified each training point is the mean of `n_repeats`
+        measurements, the noise of each point is scaled accordingly, the noise
+        level is also inferred from `sum_squares` (sum of squared deviations of the
+        repeated measurements from their mean for each output) if specified
     """
     tkwargs = tkwargs or {"dtype": torch.double, "device": "cpu"}
 
@@ -37,6 +50,8 @@ def create_standard_model(
     train_X = torch.tensor(input_data.to_numpy(), **tkwargs)
     bounds = torch.tensor(bounds, **tkwargs)
     normalize = Normalize(train_X.shape[-1], bounds=bounds)
+    if n_repeats is not None:
+        n_repeats = torch.tensor(n_repeats, **tkwargs)
 
     models = []
 
@@ -44,9 +59,7 @@ def create_standard_model(
     for name in objective_data.keys():
         train_Y = torch.tensor(objective_data[name].to_numpy(), **tkwargs).unsqueeze(-1)
 
-        likelihood = None
-        if use_low_noise_prior:
-            likelihood = GaussianLikelihood(noise_prior=GammaPrior(1.0, 10.0))
+        likelihood = create_likelihood(use_low_noise_prior, n_repeats)
 
         models.append(
             SingleTaskGP(
@@ -57,8 +70,12 @@ def create_standard_model(
                 likelihood=likelihood,
             )
         )
-        mll = ExactMarginalLogLikelihood(models[-1].likelihood, models[-1])
-        fit_gpytorch_model(mll)
+        if n_repeats is not None:
+            set_repeated_measurements(models[-1], normalize, sum_squares, name)
+
+        if fit:
+            mll = ExactMarginalLogLikelihood(models[-1].likelihood, models[-1])
+            fit_gpytorch_model(mll)
 
     # do constraint models
     for name in constraint_data.keys():
@@ -80,9 +97,7 @@ def create_standard_model(
                 outputscale_prior=GammaPrior(5.0, 1.0),
             )
 
-        likelihood = None
-        if use_low_noise_prior:
-            likelihood = GaussianLikelihood(noise_prior=GammaPrior(1.0, 10.0))
+        likelihood = create_likelihood(use_low_noise_prior, n_repeats)
 
         models.append(
             SingleTaskGP(
@@ -95,12 +110,92 @@ def create_standard_model(
             )
         )
 
+        if n_repeats is not None:
+            set_repeated_measurements(models[-1], normalize, sum_squares, name)
+
         if use_conservative_prior_mean:
             models[-1].mean_module.constant.data = torch.tensor(5.0, **tkwargs)
             models[-1].mean_module.constant.requires_grad = False
 
-        mll = ExactMarginalLogLikelihood(models[-1].likelihood, models[-1])
-        fit_gpytorch_model(mll)
+        if fit:
+            mll = ExactMarginalLogLikelihood(models[-1].likelihood, models[-1])
+            fit_gpytorch_model(mll)
 
     # create model list
     return ModelListGP(*models)
+
+
+def create_likelihood(use_low_noise_prior: bool = False, n_repeats=None):
+    """
+    Returns the likelihood for a single model, None uses the SingleTaskGP default
+    """
+    noise_prior = GammaPrior(1.0, 10.0) if use_low_noise_prior else None
+    if n_repeats is not None:
+        return create_repeated_measurement_likelihood(n_repeats, noise_prior)
+    elif noise_prior is not None:
+        return GaussianLikelihood(noise_prior=noise_prior)
+    return None
+
+
+def set_repeated_measurements(
+    model: SingleTaskGP,
+    normalize: Normalize,
+    sum_squares: pd.DataFrame = None,
+    name: str = None,
+):
+    """
+    Set the training inputs of a model using `RepeatedMeasurementNoise` and the
+    spread of the repeated measurements of output `name`, which is converted to
+    the outcome space of the model using the slope of the outcome transform at the
+    mean of the measurements
+    """
+    train_X = model.train_inputs[0]
+    ss = None
+    if sum_squares is not None:
+        ss = torch.tensor(sum_squares[name].to_numpy()).to(train_X)
+
+        # outcome transforms fitted to the training data, the raw training data
+        # are the untransformed mean values
+        outcome_transform = model.outcome_transform
+        training = outcome_transform.training
+        outcome_transform.eval()
+        Y, _ = outcome_transform.untransform(model.train_targets.unsqueeze(-1))
+        Y = Y.detach().requires_grad_(True)
+        (slope,) = torch.autograd.grad(outcome_transform(Y)[0].sum(), Y)
+        outcome_transform.train(training)
+
+        ss = ss * slope.squeeze(-1) ** 2
+
+    model.likelihood.noise_covar.set_train_data([train_X, normalize(train_X)], ss)
+
+
+def create_cost_model(
+    input_data: pd.DataFrame,
+    cost_data: pd.Series,
+    bounds,
+    tkwargs: dict = None,
+) -> SingleTaskGP:
+    """
+    Generate a model of the logarithm of the evaluation cost (e.g. runtime), inputs
+    are normalized to the [0,1] domain and outputs are standardized
+    """
+    tkwargs = tkwargs or {"dtype": torch.double, "device": "cpu"}
+
+    # validate data
+    if len(input_data) == 0:
+        raise ValueError("input_data is empty/all Nans, cannot create cost model")
+
+    train_X = torch.tensor(input_data.to_numpy(), **tkwargs)
+    train_Y = torch.tensor(cost_data.to_numpy(), **tkwargs).unsqueeze(-1)
+    bounds = torch.tensor(bounds, **tkwargs)
+
+    model = SingleTaskGP(
+        train_X,
+        torch.log(train_Y.clamp_min(1e-12)),
+        input_transform=Normalize(train_X.shape[-1], bounds=bounds),
+        outcome_transform=Standardize(1),
+    )
+    mll = ExactMarginalLogLikelihood(model.likelihood, model)
+    fit_gpytorch_model(mll)
+
+    return model
@@ -0,0 +1,217 @@
+from typing import List
+
+import pandas as pd
+from botorch.acquisition import (
+    FixedFeatureAcquisitionFunction,
+    qMultiFidelityKnowledgeGradient,
+    qSimpleRegret,
+)
+from botorch.acquisition.cost_aware import InverseCostWeightedUtility
+from botorch.acquisition.utils import project_to_target_fidelity
+from botorch.models.cost import AffineFidelityCostModel
+from botorch.optim import optimize_acqf
+from gpytorch import Module
+from pydantic import Field
+
+from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
+from xopt.generators.bayesian.models.multi_fidelity import (
+    create_multi_fidelity_model,
+)
+from xopt.generators.bayesian.objectives import (
+    create_constrained_mc_objective,
+    create_mc_objective,
+)
+from xopt.generators.bayesian.options import AcqOptions, BayesianOptions
+from xopt.vocs import VOCS
+
+
+class MultiFidelityAcqOptions(AcqOptions):
+    fidelity_parameter: str = Field(
+        None,
+        description="name of the variable that specifies the evaluation fidelity, "
+        "the upper bound of the variable is the target (highest) fidelity",
+    )
+    fidelity_costs: List[float] = Field(
+        [0.1, 1.0],
+        description="relative evaluation costs at the lower and upper bounds of the "
+        "fidelity parameter, costs are interpolated linearly in between",
+    )
+    num_fantasies: int = Field(
+        16, description="number of fantasy models used by the knowledge gradient"
+    )
+
+
+class MultiFidelityOptions(BayesianOptions):
+    acq = MultiFidelityAcqOptions()
+
+
+class MultiFidelityGenerator(BayesianGenerator):
+    alias = "multi_fidelity"
+
+    def __init__(
+        self, vocs: VOCS, options: MultiFidelityOptions = MultiFidelityOptions()
+    ):
+        """
+        Generator for single objective multi-fidelity optimization. One variable
+        in vocs, specified by `options.acq.fidelity_parameter`, controls the
+        fidelity of each evaluation. Outputs are modeled jointly across fidelities
+        and candidates (including their fidelity) are chosen by maximizing the
+        multi-fidelity knowledge gradient about the optimum at the highest
+        fidelity per unit of evaluation cost. Use `get_recommendation` to get the
+        best point at the highest fidelity.
+
+        Parameters
+        ----------
+        vocs: dict
+            Standard vocs dictionary for xopt
+
+        options: MultiFidelityOptions
+            Specific options for this generator
+        """
+        if not isinstance(options, MultiFidelityOptions):
+            raise ValueError("options must be a MultiFidelityOptions object")
+
+        if vocs.n_objectives != 1:
+            raise ValueError("vocs must have one objective for optimization")
+
+        super().__init__(vocs, options)
+
+    @staticmethod
+    def default_options() -> MultiFidelityOptions:
+        return MultiFidelityOptions()
+
+    @property
+    def fidelity_index(self) -> int:
+        return self.vocs.variable_names.index(self.options.acq.fidelity_parameter)
+
+    @property
+    def target_fidelity(self) -> float:
+        return float(self.vocs.variables[self.options.acq.fidelity_parameter][1])
+
+    def train_model(self, data: pd.DataFrame = None, update_internal=True) -> Module:
+        """
+        Returns a ModelListGP containing independent multi-fidelity models for the
+        objectives and constraints
+
+        """
+        if data is None:
+            data = self.data
+
+        # drop nans
+        valid_data = data[
+            pd.unique(self.vocs.variable_names + self.vocs.output_names)
+        ].dropna()
+
+        # select local subset of data if requested
+        valid_data = self.get_training_subset(valid_data)
+
+        _model = create_multi_fidelity_model(
+            self.vocs.variable_data(valid_data, ""),
+            self.vocs.objective_data(valid_data, ""),
+            self.vocs.constraint_data(valid_data, ""),
+            bounds=self.vocs.bounds,
+            fidelity_index=self.fidelity_index,
+            tkwargs=self._tkwargs,
+            **self.options.model.dict(),
+        )
+
+        if update_internal:
+            self._model = _model
+        return _model
+
+    def get_recommendation(self) -> pd.DataFrame:
+        """
+        Returns the point at the highest fidelity that maximizes the posterior
+        mean of the (constrained) objective, based on all data collected so far
+        """
+        if self.data.empty:
+            raise ValueError("no data exists to make a recommendation from")
+
+        self.train_model(self.data)
+        candidate, _ = self._optimize_current_value(self._model)
+        return self._convert_candidates_to_inputs(candidate)
+
+    def _get_objective(self):
+        if self.vocs.n_constraints:
+            return create_constrained_mc_objective(self.vocs)
+        return create_mc_objective(self.vocs)
+
+    def _get_acquisition(self, model):
+        # value of the best point at the highest fidelity given current data
+        _, current_value = self._optimize_current_value(model)
+
+        # evaluation cost is an affine function of the fidelity parameter
+        lower, upper = self.vocs.variables[self.options.acq.fidelity_parameter]
+        low_cost, high_cost = self.options.acq.fidelity_costs
+        weight = (high_cost - low_cost) / (upper - lower)
+        cost_model = AffineFidelityCostModel(
+            fidelity_weights={self.fidelity_index: weight},
+            fixed_cost=low_cost - weight * lower,
+        )
+
+        return qMultiFidelityKnowledgeGradient(
+            model,
+            num_fantasies=self.options.acq.num_fantasies,
+            objective=self.objective,
+            current_value=current_value,
+            cost_aware_utility=InverseCostWeightedUtility(cost_model=cost_model),
+            project=self._project_to_target_fidelity,
+        )
+
+    def _optimize_current_value(self, model):
+        """
+        Returns a tuple of (candidate, value) that maximizes the expected
+        objective value with the fidelity fixed at the target fidelity
+        """
+        fidelity_index = self.fidelity_index
+        acq = FixedFeatureAcquisitionFunction(
+            qSimpleRegret(model, sampler=self.sampler, objective=self.objective),
+            d=self.vocs.n_variables,
+            columns=[fidelity_index],
+            values=[self.target_fidelity],
+        )
+
+        other_indices = [i for i in range(self.vocs.n_variables) if i != fidelity_index]
+        candidate, value = optimize_acqf(
+            acq_function=acq,
+            bounds=self._get_bounds()[:, other_indices],
+            q=1,
+            raw_samples=self.options.optim.raw_samples,
+            num_restarts=self.options.optim.num_restarts,
+        )
+        return acq._construct_X_full(candidate), value
+
+    def _project_to_target_fidelity(self, X):
+        return project_to_target_fidelity(
+            X, target_fidelities={self.fidelity_index: self.target_fidelity}
+        )
+
+    def _get_initial_conditions(self, bounds):
+        # nearby initial points do not include the fantasy points required by the
+        # knowledge gradient, let botorch generate initial conditions instead
+        return None, self.options.optim.raw_samples
+
+    def _check_options(self, options: BayesianOptions):
+        super()._check_options(options)
+        if options.acq.fidelity_parameter not in self.vocs.variable_names:
+            raise ValueError(
+                "`options.acq.fidelity_parameter` must be the name of a variable in "
+                "vocs"
+            )
+        if len(options.acq.fidelity_costs) != 2:
+            raise ValueError("`options.acq.fidelity_costs` must be of length 2")
+        if options.acq.cost_aware or options.acq.proximal_lengthscales is not None:
+            raise ValueError(
+                "cost aware acquisition and proximal biasing are not supported by "
+                "the multi-fidelity generator"
+            )
+        if options.optim.dense_samples is not None:
+            raise ValueError(
+                "dense acquisition function optimization is not supported by the "
+                "multi-fidelity generator"
+            )
+        if options.training.aggregate_duplicates:
+            raise ValueError(
+                "aggregating duplicate measurements is not supported by the "
+                "multi-fidelity generator"
+            )
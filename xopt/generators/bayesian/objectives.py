@@ -46,17 +46,36 @@ def create_constraint_callables(vocs, quantile_cutoff=0.5):
         return None
 
 
+def create_objective_weights(vocs, tkwargs: dict = None):
+    """
+    create weights over model outputs that define a linear objective, botorch
+    assumes maximization so we need to negate objective data (which is always in
+    minimization form) and zero out anything that is a constraint
+    """
+    tkwargs = tkwargs or {"dtype": torch.double, "device": "cpu"}
+    weights = torch.zeros(vocs.n_outputs, **tkwargs)
+    for idx, ele in enumerate(vocs.objective_names):
+        weights[idx] = -1.0
+
+    return weights
+
+
+def create_constraint_indices(vocs):
+    """
+    returns the indices of model outputs that correspond to constraints
+    """
+    return list(range(vocs.n_objectives, vocs.n_outputs))
+
+
 def create_mc_objective(vocs):
     """
     create the objective object
 
     """
-    weights = torch.zeros(vocs.n_outputs).double()
-    for idx, ele in enumerate(vocs.objective_names):
-        weights[idx] = -1.0
+    weights = create_objective_weights(vocs)
 
     def obj_callable(Z):
-        return torch.matmul(Z, weights.reshape(-1, 1)).squeeze(-1)
+        return torch.matmul(Z, weights.to(Z).reshape(-1, 1)).squeeze(-1)
 
     return GenericMCObjective(obj_callable)
 
@@ -66,12 +85,10 @@ def create_constrained_mc_objective(vocs, quantile_cutoff=0.0):
     create the objective object
 
     """
-    weights = torch.zeros(vocs.n_outputs).double()
-    for idx, ele in enumerate(vocs.objective_names):
-        weights[idx] = -1.0
+    weights = create_objective_weights(vocs)
 
     def obj_callable(Z):
-        return torch.matmul(Z, weights.reshape(-1, 1)).squeeze(-1)
+        return torch.matmul(Z, weights.to(Z).reshape(-1, 1)).squeeze(-1)
 
     constraint_callables = create_constraint_callables(vocs, quantile_cutoff)
 
@@ -82,13 +99,14 @@ def create_constrained_mc_objective(vocs, quantile_cutoff=0.0):
     return constrained_obj
 
 
-def create_mobo_objective(vocs):
+def create_mobo_objective(vocs, tkwargs: dict = None):
     """
     botorch assumes maximization so we need to negate any objectives that have
     minimize keyword and zero out anything that is a constraint
     """
+    tkwargs = tkwargs or {"dtype": torch.double, "device": "cpu"}
     n_objectives = len(vocs.objectives)
-    weights = torch.zeros(n_objectives).double()
+    weights = torch.zeros(n_objectives, **tkwargs)
 
     for idx, ele in enumerate(vocs.objectives):
         weights[idx] = -1.0
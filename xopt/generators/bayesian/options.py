@@ -11,6 +11,11 @@ class AcqOptions(XoptBaseModel):
 
     # monte carlo options
     monte_carlo_samples = Field(128, description="number of monte carlo samples to use")
+    use_analytic: bool = Field(
+        True,
+        description="use analytic acquisition functions instead of monte carlo "
+        "acquisition functions when generating a single candidate",
+    )
 
     proximal_lengthscales: List[float] = Field(
         None, description="lengthscales for proximal biasing"
@@ -18,6 +23,13 @@ class AcqOptions(XoptBaseModel):
     use_transformed_proximal_weights: bool = Field(
         True, description="use transformed proximal weights"
     )
+    cost_aware: bool = Field(
+        False,
+        description="maximize acquisition function value per unit of expected "
+        "evaluation cost, using a model of the logarithm of `xopt_runtime`, "
+        "requires a non-negative acquisition function (not supported by upper "
+        "confidence bound or exploration)",
+    )
 
 
 class OptimOptions(XoptBaseModel):
@@ -41,6 +53,28 @@ class OptimOptions(XoptBaseModel):
         None,
         description="limits for travel distance between points in normalized space",
     )
+    time_budget: float = Field(
+        None,
+        description="maximum time in seconds spent generating candidates (including "
+        "model training), acquisition function optimization is stopped when the "
+        "budget is spent and the best candidate found so far is returned",
+    )
+    dense_samples: int = Field(
+        None,
+        description="if specified, optimize the acquisition function by evaluating "
+        "it on a Sobol set of this many points instead of multi-start optimization, "
+        "recommended for problems with few variables",
+    )
+    dense_batch_size: int = Field(
+        1024,
+        description="maximum number of points evaluated in a single acquisition "
+        "function call when using `dense_samples`, limits memory usage",
+    )
+    dense_polish: int = Field(
+        0,
+        description="number of the best points from `dense_samples` that are "
+        "further optimized using gradients",
+    )
 
 
 class ModelOptions(XoptBaseModel):
@@ -60,14 +94,51 @@ class ModelOptions(XoptBaseModel):
     #    arbitrary_types_allowed = True
 
 
+class TrainingOptions(XoptBaseModel):
+    """Options for selecting the data used to train the GP model in BO"""
+
+    n_nearest_neighbors: int = Field(
+        None,
+        description="if specified, only train the model on this number of points "
+        "nearest to the last point in normalized space",
+    )
+    neighborhood_radius: float = Field(
+        None,
+        description="if specified, only train the model on points within this "
+        "distance of the last point in normalized space",
+    )
+    aggregate_duplicates: bool = Field(
+        False,
+        description="flag to replace repeated measurements (points with equal "
+        "variable values) by their mean when training the model",
+    )
+    duplicate_tolerance: float = Field(
+        0.0,
+        description="points within this distance of each other in every "
+        "normalized variable (chained through intermediate points) are treated as "
+        "repeated measurements, 0.0 requires exact equality",
+    )
+
+
 class BayesianOptions(GeneratorOptions):
     optim: OptimOptions = OptimOptions()
     acq: AcqOptions = AcqOptions()
     model: ModelOptions = ModelOptions()
+    training: TrainingOptions = TrainingOptions()
 
     n_initial: int = Field(
         3, description="number of random initial points to measure during first step"
     )
+    dtype: str = Field(
+        "float64",
+        description="floating point precision used for models and acquisition "
+        "functions, `float32` is faster but less accurate than `float64`",
+    )
+    n_threads: int = Field(
+        None,
+        description="number of threads used by torch, set for the whole process "
+        "when the generator is created, uses the torch default if not specified",
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+import time
+from typing import Dict, List
+
+import torch
+from botorch.acquisition import (
+    ConstrainedMCObjective,
+    GenericMCObjective,
+    qNoisyExpectedImprovement,
+)
+from botorch.utils.multi_objective.scalarization import get_chebyshev_scalarization
+from botorch.utils.sampling import sample_simplex
+from pydantic import Field
+
+from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
+from xopt.generators.bayesian.objectives import (
+    create_constraint_callables,
+    create_mobo_objective,
+)
+from xopt.generators.bayesian.options import AcqOptions, BayesianOptions
+from xopt.vocs import VOCS
+
+
+class ParEGOAcqOptions(AcqOptions):
+    ref_point: List[float] = Field(
+        None,
+        description="reference point for multi-objective optimization, objectives "
+        "are normalized between the reference point and the best observed values",
+    )
+    use_data_as_reference: bool = Field(
+        True,
+        description="flag to determine if the dataset determines the reference point",
+    )
+    chebyshev_alpha: float = Field(
+        0.05,
+        description="weight of the sum term in the augmented Chebyshev scalarization",
+    )
+
+
+class ParEGOOptions(BayesianOptions):
+    acq = ParEGOAcqOptions()
+
+
+class ParEGOGenerator(BayesianGenerator):
+    alias = "parego"
+
+    def __init__(self, vocs: VOCS, options: ParEGOOptions = ParEGOOptions()):
+        """
+        Multi-objective generator using randomized augmented Chebyshev
+        scalarizations of the objectives with a constrained noisy expected
+        improvement acquisition function (qParEGO). The cost of each step does not
+        depend on the number of objectives. Each candidate in a batch uses a
+        different set of scalarization weights sampled from the unit simplex, see
+        (https://arxiv.org/abs/2006.05078) for details.
+
+        Parameters
+        ----------
+        vocs: dict
+            Standard vocs dictionary for xopt
+
+        options: ParEGOOptions
+            Specific options for this generator
+        """
+        if not isinstance(options, ParEGOOptions):
+            raise ValueError("options must be a ParEGOOptions object")
+
+        super().__init__(vocs, options)
+        self._X_pending = None
+
+    @staticmethod
+    def default_options() -> ParEGOOptions:
+        return ParEGOOptions()
+
+    def generate(self, n_candidates: int) -> List[Dict]:
+        # if no data exists use random generator to generate candidates
+        if self.data.empty:
+            return self.vocs.random_inputs(self.options.n_initial)
+
+        deadline = self._get_deadline(time.time())
+
+        # update internal model with internal data
+        self.train_model(self.data)
+        bounds = self._get_bounds()
+
+        # sequentially optimize candidates, each with different scalarization
+        # weights, conditioned on the previous candidates
+        candidates = []
+        try:
+            for _ in range(n_candidates):
+                acq_funct = self.get_acquisition(self._model)
+                candidates += [self.optimize_acquisition(acq_funct, bounds, deadline)]
+                self._X_pending = torch.cat(candidates)
+        finally:
+            self._X_pending = None
+
+        candidates = torch.cat(candidates)
+        return self._convert_candidates_to_inputs(candidates)
+
+    def _get_objective(self):
+        return create_mobo_objective(self.vocs, self._tkwargs)
+
+    def _get_acquisition(self, model):
+        data = self.get_training_subset(self.data)
+        inputs = self.get_input_data(data)
+        objective_values = self.objective(self.get_outcome_data(data))
+
+        # get reference point from data
+        if self.options.acq.use_data_as_reference:
+            self.options.acq.ref_point = torch.min(
+                objective_values, dim=0
+            ).values.tolist()
+
+        weights = sample_simplex(self.vocs.n_objectives, **self._tkwargs).squeeze(0)
+        scalarization = self.get_scalarization(weights, objective_values)
+
+        def scalarized_objective(Z, X=None):
+            # points worse than the reference point do not improve the objective
+            return scalarization(self.objective(Z)).clamp_min(0.0)
+
+        constraint_callables = create_constraint_callables(self.vocs)
+        if constraint_callables:
+            objective = ConstrainedMCObjective(
+                objective=scalarized_objective,
+                constraints=constraint_callables,
+                infeasible_cost=0.0,
+            )
+        else:
+            objective = GenericMCObjective(scalarized_objective)
+
+        acq = qNoisyExpectedImprovement(
+            model,
+            X_baseline=inputs,
+            sampler=self.sampler,
+            objective=objective,
+            X_pending=self._X_pending,
+            prune_baseline=True,
+        )
+
+        return acq
+
+    def get_scalarization(self, weights, objective_values):
+        """
+        Returns an augmented Chebyshev scalarization (maximization) using
+        `weights`, objectives are normalized to [0,1] between the reference point
+        and the best observed objective values
+        """
+        ref_point = torch.tensor(self.options.acq.ref_point, **self._tkwargs)
+        best = objective_values.max(dim=0).values
+        best = torch.where(best > ref_point, best, ref_point + 1.0)
+
+        return get_chebyshev_scalarization(
+            weights,
+            torch.stack([ref_point, best]),
+            alpha=self.options.acq.chebyshev_alpha,
+        )
@@ -1,4 +1,5 @@
 import time
+import warnings
 from abc import ABC
 from typing import Dict, List
 
@@ -7,11 +8,15 @@ import pandas as pd
 import torch
 from botorch.acquisition import FixedFeatureAcquisitionFunction
 from gpytorch import Module
-from pydantic import Field
+from pydantic import Field, conint
 
 from xopt.generators.bayesian import BayesianGenerator
 from xopt.generators.bayesian.models.standard import create_standard_model
-from xopt.generators.bayesian.options import AcqOptions, BayesianOptions
+from xopt.generators.bayesian.options import (
+    AcqOptions,
+    BayesianOptions,
+    TrainingOptions,
+)
 from xopt.vocs import VOCS
 
 
@@ -22,29 +27,87 @@ class TDAcqOptions(AcqOptions):
     )
 
 
+class TDTrainingOptions(TrainingOptions):
+    time_window: float = Field(
+        None,
+        description="if specified, only train the model on points measured within "
+        "this time (in seconds) of the most recent point",
+    )
+    max_points: int = Field(
+        None,
+        description="if specified, only train the model on this number of the "
+        "most recent points",
+    )
+    refit_interval: conint(ge=1) = Field(
+        1,
+        description="number of model updates between training model "
+        "hyperparameters, in between the model is rebuilt from the current data "
+        "using the hyperparameters of the previous model without fitting them",
+    )
+
+
 class TDOptions(BayesianOptions):
     acq = TDAcqOptions()
+    training = TDTrainingOptions()
 
 
 class TimeDependentBayesianGenerator(BayesianGenerator, ABC):
     def __init__(self, vocs: VOCS, options: TDOptions = TDOptions()):
         super().__init__(vocs, options)
         self.target_prediction_time = None
+        self._n_model_updates = 0
+
+    @staticmethod
+    def default_options() -> TDOptions:
+        return TDOptions()
 
     def generate(self, n_candidates: int) -> List[Dict]:
+        """
+        Generate candidates at the target prediction time. Candidates are returned
+        as soon as they are computed, they should not be evaluated before
+        `release_time` (Xopt waits for the release time before submitting them
+        for evaluation).
+        """
         self.target_prediction_time = time.time() + self.options.acq.added_time
         output = super().generate(n_candidates)
 
         if time.time() > self.target_prediction_time:
-            raise RuntimeWarning(
+            warnings.warn(
                 "target prediction time is in the past! Increase "
-                "added time for accurate results"
+                "added time for accurate results",
+                RuntimeWarning,
             )
-        while time.time() < self.target_prediction_time:
-            time.sleep(0.001)
 
         return output
 
+    @property
+    def release_time(self):
+        return self.target_prediction_time
+
+    def _check_options(self, options: BayesianOptions):
+        super()._check_options(options)
+        if options.acq.cost_aware:
+            raise ValueError(
+                "cost aware acquisition is not supported by time dependent generators"
+            )
+        if options.dtype != "float64":
+            raise ValueError(
+                "time dependent generators require `float64` precision to resolve "
+                "absolute time stamps"
+            )
+        if options.training.aggregate_duplicates:
+            raise ValueError(
+                "aggregating duplicate measurements is not supported by time "
+                "dependent generators"
+            )
+
+    def _get_deadline(self, start_time: float):
+        # never optimize past the target prediction time
+        deadline = super()._get_deadline(start_time)
+        if deadline is None:
+            return None
+        return min(deadline, self.target_prediction_time)
+
     def train_model(self, data: pd.DataFrame = None, update_internal=True) -> Module:
         """
         Returns a ModelListGP containing independent models for the objectives and
@@ -59,19 +122,27 @@ class TimeDependentBayesianGenerator(BayesianGenerator, ABC):
             self.vocs.variable_names + self.vocs.output_names + ["time"]
         ].dropna()
 
+        # select recent and/or local subset of data if requested
+        valid_data = self.get_training_subset(valid_data)
+
         # create dataframes for processed data
         variable_data = self.vocs.variable_data(valid_data, "")
         # add time column to variable data
         variable_data = pd.concat([variable_data, valid_data["time"]], axis=1)
-        # add bounds for input transformation
+        # add bounds for input transformation, keep the width of the time domain
+        # fixed when using a time window such that hyperparameters can be reused
+        time_data = valid_data["time"].to_numpy()
+        time_window = self.options.training.time_window
+        min_time = (
+            time_data.min() if time_window is None else time_data.max() - time_window
+        )
         bounds = np.hstack(
             [
                 self.vocs.bounds,
                 np.array(
                     (
-                        valid_data["time"].to_numpy().min(),
-                        valid_data["time"].to_numpy().max()
-                        + 2 * self.options.acq.added_time,
+                        min_time,
+                        time_data.max() + 2 * self.options.acq.added_time,
                     )
                 ).reshape(2, 1),
             ]
@@ -80,19 +151,50 @@ class TimeDependentBayesianGenerator(BayesianGenerator, ABC):
         objective_data = self.vocs.objective_data(valid_data, "")
         constraint_data = self.vocs.constraint_data(valid_data, "")
 
+        # reuse hyperparameters of the previous model between refits, the model is
+        # still rebuilt from the current data (not conditioned incrementally) since
+        # points leaving the time window have to be removed
+        reuse_hyperparameters = (
+            self._model is not None
+            and self._n_model_updates % self.options.training.refit_interval != 0
+        )
+
         _model = create_standard_model(
             variable_data,
             objective_data,
             constraint_data,
             bounds=bounds,
             tkwargs=self._tkwargs,
+            fit=not reuse_hyperparameters,
             **self.options.model.dict(),
         )
 
+        if reuse_hyperparameters:
+            load_hyperparameters(_model, self._model)
+
         if update_internal:
             self._model = _model
+            self._n_model_updates += 1
         return _model
 
+    def get_training_subset(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the subset of data used to train the model. Points outside of
+        `options.training.time_window` are dropped and at most
+        `options.training.max_points` of the most recent points are kept, such that
+        the cost of training is bounded during long running optimization.
+        """
+        time_window = self.options.training.time_window
+        if time_window is not None:
+            data = data[data["time"] >= data["time"].max() - time_window]
+
+        max_points = self.options.training.max_points
+        if max_points is not None and len(data) > max_points:
+            recent = np.argsort(data["time"].to_numpy(), kind="stable")[-max_points:]
+            data = data.iloc[np.sort(recent)]
+
+        return super().get_training_subset(data)
+
     def get_acquisition(self, model):
         acq = super().get_acquisition(model)
 
@@ -104,3 +206,18 @@ class TimeDependentBayesianGenerator(BayesianGenerator, ABC):
         )
 
         return fixed_acq
+
+
+def load_hyperparameters(model: Module, previous_model: Module):
+    """
+    Load hyperparameters of each sub-model in `previous_model` into `model`,
+    input and outcome transforms, which depend on the training data, are not
+    copied
+    """
+    for new, previous in zip(model.models, previous_model.models):
+        state_dict = {
+            name: value
+            for name, value in previous.state_dict().items()
+            if not name.startswith(("input_transform", "outcome_transform"))
+        }
+        new.load_state_dict(state_dict, strict=False)
@@ -0,0 +1,423 @@
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import torch
+from botorch.optim.initializers import sample_truncated_normal_perturbations
+from gpytorch import Module
+from pydantic import Field
+
+from xopt.generators.bayesian.upper_confidence_bound import (
+    UCBOptions,
+    UpperConfidenceBoundGenerator,
+)
+from xopt.pydantic import XoptBaseModel
+from xopt.vocs import VOCS
+
+logger = logging.getLogger(__name__)
+
+
+class TrustRegionOptions(XoptBaseModel):
+    """Options for defining trust regions in TuRBO"""
+
+    n_trust_regions: int = Field(
+        1, description="number of independent trust regions to maintain"
+    )
+    length_init: float = Field(
+        0.8, description="initial side length of trust regions in normalized space"
+    )
+    length_min: float = Field(
+        0.5**7,
+        description="minimum side length, trust regions are restarted below this",
+    )
+    length_max: float = Field(
+        1.6, description="maximum side length of trust regions in normalized space"
+    )
+    success_tolerance: int = Field(
+        3, description="number of consecutive successes needed to expand a region"
+    )
+    failure_tolerance: int = Field(
+        None,
+        description="number of consecutive failures needed to shrink a region, "
+        "defaults to max(4, n_variables)",
+    )
+    improvement_tolerance: float = Field(
+        1e-3, description="relative improvement needed to count as a success"
+    )
+    min_local_points: int = Field(
+        10,
+        description="minimum number of points used to train local models, nearest "
+        "points to the center are used if a region contains fewer points",
+    )
+
+
+class TurboOptions(UCBOptions):
+    trust_region: TrustRegionOptions = TrustRegionOptions()
+
+
+class TrustRegion:
+    """
+    State of a single trust region, defined in the normalized input domain.
+
+    A trust region is a hyper-rectangle centered on the best point observed inside
+    of it. Side lengths are scaled by `weights` (derived from the local model
+    lengthscales) and by `length`, which is expanded after `success_tolerance`
+    consecutive improvements and shrunk after `failure_tolerance` consecutive
+    failures.
+    """
+
+    def __init__(
+        self, center: np.ndarray, options: TrustRegionOptions, failure_tolerance: int
+    ):
+        self.center = np.asarray(center, dtype=float)
+        self.options = options
+        self.failure_tolerance = failure_tolerance
+
+        self.length = options.length_init
+        self.weights = np.ones_like(self.center)
+        self.best = None  # (violation, objective) of the center point
+        self.n_successes = 0
+        self.n_failures = 0
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """Returns region bounds (mins, maxs) in the normalized domain"""
+        half_width = self.weights * self.length / 2.0
+        return np.vstack(
+            [
+                np.clip(self.center - half_width, 0.0, 1.0),
+                np.clip(self.center + half_width, 0.0, 1.0),
+            ]
+        )
+
+    @property
+    def is_collapsed(self) -> bool:
+        return self.length < self.options.length_min
+
+    @property
+    def is_initialized(self) -> bool:
+        """Returns True if the center of the region has been evaluated"""
+        return self.best is not None
+
+    def contains(self, x: np.ndarray) -> np.ndarray:
+        """Returns a boolean mask of normalized points inside the region"""
+        lower, upper = self.bounds
+        return np.all((x >= lower) & (x <= upper), axis=-1)
+
+    def set_weights(self, lengthscales: np.ndarray):
+        """
+        Scale region side lengths according to model lengthscales, keeping the
+        region volume fixed, see (https://arxiv.org/abs/1910.01739) for details
+        """
+        weights = lengthscales / lengthscales.mean()
+        self.weights = weights / np.prod(weights ** (1.0 / len(weights)))
+
+    def update(self, x: np.ndarray, violation: float, objective: float, initial=False):
+        """
+        Update region state with the normalized point `x` that was generated from
+        this region. Points of the initial design (`initial=True`) only move the
+        center to the best point found, without counting successes or failures.
+        """
+        if self.best is None or initial:
+            if self.best is None or self._is_improvement(violation, objective):
+                self.center = np.asarray(x, dtype=float)
+                self.best = (violation, objective)
+            return
+
+        if self._is_improvement(violation, objective):
+            self.center = np.asarray(x, dtype=float)
+            self.best = (violation, objective)
+            self.n_successes += 1
+            self.n_failures = 0
+        else:
+            self.n_successes = 0
+            self.n_failures += 1
+
+        if self.n_successes >= self.options.success_tolerance:
+            self.length = min(2.0 * self.length, self.options.length_max)
+            self.n_successes = 0
+        elif self.n_failures >= self.failure_tolerance:
+            self.length /= 2.0
+            self.n_failures = 0
+
+    def _is_improvement(self, violation: float, objective: float) -> bool:
+        best_violation, best_objective = self.best
+
+        # feasible points always improve on infeasible ones, otherwise compare
+        # total constraint violation
+        if best_violation > 0.0 or violation > 0.0:
+            return violation < best_violation
+
+        tolerance = self.options.improvement_tolerance * abs(best_objective)
+        return objective < best_objective - tolerance
+
+
+class TurboGenerator(UpperConfidenceBoundGenerator):
+    alias = "turbo"
+
+    def __init__(self, vocs: VOCS, options: TurboOptions = TurboOptions()):
+        """
+        Trust region Bayesian optimization (TuRBO) generator using a constrained
+        UpperConfidenceBound acquisition function. Local models are trained only on
+        data inside (or nearest to) the active trust region and acquisition
+        function optimization is restricted to the trust region bounds. Parallel
+        candidates are generated from each trust region in turn, jointly with the
+        points of the region that are still being evaluated. See
+        (https://arxiv.org/abs/1910.01739) and (https://arxiv.org/abs/2002.08526) for
+        details.
+
+        Parameters
+        ----------
+        vocs: dict
+            Standard vocs dictionary for xopt
+
+        options: TurboOptions
+            Specific options for this generator
+        """
+        if not isinstance(options, TurboOptions):
+            raise ValueError("options must be a TurboOptions object")
+
+        super().__init__(vocs, options)
+
+        self._trust_regions = []
+        self._active_region = None
+        self._active_pending = None
+        # list of (normalized candidate, trust region, part of initial design)
+        self._pending = []
+        self._n_generated = 0
+
+    @staticmethod
+    def default_options() -> TurboOptions:
+        return TurboOptions()
+
+    @property
+    def trust_regions(self) -> List[TrustRegion]:
+        return self._trust_regions
+
+    def add_data(self, new_data: pd.DataFrame):
+        super().add_data(new_data)
+
+        if not self._trust_regions:
+            return
+
+        x = self._normalize(new_data[self.vocs.variable_names].to_numpy())
+        violation, objective = self._get_scores(new_data)
+        for i in range(len(x)):
+            region, initial = self._pop_pending(x[i])
+            if region is not None:
+                region.update(x[i], violation[i], objective[i], initial)
+
+        # restart collapsed trust regions
+        for i, region in enumerate(self._trust_regions):
+            if region.is_collapsed:
+                logger.info(f"restarting collapsed trust region {i}")
+                self._trust_regions[i] = self._create_trust_region(
+                    np.random.rand(self.vocs.n_variables)
+                )
+
+    def generate(self, n_candidates: int) -> List[Dict]:
+        if self.data.empty:
+            return self.vocs.random_inputs(max(n_candidates, self.options.n_initial))
+
+        if not self._trust_regions:
+            self._initialize_trust_regions()
+
+        # cycle through trust regions, generating one candidate at a time
+        candidates = []
+        n_remaining = n_candidates
+        while n_remaining > 0:
+            region = self._trust_regions[self._n_generated % len(self._trust_regions)]
+            self._n_generated += 1
+
+            # evaluate the center of a newly (re)started trust region first, together
+            # with random points inside the region to fill the remaining workers
+            initial = not region.is_initialized
+            if initial:
+                new_candidates = self._get_initial_design(region, n_remaining)
+            else:
+                new_candidates = self._get_region_candidate(region)
+
+            x = self._normalize(new_candidates[self.vocs.variable_names].to_numpy())
+            self._pending += [(ele, region, initial) for ele in x]
+            candidates += [new_candidates]
+            n_remaining -= len(new_candidates)
+
+        return pd.concat(candidates, ignore_index=True)
+
+    def train_model(self, data: pd.DataFrame = None, update_internal=True) -> Module:
+        if data is None:
+            data = self.data
+
+        region = self._active_region
+        if region is not None:
+            data = self.get_local_data(data, region)
+
+        model = super().train_model(data, update_internal)
+
+        # scale trust region according to the objective model lengthscales
+        if region is not None:
+            lengthscale = model.models[0].covar_module.base_kernel.lengthscale
+            region.set_weights(lengthscale.detach().cpu().numpy().flatten())
+
+        return model
+
+    def get_local_data(self, data: pd.DataFrame, region: TrustRegion):
+        """
+        Returns the subset of data inside the trust region, if the region contains
+        less than `min_local_points` the nearest points to the region center are
+        returned instead
+        """
+        x = self._normalize(data[self.vocs.variable_names].to_numpy())
+        in_region = region.contains(x)
+
+        n_min = min(self.options.trust_region.min_local_points, len(data))
+        if in_region.sum() < n_min:
+            distance = np.linalg.norm(x - region.center, axis=-1)
+            in_region = np.zeros(len(data), dtype=bool)
+            in_region[np.argsort(distance)[:n_min]] = True
+
+        return data.iloc[np.flatnonzero(in_region)]
+
+    def _get_bounds(self):
+        if self._active_region is None:
+            return super()._get_bounds()
+
+        return torch.tensor(
+            self._unnormalize(self._active_region.bounds), **self._tkwargs
+        )
+
+    def _get_training_center(self) -> np.ndarray:
+        if self._active_region is None:
+            return super()._get_training_center()
+
+        return self._unnormalize(self._active_region.center)
+
+    def _get_initial_conditions(self, bounds):
+        if (
+            self._active_region is None
+            or not self.options.optim.use_nearby_initial_points
+        ):
+            return super()._get_initial_conditions(bounds)
+
+        # start acquisition function optimization near the trust region center
+        center = torch.tensor(
+            self._unnormalize(self._active_region.center), **self._tkwargs
+        )
+        batch_initial_points = sample_truncated_normal_perturbations(
+            center.unsqueeze(0),
+            n_discrete_points=self.options.optim.raw_samples,
+            sigma=0.5,
+            bounds=bounds,
+        ).unsqueeze(-2)
+        return batch_initial_points, None
+
+    @property
+    def use_analytic(self) -> bool:
+        # pending points are only supported by monte carlo acquisition functions
+        return super().use_analytic and self._active_pending is None
+
+    def _get_acquisition(self, model):
+        acq = super()._get_acquisition(model)
+        if self._active_pending is not None:
+            acq.set_X_pending(self._active_pending)
+        return acq
+
+    def _check_options(self, options: TurboOptions):
+        super()._check_options(options)
+        if (
+            options.optim.max_travel_distances is not None
+            or options.acq.proximal_lengthscales is not None
+        ):
+            raise ValueError(
+                "`options.optim.max_travel_distances` and proximal biasing cannot "
+                "be used with trust regions, use `options.trust_region` instead"
+            )
+
+    def _get_initial_design(self, region: TrustRegion, n: int) -> pd.DataFrame:
+        """
+        Returns the center of a new trust region followed by random points inside
+        the region, the center is skipped if it is already being evaluated
+        """
+        lower, upper = region.bounds
+        x = lower + np.random.rand(n, len(lower)) * (upper - lower)
+        if not any(pending is region for _, pending, _ in self._pending):
+            x[0] = region.center
+        return self.vocs.convert_numpy_to_inputs(self._unnormalize(x))
+
+    def _get_region_candidate(self, region: TrustRegion) -> pd.DataFrame:
+        """
+        Returns a single candidate maximizing the acquisition function of the
+        local model inside the trust region, jointly with the points of the
+        region that are still being evaluated
+        """
+        pending = [x for x, pending, _ in self._pending if pending is region]
+        self._active_region = region
+        if pending:
+            self._active_pending = torch.tensor(
+                self._unnormalize(np.vstack(pending)), **self._tkwargs
+            )
+        try:
+            return super().generate(1)
+        finally:
+            self._active_region = None
+            self._active_pending = None
+
+    def _initialize_trust_regions(self):
+        """
+        Center the first trust region on the best observed point and the rest at
+        random points in the domain
+        """
+        x = self._normalize(self.data[self.vocs.variable_names].to_numpy())
+        violation, objective = self._get_scores(self.data)
+        best = np.lexsort((objective, violation))[0]
+
+        region = self._create_trust_region(x[best])
+        region.update(x[best], violation[best], objective[best])
+        self._trust_regions = [region]
+
+        for _ in range(self.options.trust_region.n_trust_regions - 1):
+            self._trust_regions += [
+                self._create_trust_region(np.random.rand(self.vocs.n_variables))
+            ]
+
+    def _create_trust_region(self, center: np.ndarray) -> TrustRegion:
+        failure_tolerance = self.options.trust_region.failure_tolerance
+        if failure_tolerance is None:
+            failure_tolerance = max(4, self.vocs.n_variables)
+
+        return TrustRegion(center, self.options.trust_region, failure_tolerance)
+
+    def _pop_pending(self, x: np.ndarray):
+        """
+        Returns (and removes) the trust region that generated the point `x` and
+        whether `x` is part of the initial design of the region
+        """
+        for i, (candidate, region, initial) in enumerate(self._pending):
+            if np.allclose(candidate, x):
+                self._pending.pop(i)
+                if region not in self._trust_regions:
+                    return None, False
+                return region, initial
+        return None, False
+
+    def _get_scores(self, data: pd.DataFrame):
+        """
+        Returns arrays of the total constraint violation and objective value
+        (minimization) of each row in data
+        """
+        objective = self.vocs.objective_data(data, "").to_numpy()[:, 0]
+        if self.vocs.n_constraints:
+            constraints = self.vocs.constraint_data(data, "").to_numpy()
+            violation = np.clip(constraints, 0.0, None).sum(axis=-1)
+        else:
+            violation = np.zeros(len(data))
+        return violation, objective
+
+    def _normalize(self, x: np.ndarray) -> np.ndarray:
+        lower, upper = self.vocs.bounds
+        return (x - lower) / (upper - lower)
+
+    def _unnormalize(self, x: np.ndarray) -> np.ndarray:
+        lower, upper = self.vocs.bounds
+        return x * (upper - lower) + lower
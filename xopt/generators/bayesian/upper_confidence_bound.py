@@ -1,17 +1,23 @@
-from botorch.acquisition import qUpperConfidenceBound
 from pydantic import Field
 
 from xopt.generators.bayesian.bayesian_generator import BayesianGenerator
+from xopt.generators.bayesian.custom_botorch.analytic import (
+    AnalyticUpperConfidenceBound,
+)
 from xopt.generators.bayesian.custom_botorch.constrained_acqusition import (
     ConstrainedMCAcquisitionFunction,
 )
+from xopt.generators.bayesian.custom_botorch.monte_carlo import qUpperConfidenceBound
 from xopt.generators.bayesian.objectives import (
     create_constraint_callables,
+    create_constraint_indices,
     create_mc_objective,
+    create_objective_weights,
 )
 from xopt.generators.bayesian.options import AcqOptions, BayesianOptions
 from xopt.generators.bayesian.time_dependent import (
     TDAcqOptions,
+    TDTrainingOptions,
     TimeDependentBayesianGenerator,
 )
 from xopt.vocs import VOCS
@@ -31,6 +37,7 @@ class UCBOptions(BayesianOptions):
 
 class TDUCBOptions(UCBOptions):
     acq = TDUpperConfidenceBoundOptions()
+    training = TDTrainingOptions()
 
 
 class UpperConfidenceBoundGenerator(BayesianGenerator):
@@ -64,6 +71,14 @@ class UpperConfidenceBoundGenerator(BayesianGenerator):
         return create_mc_objective(self.vocs)
 
     def _get_acquisition(self, model):
+        if self.use_analytic:
+            return AnalyticUpperConfidenceBound(
+                model,
+                beta=self.options.acq.beta,
+                objective_weights=create_objective_weights(self.vocs, self._tkwargs),
+                constraint_indices=create_constraint_indices(self.vocs),
+            )
+
         qUCB = qUpperConfidenceBound(
             model,
             sampler=self.sampler,
@@ -77,6 +92,14 @@ class UpperConfidenceBoundGenerator(BayesianGenerator):
 
         return cqUCB
 
+    def _check_options(self, options: BayesianOptions):
+        super()._check_options(options)
+        if options.acq.cost_aware:
+            raise ValueError(
+                "cost aware acquisition requires a non-negative acquisition "
+                "function, which upper confidence bound is not"
+            )
+
 
 class TDUpperConfidenceBoundGenerator(
     TimeDependentBayesianGenerator, UpperConfidenceBoundGenerator
@@ -1,3 +1,7 @@
 from .cnsga import CNSGAGenerator, CNSGAOptions
+from .island import IslandCNSGAGenerator, IslandCNSGAOptions
 
-registry = {"CNSGA": (CNSGAGenerator, CNSGAOptions)}
+registry = {
+    "CNSGA": (CNSGAGenerator, CNSGAOptions),
+    "IslandCNSGA": (IslandCNSGAGenerator, IslandCNSGAOptions),
+}
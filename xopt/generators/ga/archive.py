@@ -0,0 +1,124 @@
+import json
+import os
+import zipfile
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+class PopulationArchive:
+    def __init__(self, filename: str):
+        """
+        Append-only archive of populations stored in a single file, keyed by
+        generation. Each column of a population is stored as a separate binary
+        `.npy` array (JSON for non-numeric columns) in an uncompressed zip file, so
+        floats round-trip exactly and any generation can be read without parsing
+        the rest of the file. Arrays in object columns are read back as lists.
+        The file can also be opened with `numpy.load`.
+
+        Parameters
+        ----------
+        filename: str
+            path to the archive file, created when the first population is added
+        """
+        self.filename = filename
+
+    @property
+    def generations(self) -> List[int]:
+        """sorted list of the generations in the archive"""
+        if not os.path.exists(self.filename):
+            return []
+        with zipfile.ZipFile(self.filename) as archive:
+            names = archive.namelist()
+        return sorted(
+            int(name.split("/")[0]) for name in names if name.endswith("/columns.json")
+        )
+
+    def __len__(self):
+        return len(self.generations)
+
+    def __contains__(self, generation: int):
+        return generation in self.generations
+
+    def append(self, population: pd.DataFrame, generation: int):
+        """
+        Add the population of `generation` to the archive, raises a ValueError if
+        the generation is already in the archive
+        """
+        generation = int(generation)
+        if generation in self:
+            raise ValueError(f"generation {generation} is already in the archive")
+
+        with zipfile.ZipFile(self.filename, mode="a") as archive:
+            encodings = [
+                _write_column(archive, f"{generation}/{i}", population[name])
+                for i, name in enumerate(population.columns)
+            ]
+            index_encoding = _write_column(
+                archive, f"{generation}/index", population.index.to_series()
+            )
+
+            # the metadata file is written last and marks a complete generation
+            metadata = {
+                "columns": list(population.columns),
+                "encodings": encodings,
+                "index_name": population.index.name,
+                "index_encoding": index_encoding,
+            }
+            archive.writestr(f"{generation}/columns.json", json.dumps(metadata))
+
+    def read(self, generation: int = None) -> pd.DataFrame:
+        """
+        Returns the population of `generation`, the latest generation if not
+        specified
+        """
+        generations = self.generations
+        if not generations:
+            raise ValueError(f"no populations in archive {self.filename}")
+        if generation is None:
+            generation = generations[-1]
+        elif generation not in generations:
+            raise ValueError(f"generation {generation} is not in the archive")
+
+        with zipfile.ZipFile(self.filename) as archive:
+            metadata = json.loads(archive.read(f"{generation}/columns.json"))
+            index = _read_column(
+                archive, f"{generation}/index", metadata["index_encoding"]
+            )
+            columns = {
+                name: _read_column(archive, f"{generation}/{i}", encoding)
+                for i, (name, encoding) in enumerate(
+                    zip(metadata["columns"], metadata["encodings"])
+                )
+            }
+
+        population = pd.DataFrame(columns, index=index)
+        population.index.name = metadata["index_name"]
+        return population
+
+
+def _write_column(archive: zipfile.ZipFile, name: str, values: pd.Series) -> str:
+    """write a column as a binary array if numeric, JSON otherwise"""
+    array = values.to_numpy()
+    if array.dtype.kind in "biuf":
+        with archive.open(name + ".npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+        return "npy"
+
+    archive.writestr(name + ".json", json.dumps(values.tolist(), default=_to_json))
+    return "json"
+
+
+def _to_json(value):
+    """arrays and numpy scalars in object columns are stored as lists and numbers"""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return str(value)
+
+
+def _read_column(archive: zipfile.ZipFile, name: str, encoding: str):
+    if encoding == "npy":
+        with archive.open(name + ".npy") as f:
+            return np.lib.format.read_array(f, allow_pickle=False)
+    return json.loads(archive.read(name + ".json"))
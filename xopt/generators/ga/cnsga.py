@@ -1,20 +1,28 @@
 import array
+import hashlib
 import logging
 import os
 import random
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
-from deap import algorithms as deap_algorithms, base as deap_base, tools as deap_tools
-from pydantic import confloat
+from deap import base as deap_base, tools as deap_tools
+from pydantic import confloat, conint
 
-import xopt.utils
 from xopt.generator import Generator, GeneratorOptions
 from xopt.generators.ga import deap_creator
+from xopt.generators.ga.archive import PopulationArchive
 from xopt.generators.ga.deap_fitness_with_constraints import FitnessWithConstraints
-
-# xopt.utils.isotime() # works
-# from xopt.utils import isotime # circular import
+from xopt.generators.ga.selection import (
+    default_reference_partitions,
+    select_nsga2,
+    select_nsga3,
+    uniform_reference_points,
+)
+from xopt.generators.ga.surrogate import prescreen, train_surrogate
+from xopt.generators.ga.variation import variation
+from xopt.pareto import ParetoFront
 
 
 logger = logging.getLogger(__name__)
@@ -27,6 +35,13 @@ class CNSGAOptions(GeneratorOptions):
     mutation_probability: confloat(ge=0, le=1) = 1.0
     population_file: str = None
     output_path: str = None
+    selection: str = "auto"
+    reference_partitions: int = None
+    seed: int = None
+    steady_state: bool = False
+    surrogate_oversample: conint(ge=1) = 1
+    surrogate_ranking: str = "nondominated"
+    reference_point: Dict[str, float] = None
 
 
 class CNSGAGenerator(Generator):
@@ -44,12 +59,37 @@ class CNSGAGenerator(Generator):
         self.children = []  # unevaluated inputs. This should be a list of dicts.
         self.population = None  # The latest population (fully evaluated)
         self.offspring = None  # Newly evaluated data, but not yet added to population
+        self.n_generated = 0  # Number of candidates generated (steady state only)
+        self.n_folded = 0  # Number of evaluations added to population (steady state)
+        self.generation = -1  # Generation of the latest population
+        self.rng = np.random.default_rng(options.seed)
+        self.surrogate = None  # Model used to prescreen children
+        self._surrogate_generation = None
+        self.pareto_front = ParetoFront(
+            vocs, options.reference_point, seed=options.seed
+        )  # Feasible pareto front of all evaluated data
 
         # DEAP toolbox (internal)
-        self.toolbox = cnsga_toolbox(vocs, selection="auto")
+        reference_partitions = options.reference_partitions
+        if reference_partitions is None:
+            reference_partitions = default_reference_partitions(
+                vocs.n_objectives, options.population_size
+            )
+        self.toolbox = cnsga_toolbox(
+            vocs,
+            selection=options.selection,
+            reference_partitions=reference_partitions,
+        )
+
+        # Continue the generation count of an existing archive
+        if options.output_path is not None and len(self.archive):
+            self.generation = self.archive.generations[-1]
 
         if options.population_file is not None:
-            self.load_population_csv(options.population_file)
+            if options.population_file.endswith(".csv"):
+                self.load_population_csv(options.population_file)
+            else:
+                self.load_population_archive(options.population_file)
             # n_here = len(self.population)
             # if n_here != self.n_pop:
             #    warnings.warn(f"Population in {options.population_file}"
@@ -91,19 +131,107 @@ class CNSGAGenerator(Generator):
 
         # No population, so create random children
         if self.population is None:
-            return [self.vocs.random_inputs() for _ in range(self.n_pop)]
+            return self.create_random_children(self.n_pop)
+
+        # Use population to create children, oversampled for prescreening
+        inputs = pd.concat(
+            [
+                cnsga_variation(
+                    self.population,
+                    self.vocs,
+                    self.toolbox,
+                    crossover_probability=self.options.crossover_probability,
+                    mutation_probability=self.options.mutation_probability,
+                    rng=self.rng,
+                )
+                for _ in range(self.options.surrogate_oversample)
+            ],
+            ignore_index=True,
+        )
+        return self.prescreen_children(inputs, self.n_pop).to_dict(orient="records")
 
-        # Use population to create children
+    def create_steady_state_children(self, n_children):
+        """
+        Create `n_children` children from the current population. Random children
+        are created until a full initial population has been generated, after
+        that children are bred from randomly chosen parents.
+        """
+        if n_children <= 0:
+            return []
+
+        if (
+            self.n_generated < self.n_pop
+            or self.population is None
+            or len(self.population) < 2
+        ):
+            return self.create_random_children(n_children)
+
+        # crossover acts on pairs of parents, oversampled for prescreening
+        n_bred = n_children * self.options.surrogate_oversample
+        n_parents = n_bred + n_bred % 2
+        parents = self.rng.choice(
+            len(self.population),
+            n_parents,
+            replace=n_parents > len(self.population),
+        )
         inputs = cnsga_variation(
-            self.population,
+            self.population.iloc[parents],
             self.vocs,
             self.toolbox,
             crossover_probability=self.options.crossover_probability,
             mutation_probability=self.options.mutation_probability,
+            rng=self.rng,
         )
+        inputs = self.prescreen_children(inputs.iloc[:n_bred], n_children)
         return inputs.to_dict(orient="records")
 
+    def create_random_children(self, n_children):
+        """
+        Create `n_children` children uniformly distributed within the variable
+        bounds, drawn from the generator's random number generator
+        """
+        low, up = self.vocs.bounds
+        x = low + self.rng.random((n_children, len(low))) * (up - low)
+        inputs = pd.DataFrame(x, columns=self.vocs.variable_names)
+        return self.vocs.convert_dataframe_to_inputs(inputs).to_dict(orient="records")
+
+    def prescreen_children(self, inputs: pd.DataFrame, n_children) -> pd.DataFrame:
+        """
+        Returns the `n_children` most promising children in `inputs` according to
+        a surrogate model of all data evaluated so far, see
+        `options.surrogate_ranking`. The model is retrained once per generation
+        (`population_size` evaluations).
+        """
+        if len(inputs) <= n_children or self.data.empty:
+            return inputs.iloc[:n_children]
+
+        generation = len(self.data) // self.n_pop
+        if self.surrogate is None or generation != self._surrogate_generation:
+            self.surrogate = train_surrogate(self.data, self.vocs)
+            self._surrogate_generation = generation
+
+        positions = prescreen(
+            inputs,
+            n_children,
+            self.surrogate,
+            self.vocs,
+            self.data,
+            ranking=self.options.surrogate_ranking,
+            reference_point=self.options.reference_point,
+        )
+        return inputs.iloc[positions]
+
     def add_data(self, new_data: pd.DataFrame):
+        self.pareto_front.add(new_data)
+
+        # Evaluated data is only kept for training the surrogate model
+        if self.options.surrogate_oversample > 1:
+            self.data = pd.concat([self.data, new_data])
+
+        if self.options.steady_state:
+            self.fold_data(new_data)
+            return
+
         self.offspring = pd.concat([self.offspring, new_data])
 
         # Next generation
@@ -114,11 +242,38 @@ class CNSGAGenerator(Generator):
             else:
                 candidates = pd.concat([self.population, self.offspring])
                 self.population = cnsga_select(
-                    candidates, self.n_pop, self.vocs, self.toolbox
+                    candidates, self.n_pop, self.vocs, self.toolbox, rng=self.rng
                 )
                 self.children = []  # reset children
                 self.offspring = None  # reset offspring
 
+            self.generation += 1
+            if self.options.output_path is not None:
+                self.write_population()
+
+    def fold_data(self, new_data: pd.DataFrame):
+        """
+        Add evaluated data to the population immediately (steady state mode). Once
+        the population is full, the best `n_pop` individuals of the population and
+        the new data survive.
+        """
+        if self.population is None:
+            candidates = new_data
+        else:
+            candidates = pd.concat([self.population, new_data])
+
+        if len(candidates) > self.n_pop:
+            candidates = cnsga_select(
+                candidates, self.n_pop, self.vocs, self.toolbox, rng=self.rng
+            )
+        self.population = candidates
+
+        # a generation is completed every `n_pop` evaluations
+        n_folded = self.n_folded + len(new_data)
+        n_generations = n_folded // self.n_pop - self.n_folded // self.n_pop
+        self.n_folded = n_folded
+        if n_generations > 0:
+            self.generation += n_generations
             if self.options.output_path is not None:
                 self.write_population()
 
@@ -127,6 +282,13 @@ class CNSGAGenerator(Generator):
         generate `n_candidates` candidates
 
         """
+        if self.options.steady_state:
+            # Loaded children are evaluated first, only breed the remainder
+            n_loaded = min(n_candidates, len(self.children))
+            candidates = [self.children.pop() for _ in range(n_loaded)]
+            candidates += self.create_steady_state_children(n_candidates - n_loaded)
+            self.n_generated += n_candidates
+            return candidates
 
         # Make sure we have enough children to fulfill the request
         while len(self.children) < n_candidates:
@@ -134,17 +296,53 @@ class CNSGAGenerator(Generator):
 
         return [self.children.pop() for _ in range(n_candidates)]
 
+    @property
+    def hypervolume_history(self) -> pd.DataFrame:
+        """
+        Hypervolume of the feasible pareto front of all evaluated data against the
+        number of evaluations, see `options.reference_point`
+        """
+        return self.pareto_front.hypervolume_history
+
+    @property
+    def archive(self):
+        """
+        Archive of the populations of each generation in `options.output_path`
+        """
+        if self.options.output_path is None:
+            return None
+        filename = os.path.join(
+            self.options.output_path, f"{self.alias}_population.npz"
+        )
+        return PopulationArchive(filename)
+
     def write_population(self, filename=None):
         """
-        Write the current population to a CSV file.
+        Write the current population to a CSV file if `filename` is given,
+        otherwise add it to the population archive in `options.output_path`.
         """
 
         if filename is None:
-            filename = f"{self.alias}_population_{xopt.utils.isotime(include_microseconds=True)}.csv"
-            filename = os.path.join(self.options.output_path, filename)
+            self.archive.append(self.population, self.generation)
+            return
 
         self.population.to_csv(filename, index_label="xopt_index")
 
+    def load_population_archive(self, filename, generation=None):
+        """
+        Resume from a population in an archive written with `output_path`, the
+        latest generation if `generation` is not given. The population is already
+        evaluated, children are bred from it directly.
+        """
+        archive = PopulationArchive(filename)
+        self.population = archive.read(generation)
+        self.generation = archive.generations[-1] if generation is None else generation
+        self.n_generated = max(self.n_generated, self.n_pop)
+        logger.info(
+            f"Loaded population of len {len(self.population)} from generation "
+            f"{self.generation} of archive: {filename}"
+        )
+
     def load_population_csv(self, filename):
         """
         Read a population from a CSV file.
@@ -157,6 +355,13 @@ class CNSGAGenerator(Generator):
         )
         logger.info(f"Loaded population of len {len(pop)} from file: {filename}")
 
+    def _check_options(self, options: CNSGAOptions):
+        if options.surrogate_ranking not in ["nondominated", "hypervolume"]:
+            raise ValueError(
+                f"Invalid surrogate ranking: {options.surrogate_ranking}, must be "
+                "`nondominated` or `hypervolume`"
+            )
+
     @property
     def n_pop(self):
         """
@@ -164,6 +369,13 @@ class CNSGAGenerator(Generator):
         """
         return self.options.population_size
 
+    def __getstate__(self):
+        # cached predictions of the surrogate model cannot be pickled, they are
+        # recomputed the next time the model is evaluated
+        if self.surrogate is not None:
+            self.surrogate.train()
+        return self.__dict__
+
 
 def uniform(low, up, size=None):
     """ """
@@ -173,7 +385,7 @@ def uniform(low, up, size=None):
         return [random.uniform(a, b) for a, b in zip([low] * size, [up] * size)]
 
 
-def cnsga_toolbox(vocs, selection="auto"):
+def cnsga_toolbox(vocs, selection="auto", reference_partitions=4):
     """
     Creates a DEAP toolbox from VOCS dict for use with cnsga.
 
@@ -184,6 +396,9 @@ def cnsga_toolbox(vocs, selection="auto"):
     spea2: SPEA-II [Zitzler2001] selection
     auto: will choose nsga2 for <= 2 objectives, otherwise nsga3
 
+    NSGA3 uses uniform reference points with `reference_partitions` divisions
+    along each objective axis.
+
 
     See DEAP code for details.
 
@@ -194,46 +409,13 @@ def cnsga_toolbox(vocs, selection="auto"):
     n_obj = len(obj)
     n_con = len(con)
 
-    var_labels = vocs.variable_names
-    obj_labels = vocs.objective_names
-
     bound_low, bound_up = vocs.bounds
     # DEAP does not like arrays, needs tuples.
     bound_low = tuple(bound_low)
     bound_up = tuple(bound_up)
 
-    # creator should assign already weighted values (for minimization)
-    weights = tuple([-1] * n_obj)
-
-    # Create MyFitness
-    if "MyFitness" in dir(deap_creator):
-        del deap_creator.MyFitness
-
-    if n_con == 0:
-        # Normal Fitness class
-        deap_creator.create(
-            "MyFitness", deap_base.Fitness, weights=weights, labels=obj_labels
-        )
-    else:
-        # Fitness with Constraints
-        deap_creator.create(
-            "MyFitness",
-            FitnessWithConstraints,
-            weights=weights,
-            n_constraints=n_con,
-            labels=obj_labels,
-        )
-
-    # Create Individual. Check if exists first.
-    if "Individual" in dir(deap_creator):
-        del deap_creator.Individual
-    deap_creator.create(
-        "Individual",
-        array.array,
-        typecode="d",
-        fitness=deap_creator.MyFitness,
-        labels=var_labels,
-    )
+    # Individual and fitness classes are shared by toolboxes of the same vocs
+    cnsga_individual(vocs)
 
     # Make toolbox
     toolbox = deap_base.Toolbox()
@@ -264,22 +446,28 @@ def cnsga_toolbox(vocs, selection="auto"):
     # Register NSGA selection algorithm.
     # NSGA-III should be better for 3 or more objectives
     if selection == "auto":
-        selection = "nsga2"
-        # TODO: fix this
-        # if len(obj#) <= 2:
-        #     select#ion = 'nsga2'
-        # else# :
-        #     selection='nsga3'
+        if n_obj <= 2:
+            selection = "nsga2"
+        else:
+            selection = "nsga3"
 
     if selection == "nsga2":
         toolbox.register("select", deap_tools.selNSGA2)
 
+    elif selection == "nsga3":
+        # selection uses the vectorized implementation, see cnsga_select
+        toolbox.reference_points = uniform_reference_points(n_obj, reference_partitions)
+
     elif selection == "spea2":
         toolbox.register("select", deap_tools.selSPEA2)
 
     else:
         raise ValueError(f"Invalid selection algorithm: {selection}")
 
+    # Name of the selection algorithm, used by cnsga_select to dispatch to the
+    # vectorized implementation where available
+    toolbox.selection = selection
+
     logger.info(
         f"Created toolbox with {n_var} variables, {n_con} constraints, and {n_obj} objectives."
     )
@@ -288,16 +476,64 @@ def cnsga_toolbox(vocs, selection="auto"):
     return toolbox
 
 
+def cnsga_individual(vocs):
+    """
+    Returns the DEAP Individual class for vocs, with a fitness attribute that
+    holds the objectives (minimized) and constraints.
+
+    The Individual and MyFitness classes are created in deap_creator once for
+    each combination of variables, objectives and number of constraints, with
+    names suffixed by a hash of that signature, such that generators with
+    different vocs (or several generators in one process) do not replace each
+    other's classes.
+    """
+    signature = repr((vocs.variable_names, vocs.objective_names, vocs.n_constraints))
+    suffix = hashlib.sha1(signature.encode()).hexdigest()[:12]
+    name = f"Individual_{suffix}"
+    if hasattr(deap_creator, name):
+        return getattr(deap_creator, name)
+
+    # creator should assign already weighted values (for minimization)
+    weights = tuple([-1] * vocs.n_objectives)
+    fitness_name = f"MyFitness_{suffix}"
+    if vocs.n_constraints == 0:
+        # Normal Fitness class
+        deap_creator.create(
+            fitness_name,
+            deap_base.Fitness,
+            weights=weights,
+            labels=vocs.objective_names,
+        )
+    else:
+        # Fitness with Constraints
+        deap_creator.create(
+            fitness_name,
+            FitnessWithConstraints,
+            weights=weights,
+            n_constraints=vocs.n_constraints,
+            labels=vocs.objective_names,
+        )
+
+    deap_creator.create(
+        name,
+        array.array,
+        typecode="d",
+        fitness=getattr(deap_creator, fitness_name),
+        labels=vocs.variable_names,
+    )
+    return getattr(deap_creator, name)
+
+
 def pop_from_data(data, vocs):
     """
-    Return a list of DEAP deap_creator.Individual from a dataframe
+    Return a list of DEAP Individuals (see cnsga_individual) from a dataframe
     """
     ix = data.index.to_numpy()
     v = vocs.variable_data(data).to_numpy()
     o = vocs.objective_data(data).to_numpy()
     c = vocs.constraint_data(data).to_numpy()
 
-    pop = list(map(deap_creator.Individual, v))
+    pop = list(map(cnsga_individual(vocs), v))
     for i, ind in enumerate(pop):
         ind.fitness.values = tuple(o[i, :])
         ind.fitness.cvalues = tuple(c[i, :])
@@ -306,37 +542,68 @@ def pop_from_data(data, vocs):
     return pop
 
 
-def cnsga_select(data, n, vocs, toolbox):
+def cnsga_select(data, n, vocs, toolbox, rng=None):
     """
-    Applies DEAP's select algorithm to the population in data.
+    Applies the toolbox selection algorithm to the population in data.
 
-    Note that this can be slow for large populations:
+    NSGA2 and NSGA3 selection use vectorized implementations, NSGA2 gives the
+    same result as DEAP's selNSGA2. SPEA2 uses DEAP's implementation, which can
+    be slow for large populations.
         NSGA2: Order(M N^2) for M objectives, N individuals
+
+    `rng` (a np.random.Generator) is used to break ties in NSGA3 niching.
     """
+    selection = getattr(toolbox, "selection", None)
+    if selection in ["nsga2", "nsga3"]:
+        objectives = vocs.objective_data(data).to_numpy()
+        if vocs.n_constraints:
+            constraints = vocs.constraint_data(data).to_numpy()
+        else:
+            constraints = np.zeros((len(data), 0))
+
+        if selection == "nsga2":
+            selected = select_nsga2(objectives, constraints, n)
+        else:
+            selected = select_nsga3(
+                objectives, constraints, n, toolbox.reference_points, rng=rng
+            )
+        return data.iloc[selected]
+
     pop = pop_from_data(data, vocs)
     selected = toolbox.select(pop, n)  # Order(n^2)
     return data.loc[[ind.index for ind in selected]]
 
 
 def cnsga_variation(
-    data, vocs, toolbox, crossover_probability=0.9, mutation_probability=1.0
+    data,
+    vocs,
+    toolbox,
+    crossover_probability=0.9,
+    mutation_probability=1.0,
+    rng=None,
 ):
     """
     Varies the population (from variables in data) by applying crossover and mutation
-    using DEAP's varAnd algorithm.
+    with the same semantics as DEAP's varAnd algorithm, using vectorized versions
+    of the toolbox's bounded SBX crossover and polynomial mutation operators.
 
     Returns an input dataframe with the new individuals to evaluate.
 
     See: https://deap.readthedocs.io/en/master/api/algo.html#deap.algorithms.varAnd
     """
-    v = vocs.variable_data(data).to_numpy()
-    pop = list(map(deap_creator.Individual, v))
-
-    children = deap_algorithms.varAnd(
-        pop, toolbox, crossover_probability, mutation_probability
+    mate, mutate = toolbox.mate.keywords, toolbox.mutate.keywords
+    children = variation(
+        vocs.variable_data(data).to_numpy(),
+        low=mate["low"],
+        up=mate["up"],
+        crossover_probability=crossover_probability,
+        mutation_probability=mutation_probability,
+        crossover_eta=mate["eta"],
+        mutation_eta=mutate["eta"],
+        indpb=mutate["indpb"],
+        rng=rng,
     )
-    vecs = [[float(x) for x in child] for child in children]
 
     return vocs.convert_dataframe_to_inputs(
-        pd.DataFrame(vecs, columns=vocs.variable_names)
+        pd.DataFrame(children, columns=vocs.variable_names)
     )
@@ -0,0 +1,318 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from pydantic import conint
+
+from xopt.generator import Generator
+from xopt.generators.ga.archive import PopulationArchive
+from xopt.generators.ga.cnsga import CNSGAGenerator, CNSGAOptions, cnsga_select
+from xopt.pareto import ParetoFront
+
+logger = logging.getLogger(__name__)
+
+
+class IslandCNSGAOptions(CNSGAOptions):
+
+    n_islands: conint(ge=1) = 4
+    migration_interval: conint(ge=1) = 5
+    n_migrants: conint(ge=0) = 2
+    max_workers: conint(ge=1) = 1
+
+
+class IslandCNSGAGenerator(Generator):
+
+    alias = "island_cnsga"
+
+    @staticmethod
+    def default_options() -> IslandCNSGAOptions:
+        return IslandCNSGAOptions()
+
+    def __init__(self, vocs, options: IslandCNSGAOptions = IslandCNSGAOptions()):
+        """
+        Island model CNSGA. `n_islands` independent CNSGA populations of
+        `population_size` individuals evolve in parallel, each with its own
+        toolbox and random number generator. Candidates are requested from the
+        islands in turn and labeled with the island they belong to in the
+        `xopt_island` column, which is used to return evaluated data to its
+        island. Every `migration_interval` generations (`population_size`
+        evaluations) of an island, its `n_migrants` best individuals migrate to
+        the next island in a ring, where they compete for survival with the
+        resident population.
+
+        Evaluations of all islands are distributed by the evaluator, use a
+        process pool or MPI executor to spread them over processes or nodes.
+        If `max_workers` is larger than 1, the islands also breed their children
+        and select their populations in parallel, in a pool of worker processes.
+        Each island is sent to a worker and returned with its updated state, the
+        cost of transferring the island is only worthwhile if breeding is
+        expensive, e.g. with surrogate prescreening.
+        """
+        if not isinstance(options, IslandCNSGAOptions):
+            raise ValueError("options must be an IslandCNSGAOptions object")
+        super().__init__(vocs, options)
+
+        island_options = CNSGAOptions(
+            **{
+                name: value
+                for name, value in options.dict().items()
+                if name in CNSGAOptions.__fields__
+            }
+        )
+        # populations are loaded and written by the island generator
+        island_options.population_file = None
+        island_options.output_path = None
+
+        self.islands = []
+        for i in range(options.n_islands):
+            seed = None if options.seed is None else options.seed + i
+            self.islands.append(
+                CNSGAGenerator(vocs, island_options.copy(update={"seed": seed}))
+            )
+
+        self.n_evaluated = np.zeros(options.n_islands, dtype=int)
+        self.generation = -1  # Number of population archive entries written - 1
+        self.pareto_front = ParetoFront(
+            vocs, options.reference_point, seed=options.seed
+        )  # Feasible pareto front of the data of all islands
+        self._next_island = 0
+        self._executor = None
+        if options.max_workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=options.max_workers)
+
+        # Continue the generation count of an existing archive
+        if options.output_path is not None and len(self.archive):
+            self.generation = self.archive.generations[-1]
+
+        if options.population_file is not None:
+            if options.population_file.endswith(".csv"):
+                self.load_population_csv(options.population_file)
+            else:
+                self.load_population_archive(options.population_file)
+
+        if options.output_path is not None:
+            assert os.path.isdir(options.output_path), "Output directory does not exist"
+
+    def _check_options(self, options: IslandCNSGAOptions):
+        if options.n_migrants > options.population_size:
+            raise ValueError("`n_migrants` cannot be larger than `population_size`")
+
+    def generate(self, n_candidates) -> List[Dict]:
+        """
+        generate `n_candidates` candidates, taking one candidate from each island
+        in turn
+        """
+        counts = np.zeros(self.options.n_islands, dtype=int)
+        for i in range(n_candidates):
+            counts[(self._next_island + i) % self.options.n_islands] += 1
+        order = (self._next_island + np.arange(self.options.n_islands)) % len(counts)
+        self._next_island = (self._next_island + n_candidates) % len(counts)
+
+        order = [i for i in order if counts[i]]
+        results = self._map_islands(generate_island, order, [counts[i] for i in order])
+
+        candidates = []
+        for i, island_candidates in zip(order, results):
+            candidates += [
+                {**candidate, "xopt_island": int(i)} for candidate in island_candidates
+            ]
+        return candidates
+
+    def add_data(self, new_data: pd.DataFrame):
+        self.pareto_front.add(new_data)
+
+        # data that was not generated by an island is shared out in turn
+        island = pd.Series(np.nan, index=new_data.index)
+        if "xopt_island" in new_data:
+            island = new_data["xopt_island"].astype(float)
+        unassigned = island.isna().to_numpy()
+        island[unassigned] = (
+            self._next_island + np.arange(unassigned.sum())
+        ) % self.options.n_islands
+        new_data = new_data.assign(xopt_island=island.astype(int).to_numpy())
+
+        grouped = list(new_data.groupby("xopt_island"))
+        generations = [self.islands[i].generation for i, _ in grouped]
+        self._map_islands(
+            add_island_data,
+            [i for i, _ in grouped],
+            [island_data for _, island_data in grouped],
+        )
+
+        interval = self.options.migration_interval * self.options.population_size
+        new_generation = False
+        for (i, island_data), generation in zip(grouped, generations):
+            new_generation |= self.islands[i].generation != generation
+
+            n_evaluated = self.n_evaluated[i] + len(island_data)
+            if n_evaluated // interval > self.n_evaluated[i] // interval:
+                self.migrate(i)
+            self.n_evaluated[i] = n_evaluated
+
+        if new_generation:
+            self.generation += 1
+            if self.options.output_path is not None:
+                self.write_population()
+
+    def _map_islands(self, function, islands, args):
+        """
+        Apply `function(island, arg)`, which returns the updated island and a
+        result, to each island in `islands` (positions in `self.islands`) with the
+        corresponding argument in `args`. Islands are processed in the worker
+        pool if `max_workers` is larger than 1 and are replaced by the returned
+        islands. Returns the list of results.
+        """
+        if self._executor is None:
+            outputs = map(function, [self.islands[i] for i in islands], args)
+        else:
+            outputs = self._executor.map(
+                function, [self.islands[i] for i in islands], args
+            )
+
+        results = []
+        for i, (island, result) in zip(islands, outputs):
+            self.islands[i] = island
+            results.append(result)
+        return results
+
+    def __getstate__(self):
+        # the worker pool cannot be pickled, a new one is created on unpickling
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.options.max_workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.options.max_workers)
+
+    def migrate(self, source: int):
+        """
+        Send the `n_migrants` best individuals of island `source` to the next
+        island, where the best `population_size` of the resident population and
+        the migrants survive
+        """
+        target = (source + 1) % self.options.n_islands
+        emigrants = self.islands[source].population
+        residents = self.islands[target].population
+        if emigrants is None or residents is None or self.options.n_migrants == 0:
+            return
+
+        # selected populations are ordered by rank
+        migrants = emigrants.iloc[: self.options.n_migrants]
+        migrants = migrants.assign(xopt_island=target)
+        self.islands[target].population = cnsga_select(
+            pd.concat([residents, migrants]),
+            len(residents),
+            self.vocs,
+            self.islands[target].toolbox,
+            rng=self.islands[target].rng,
+        )
+        logger.debug(f"Migrated {len(migrants)} individuals from {source} to {target}")
+
+    @property
+    def population(self):
+        """
+        Combined population of all islands, the island of each individual is given
+        in the `xopt_island` column
+        """
+        populations = [
+            island.population.assign(xopt_island=i)
+            for i, island in enumerate(self.islands)
+            if island.population is not None
+        ]
+        if not populations:
+            return None
+        return pd.concat(populations)
+
+    @property
+    def hypervolume_history(self) -> pd.DataFrame:
+        """
+        Hypervolume of the feasible pareto front of the data of all islands
+        against the number of evaluations, see `options.reference_point`
+        """
+        return self.pareto_front.hypervolume_history
+
+    @property
+    def archive(self):
+        """
+        Archive of the combined populations in `options.output_path`, a new entry
+        is added whenever an island completes a generation
+        """
+        if self.options.output_path is None:
+            return None
+        filename = os.path.join(
+            self.options.output_path, f"{self.alias}_population.npz"
+        )
+        return PopulationArchive(filename)
+
+    def write_population(self, filename=None):
+        """
+        Write the combined population of all islands to a CSV file if `filename`
+        is given, otherwise add it to the population archive in
+        `options.output_path`.
+        """
+        if filename is None:
+            self.archive.append(self.population, self.generation)
+            return
+
+        self.population.to_csv(filename, index_label="xopt_index")
+
+    def load_population_archive(self, filename, generation=None):
+        """
+        Resume from the combined population in an archive written with
+        `output_path`, the latest entry if `generation` is not given. Each island
+        gets back its own population.
+        """
+        archive = PopulationArchive(filename)
+        pop = archive.read(generation)
+        self.generation = archive.generations[-1] if generation is None else generation
+
+        islands = pop["xopt_island"].to_numpy() % self.options.n_islands
+        for i, island in enumerate(self.islands):
+            if np.any(islands == i):
+                island.population = pop[islands == i]
+                island.n_generated = max(island.n_generated, island.n_pop)
+        logger.info(f"Loaded population of len {len(pop)} from archive: {filename}")
+
+    def load_population_csv(self, filename):
+        """
+        Read a population from a CSV file and share it out between the islands
+        as children for re-evaluation. Individuals are returned to their island
+        if the file contains an `xopt_island` column.
+        """
+        pop = pd.read_csv(filename, index_col="xopt_index")
+        islands = np.arange(len(pop)) % self.options.n_islands
+        if "xopt_island" in pop:
+            islands = pop["xopt_island"].to_numpy() % self.options.n_islands
+
+        children = self.vocs.convert_dataframe_to_inputs(pop)
+        for i, island in enumerate(self.islands):
+            island.children = children[islands == i].to_dict(orient="records")
+        logger.info(f"Loaded population of len {len(pop)} from file: {filename}")
+
+    @property
+    def n_pop(self):
+        """
+        Convenience alias for `options.population_size`, the size of each island
+        """
+        return self.options.population_size
+
+
+def generate_island(island: CNSGAGenerator, n_candidates: int):
+    """
+    Generate `n_candidates` candidates from an island, returns the island and the
+    candidates
+    """
+    return island, island.generate(n_candidates)
+
+
+def add_island_data(island: CNSGAGenerator, new_data: pd.DataFrame):
+    """
+    Add evaluated data to an island, returns the island
+    """
+    island.add_data(new_data)
+    return island, None
@@ -0,0 +1,405 @@
+from itertools import combinations
+from math import comb
+from typing import List
+
+import numpy as np
+
+
+def constrained_domination_matrix(
+    objectives: np.ndarray, constraints: np.ndarray
+) -> np.ndarray:
+    """
+    Returns a boolean matrix `D` where `D[i, j]` is True if individual `i`
+    dominates individual `j`, using the same rules as `FitnessWithConstraints`:
+
+    - objectives are minimized, constraints are satisfied when <= 0
+    - feasible individuals dominate infeasible individuals
+    - feasible individuals are compared by pareto dominance
+    - infeasible individuals are compared lexicographically by the first
+        constraint that is violated by either individual and has different values
+
+    Parameters
+    ----------
+    objectives: np.ndarray
+        (n, n_objectives) array of objective values
+    constraints: np.ndarray
+        (n, n_constraints) array of constraint values
+
+    Returns
+    -------
+    np.ndarray
+        (n, n) boolean domination matrix
+    """
+    n = len(objectives)
+
+    # pareto dominance
+    all_leq = np.ones((n, n), dtype=bool)
+    any_less = np.zeros((n, n), dtype=bool)
+    for values in objectives.T:
+        all_leq &= values[:, None] <= values[None, :]
+        any_less |= values[:, None] < values[None, :]
+    dominates = all_leq & any_less
+
+    if constraints.shape[-1] == 0:
+        return dominates
+
+    # lexicographic comparison of constraint violations
+    infeasible_dominates = np.zeros((n, n), dtype=bool)
+    decided = np.zeros((n, n), dtype=bool)
+    for values in constraints.T:
+        satisfied = values <= 0
+        compared = ~decided & ~(satisfied[:, None] & satisfied[None, :])
+        less = values[:, None] < values[None, :]
+        greater = values[:, None] > values[None, :]
+        infeasible_dominates |= compared & less
+        decided |= compared & (less | greater)
+
+    feasible = ~np.any(constraints > 0, axis=-1)
+    both_feasible = feasible[:, None] & feasible[None, :]
+    both_infeasible = ~feasible[:, None] & ~feasible[None, :]
+
+    return (
+        (both_feasible & dominates)
+        | (feasible[:, None] & ~feasible[None, :])
+        | (both_infeasible & infeasible_dominates)
+    )
+
+
+def nondominated_sort(
+    objectives: np.ndarray, constraints: np.ndarray, k: int = None
+) -> List[np.ndarray]:
+    """
+    Sort individuals into non-dominated fronts until at least `k` individuals
+    are sorted (all individuals if `k` is None). Individuals with identical
+    objective values are grouped and compared using the constraints of the first
+    individual in the group. Fronts and the order of individuals in each front
+    are identical to `deap.tools.sortNondominated`.
+
+    Parameters
+    ----------
+    objectives: np.ndarray
+        (n, n_objectives) array of objective values (minimized)
+    constraints: np.ndarray
+        (n, n_constraints) array of constraint values (satisfied when <= 0)
+    k: int, optional
+        number of individuals to sort
+
+    Returns
+    -------
+    List[np.ndarray]
+        list of arrays containing the positions of the individuals in each front
+    """
+    n = len(objectives)
+    k = n if k is None else min(k, n)
+    if k == 0:
+        return []
+
+    # group individuals with identical objective values, in order of appearance
+    _, first, groups = np.unique(
+        objectives, axis=0, return_index=True, return_inverse=True
+    )
+    groups = groups.flatten()
+    group_order = np.argsort(first)
+    rank = np.empty_like(group_order)
+    rank[group_order] = np.arange(len(group_order))
+    groups = rank[groups]
+    representatives = first[group_order]
+    members = [[] for _ in representatives]
+    for position, group in enumerate(groups):
+        members[group].append(position)
+
+    dominates = constrained_domination_matrix(
+        objectives[representatives], constraints[representatives]
+    )
+    n_dominating = dominates.sum(axis=0)
+
+    current = np.flatnonzero(n_dominating == 0)
+    fronts = [current]
+    n_sorted = sum(len(members[group]) for group in current)
+    while n_sorted < k:
+        # remove the current front, the next front is ordered by the position of
+        # the last dominating individual in the current front
+        dominated = dominates[current]
+        n_dominating = n_dominating - dominated.sum(axis=0)
+        released = np.flatnonzero(dominated.any(axis=0) & (n_dominating == 0))
+        last_dominating = np.where(
+            dominated[:, released], np.arange(len(current))[:, None], -1
+        ).max(axis=0)
+        current = released[np.lexsort((released, last_dominating))]
+        fronts.append(current)
+        n_sorted += sum(len(members[group]) for group in current)
+
+    return [
+        np.array([ele for group in front for ele in members[group]], dtype=int)
+        for front in fronts
+    ]
+
+
+def crowding_distance(objectives: np.ndarray) -> np.ndarray:
+    """
+    Returns the crowding distance of each individual, identical to
+    `deap.tools.assignCrowdingDist`
+
+    Parameters
+    ----------
+    objectives: np.ndarray
+        (n, n_objectives) array of objective values
+
+    Returns
+    -------
+    np.ndarray
+        (n,) array of crowding distances
+    """
+    n, n_objectives = objectives.shape
+    distances = np.zeros(n)
+    if n == 0:
+        return distances
+
+    # individuals are sorted by each objective in turn using a stable sort, ties
+    # keep the order of the previous objective
+    order = np.arange(n)
+    with np.errstate(invalid="ignore"):
+        for values in objectives.T:
+            order = order[np.argsort(values[order], kind="stable")]
+            distances[order[0]] = np.inf
+            distances[order[-1]] = np.inf
+
+            sorted_values = values[order]
+            if sorted_values[-1] == sorted_values[0]:
+                continue
+            norm = n_objectives * float(sorted_values[-1] - sorted_values[0])
+            distances[order[1:-1]] += (sorted_values[2:] - sorted_values[:-2]) / norm
+
+    return distances
+
+
+def select_nsga2(objectives: np.ndarray, constraints: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the positions of `k` individuals selected using NSGA-II [Deb2002],
+    identical to `deap.tools.selNSGA2` with `FitnessWithConstraints`
+
+    Parameters
+    ----------
+    objectives: np.ndarray
+        (n, n_objectives) array of objective values (minimized)
+    constraints: np.ndarray
+        (n, n_constraints) array of constraint values (satisfied when <= 0)
+    k: int
+        number of individuals to select
+
+    Returns
+    -------
+    np.ndarray
+        positions of the selected individuals
+    """
+    fronts = nondominated_sort(objectives, constraints, k)
+    if not fronts:
+        return np.zeros(0, dtype=int)
+
+    chosen = np.concatenate([np.zeros(0, dtype=int)] + fronts[:-1])
+    n_remaining = k - len(chosen)
+    if n_remaining <= 0:
+        return chosen
+
+    # fill the remaining slots from the last front by decreasing crowding distance
+    last = fronts[-1]
+    distances = crowding_distance(objectives[last]).tolist()
+    order = sorted(range(len(last)), key=distances.__getitem__, reverse=True)
+    return np.concatenate([chosen, last[order[:n_remaining]]])
+
+
+def uniform_reference_points(n_objectives: int, n_partitions: int) -> np.ndarray:
+    """
+    Returns the reference points of Das and Dennis, evenly spaced on the unit
+    simplex with `n_partitions` divisions along each objective axis. There are
+    `binomial(n_objectives + n_partitions - 1, n_partitions)` points.
+
+    Parameters
+    ----------
+    n_objectives: int
+        number of objectives
+    n_partitions: int
+        number of divisions along each objective axis
+
+    Returns
+    -------
+    np.ndarray
+        (n_points, n_objectives) array of reference points
+    """
+    if n_objectives == 1:
+        return np.ones((1, 1))
+
+    # each point is a composition of n_partitions into n_objectives parts, built
+    # from the positions of n_objectives - 1 separators among the partitions
+    separators = np.array(
+        list(combinations(range(n_partitions + n_objectives - 1), n_objectives - 1))
+    ).reshape(-1, n_objectives - 1)
+    padded = np.hstack(
+        [
+            np.full((len(separators), 1), -1),
+            separators,
+            np.full((len(separators), 1), n_partitions + n_objectives - 1),
+        ]
+    )
+    return (np.diff(padded, axis=1) - 1) / n_partitions
+
+
+def default_reference_partitions(n_objectives: int, population_size: int) -> int:
+    """
+    Returns the largest number of partitions that gives no more uniform reference
+    points than the population size (at least 1), as recommended by [Deb2014]
+    """
+    n_partitions = 1
+    while comb(n_objectives + n_partitions, n_partitions + 1) <= population_size:
+        n_partitions += 1
+    return n_partitions
+
+
+def select_nsga3(
+    objectives: np.ndarray,
+    constraints: np.ndarray,
+    k: int,
+    reference_points: np.ndarray,
+    rng=None,
+) -> np.ndarray:
+    """
+    Returns the positions of `k` individuals selected using NSGA-III [Deb2014].
+    Fronts are sorted in the same way as for NSGA-II, the last front is filled by
+    niching around the reference points instead of by crowding distance.
+
+    Parameters
+    ----------
+    objectives: np.ndarray
+        (n, n_objectives) array of objective values (minimized)
+    constraints: np.ndarray
+        (n, n_constraints) array of constraint values (satisfied when <= 0)
+    k: int
+        number of individuals to select
+    reference_points: np.ndarray
+        (n_points, n_objectives) array of reference points on the unit simplex,
+        see `uniform_reference_points`
+    rng: np.random.Generator, optional
+        random number generator used to break ties, defaults to `np.random`
+
+    Returns
+    -------
+    np.ndarray
+        positions of the selected individuals
+    """
+    rng = np.random if rng is None else rng
+
+    fronts = nondominated_sort(objectives, constraints, k)
+    if not fronts:
+        return np.zeros(0, dtype=int)
+
+    chosen = np.concatenate([np.zeros(0, dtype=int)] + fronts[:-1])
+    n_remaining = k - len(chosen)
+    if n_remaining <= 0:
+        return chosen
+
+    last = fronts[-1]
+    sorted_positions = np.concatenate([chosen, last])
+    niches, distances = associate_to_niches(
+        normalize_objectives(objectives[sorted_positions]), reference_points
+    )
+
+    n_chosen = len(chosen)
+    niche_counts = np.bincount(niches[:n_chosen], minlength=len(reference_points))
+    selected = _niching(
+        n_remaining, niches[n_chosen:], distances[n_chosen:], niche_counts, rng
+    )
+    return np.concatenate([chosen, last[selected]])
+
+
+def normalize_objectives(objectives: np.ndarray) -> np.ndarray:
+    """
+    Translates objectives so that the ideal point is at the origin and scales them
+    by the intercepts of the hyperplane through the extreme points [Deb2014].
+    Falls back to the nadir point of the population if the hyperplane is
+    degenerate. Non-finite objectives (failed evaluations) are treated as being
+    at the worst finite value.
+    """
+    finite = np.isfinite(objectives)
+    worst = np.max(np.where(finite, objectives, -np.inf), axis=0)
+    worst = np.where(np.isfinite(worst), worst, 0.0)
+    objectives = np.where(finite, objectives, worst)
+
+    ideal = objectives.min(axis=0)
+    translated = objectives - ideal
+
+    # extreme points minimize the achievement scalarizing function along each axis
+    n_objectives = objectives.shape[1]
+    weights = np.where(np.eye(n_objectives) == 1, 1.0, 1e6)
+    asf = np.max(translated[None, :, :] * weights[:, None, :], axis=-1)
+    extreme = translated[np.argmin(asf, axis=1)]
+
+    nadir = translated.max(axis=0)
+    try:
+        x = np.linalg.solve(extreme, np.ones(n_objectives))
+    except np.linalg.LinAlgError:
+        intercepts = nadir
+    else:
+        with np.errstate(divide="ignore"):
+            intercepts = 1.0 / x
+        if (
+            not np.allclose(extreme @ x, 1.0)
+            or np.any(~np.isfinite(intercepts))
+            or np.any(intercepts <= 1e-6)
+            or np.any(intercepts > nadir)
+        ):
+            intercepts = nadir
+
+    intercepts = np.where(intercepts > 1e-12, intercepts, 1.0)
+    return translated / intercepts
+
+
+def associate_to_niches(normalized: np.ndarray, reference_points: np.ndarray):
+    """
+    Associates each individual with the closest reference direction, returns the
+    niche index and perpendicular distance to the reference direction for each
+    individual
+    """
+    directions = reference_points / np.linalg.norm(
+        reference_points, axis=1, keepdims=True
+    )
+    projections = normalized @ directions.T
+    squared_norms = np.sum(normalized**2, axis=1, keepdims=True)
+    distances = np.sqrt(np.maximum(squared_norms - projections**2, 0.0))
+
+    niches = np.argmin(distances, axis=1)
+    return niches, distances[np.arange(len(niches)), niches]
+
+
+def _niching(k, niches, distances, niche_counts, rng):
+    """
+    Returns the positions of `k` individuals selected from the last front. In each
+    round one individual is added to each of the least crowded niches: the
+    individual closest to the reference direction if the niche is empty, or a
+    random individual otherwise.
+    """
+    niche_counts = niche_counts.copy()
+    available = np.ones(len(niches), dtype=bool)
+    selected = []
+    while len(selected) < k:
+        available_niches = np.unique(niches[available])
+        min_count = niche_counts[available_niches].min()
+        candidate_niches = available_niches[niche_counts[available_niches] == min_count]
+        candidate_niches = rng.permutation(candidate_niches)[: k - len(selected)]
+
+        # rank the available members of each niche, empty niches prefer the
+        # closest individual while other niches pick at random
+        members = np.flatnonzero(available & np.isin(niches, candidate_niches))
+        keys = np.where(
+            niche_counts[niches[members]] == 0,
+            distances[members],
+            rng.random(len(members)),
+        )
+        members = members[np.lexsort((keys, niches[members]))]
+        _, first = np.unique(niches[members], return_index=True)
+        picks = members[first]
+
+        available[picks] = False
+        niche_counts[niches[picks]] += 1
+        selected.extend(picks)
+
+    return np.array(selected, dtype=int)
@@ -0,0 +1,120 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import torch
+from botorch.acquisition.multi_objective import qExpectedHypervolumeImprovement
+from botorch.models import ModelListGP
+from botorch.sampling import SobolQMCNormalSampler
+from botorch.utils.multi_objective.box_decompositions.non_dominated import (
+    FastNondominatedPartitioning,
+)
+from botorch.utils.multi_objective.hypervolume import infer_reference_point
+from botorch.utils.multi_objective.pareto import is_non_dominated
+
+from xopt.generators.bayesian.models.standard import create_standard_model
+from xopt.generators.bayesian.objectives import (
+    create_constraint_callables,
+    create_mobo_objective,
+)
+from xopt.generators.ga.selection import select_nsga2
+from xopt.vocs import VOCS
+
+
+def train_surrogate(data: pd.DataFrame, vocs: VOCS) -> ModelListGP:
+    """
+    Returns a standard GP model of the objectives (in minimization form) and
+    constraints (feasible when <= 0) trained on the valid rows of `data`
+    """
+    valid_data = data[pd.unique(vocs.variable_names + vocs.output_names)].dropna()
+    return create_standard_model(
+        vocs.variable_data(valid_data, ""),
+        vocs.objective_data(valid_data, ""),
+        vocs.constraint_data(valid_data, ""),
+        bounds=vocs.bounds,
+    )
+
+
+def prescreen(
+    candidates: pd.DataFrame,
+    n: int,
+    model: ModelListGP,
+    vocs: VOCS,
+    data: pd.DataFrame,
+    ranking: str = "nondominated",
+    n_samples: int = 128,
+    reference_point: Dict[str, float] = None,
+) -> np.ndarray:
+    """
+    Returns the positions of the `n` most promising candidates according to a
+    surrogate model.
+
+    Parameters
+    ----------
+    candidates: pd.DataFrame
+        candidate inputs
+    n: int
+        number of candidates to keep
+    model: ModelListGP
+        surrogate model, see `train_surrogate`
+    vocs: VOCS
+        vocs of the problem
+    data: pd.DataFrame
+        evaluated data, used as the baseline for hypervolume improvement
+    ranking: str, optional
+        "nondominated": NSGA-II selection on the predicted mean objectives and
+        constraints. "hypervolume": expected hypervolume improvement over the
+        observed feasible pareto front, weighted by the probability of
+        feasibility. Falls back to "nondominated" if no feasible points have
+        been observed.
+    n_samples: int, optional
+        number of Monte Carlo samples used for expected hypervolume improvement
+    reference_point: Dict[str, float], optional
+        reference point of the hypervolume for each objective. If not specified,
+        the nadir point of the observed feasible pareto front is used, moved
+        outward by 10% of the range of each objective, such that improvements
+        of the extreme points of the front also count.
+
+    Returns
+    -------
+    np.ndarray
+        positions of the selected candidates
+    """
+    if n >= len(candidates):
+        return np.arange(len(candidates))
+
+    X = torch.tensor(vocs.variable_data(candidates, "").to_numpy(), dtype=torch.double)
+
+    if ranking == "hypervolume":
+        objectives = vocs.objective_data(data, "").to_numpy()
+        feasible = vocs.feasibility_data(data)["feasible"].to_numpy()
+        feasible &= np.all(np.isfinite(objectives), axis=-1)
+        if np.any(feasible):
+            # botorch maximizes
+            Y = -torch.tensor(objectives[feasible], dtype=torch.double)
+            if reference_point is None:
+                ref_point = infer_reference_point(Y[is_non_dominated(Y)])
+            else:
+                ref_point = -torch.tensor(
+                    vocs.objective_data([reference_point], "").to_numpy()[0],
+                    dtype=torch.double,
+                )
+            acq = qExpectedHypervolumeImprovement(
+                model,
+                ref_point=ref_point,
+                partitioning=FastNondominatedPartitioning(ref_point, Y),
+                sampler=SobolQMCNormalSampler(n_samples),
+                objective=create_mobo_objective(vocs),
+                constraints=create_constraint_callables(vocs) or None,
+            )
+            with torch.no_grad():
+                values = acq(X.unsqueeze(-2)).numpy()
+            return np.argsort(-values, kind="stable")[:n]
+
+    elif ranking != "nondominated":
+        raise ValueError(f"Invalid surrogate ranking: {ranking}")
+
+    n_objectives = vocs.n_objectives
+    with torch.no_grad():
+        mean = model.posterior(X).mean.numpy()
+    return select_nsga2(mean[:, :n_objectives], mean[:, n_objectives:], n)
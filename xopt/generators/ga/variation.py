@@ -0,0 +1,184 @@
+import numpy as np
+
+
+def sbx_crossover(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    low: np.ndarray,
+    up: np.ndarray,
+    eta: float,
+    rng: np.random.Generator,
+):
+    """
+    Bounded simulated binary crossover [Deb1995] of pairs of parents, the
+    vectorized equivalent of `deap.tools.cxSimulatedBinaryBounded`. Each variable
+    is crossed with probability 0.5 if the parents differ, children are clipped
+    to the bounds and randomly assigned to the two offspring.
+
+    Parameters
+    ----------
+    parents1: np.ndarray
+        (n, n_variables) array of first parents
+    parents2: np.ndarray
+        (n, n_variables) array of second parents
+    low: np.ndarray
+        (n_variables,) array of lower bounds
+    up: np.ndarray
+        (n_variables,) array of upper bounds
+    eta: float
+        crowding degree of the crossover, large values give children close to
+        their parents
+    rng: np.random.Generator
+        random number generator
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        arrays of first and second offspring
+    """
+    shape = parents1.shape
+    crossed = (rng.random(shape) <= 0.5) & (np.abs(parents1 - parents2) > 1e-14)
+    rand = rng.random(shape)
+    swap = rng.random(shape) <= 0.5
+
+    x1 = np.minimum(parents1, parents2)
+    x2 = np.maximum(parents1, parents2)
+    spread = np.where(crossed, x2 - x1, 1.0)
+
+    def spread_factor(beta):
+        alpha = 2.0 - beta ** -(eta + 1)
+        return np.where(
+            rand <= 1.0 / alpha,
+            (rand * alpha) ** (1.0 / (eta + 1)),
+            (1.0 / (2.0 - rand * alpha)) ** (1.0 / (eta + 1)),
+        )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        beta_q1 = spread_factor(1.0 + 2.0 * (x1 - low) / spread)
+        beta_q2 = spread_factor(1.0 + 2.0 * (up - x2) / spread)
+    c1 = np.clip(0.5 * (x1 + x2 - beta_q1 * (x2 - x1)), low, up)
+    c2 = np.clip(0.5 * (x1 + x2 + beta_q2 * (x2 - x1)), low, up)
+
+    offspring1 = np.where(crossed, np.where(swap, c2, c1), parents1)
+    offspring2 = np.where(crossed, np.where(swap, c1, c2), parents2)
+    return offspring1, offspring2
+
+
+def polynomial_mutation(
+    individuals: np.ndarray,
+    low: np.ndarray,
+    up: np.ndarray,
+    eta: float,
+    indpb: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Bounded polynomial mutation [Deb2001], the vectorized equivalent of
+    `deap.tools.mutPolynomialBounded`. Each variable is mutated with probability
+    `indpb` and clipped to the bounds.
+
+    Parameters
+    ----------
+    individuals: np.ndarray
+        (n, n_variables) array of individuals
+    low: np.ndarray
+        (n_variables,) array of lower bounds
+    up: np.ndarray
+        (n_variables,) array of upper bounds
+    eta: float
+        crowding degree of the mutation, large values give mutants close to the
+        original individual
+    indpb: float
+        probability of mutating each variable
+    rng: np.random.Generator
+        random number generator
+
+    Returns
+    -------
+    np.ndarray
+        array of mutated individuals
+    """
+    shape = individuals.shape
+    mutated = rng.random(shape) <= indpb
+    rand = rng.random(shape)
+
+    width = np.where(up > low, up - low, 1.0)
+    delta_1 = (individuals - low) / width
+    delta_2 = (up - individuals) / width
+    mut_pow = 1.0 / (eta + 1.0)
+
+    with np.errstate(invalid="ignore"):
+        lower = 2.0 * rand + (1.0 - 2.0 * rand) * (1.0 - delta_1) ** (eta + 1)
+        upper = 2.0 * (1.0 - rand) + 2.0 * (rand - 0.5) * (1.0 - delta_2) ** (eta + 1)
+        delta_q = np.where(rand < 0.5, lower**mut_pow - 1.0, 1.0 - upper**mut_pow)
+
+    mutants = np.clip(individuals + delta_q * (up - low), low, up)
+    return np.where(mutated, mutants, individuals)
+
+
+def variation(
+    population: np.ndarray,
+    low: np.ndarray,
+    up: np.ndarray,
+    crossover_probability: float,
+    mutation_probability: float,
+    crossover_eta: float = 20.0,
+    mutation_eta: float = 20.0,
+    indpb: float = None,
+    rng: np.random.Generator = None,
+) -> np.ndarray:
+    """
+    Applies crossover and mutation to a population, the vectorized equivalent of
+    `deap.algorithms.varAnd` with bounded SBX crossover and polynomial mutation.
+    Consecutive pairs of individuals are crossed with probability
+    `crossover_probability`, then each individual is mutated with probability
+    `mutation_probability`.
+
+    Parameters
+    ----------
+    population: np.ndarray
+        (n, n_variables) array of individuals
+    low: np.ndarray
+        (n_variables,) array of lower bounds
+    up: np.ndarray
+        (n_variables,) array of upper bounds
+    crossover_probability: float
+        probability of crossing each pair of individuals
+    mutation_probability: float
+        probability of mutating each individual
+    crossover_eta: float, optional
+        crowding degree of the crossover
+    mutation_eta: float, optional
+        crowding degree of the mutation
+    indpb: float, optional
+        probability of mutating each variable of a mutated individual, defaults to
+        `1 / n_variables`
+    rng: np.random.Generator, optional
+        random number generator, a new unseeded generator is used if not given
+
+    Returns
+    -------
+    np.ndarray
+        (n, n_variables) array of offspring
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    offspring = np.array(population, dtype=float)
+    n, n_variables = offspring.shape
+    low = np.asarray(low, dtype=float)
+    up = np.asarray(up, dtype=float)
+    indpb = 1.0 / n_variables if indpb is None else indpb
+
+    # crossover of consecutive pairs, an odd individual out is not crossed
+    n_pairs = n // 2
+    mate = rng.random(n_pairs) < crossover_probability
+    first = 2 * np.flatnonzero(mate)
+    offspring[first], offspring[first + 1] = sbx_crossover(
+        offspring[first], offspring[first + 1], low, up, crossover_eta, rng
+    )
+
+    mutate = np.flatnonzero(rng.random(n) < mutation_probability)
+    offspring[mutate] = polynomial_mutation(
+        offspring[mutate], low, up, mutation_eta, indpb, rng
+    )
+
+    return offspring
@@ -0,0 +1,246 @@
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from xopt.generator import Generator, GeneratorOptions
+from xopt.generators.scipy.neldermead import _minimize_neldermead
+from xopt.vocs import OBJECTIVE_WEIGHT
+
+logger = logging.getLogger(__name__)
+
+
+class MultiStartNelderMeadOptions(GeneratorOptions):
+    initial_point: Dict[str, float] = None  # First start, the rest are quasi-random
+    # Number of simplexes run concurrently. By default, new simplexes are started
+    # whenever more candidates are requested than simplexes are ready, so that
+    # there is one simplex for each worker
+    n_starts: int = None
+    max_starts: int = None  # Total number of simplexes started, unlimited if None
+    initial_step: float = 0.05  # Size of the initial simplexes, fraction of bounds
+    # Simplexes that do not improve by more than `fatol` in this many evaluations
+    # are restarted, never if None
+    stall_evaluations: int = 100
+    seed: int = None
+    # Same as scipy.optimize._optimize._minimize_neldermead
+    adaptive: bool = True
+    xatol: float = 1e-4
+    fatol: float = 1e-4
+
+
+class MultiStartNelderMeadGenerator(Generator):
+    """
+    Multi-start Nelder-Mead algorithm in Xopt's Generator form.
+
+    `n_starts` independent simplexes are run concurrently from quasi-random
+    (scrambled Sobol) starting points within the bounds. Each simplex has at most
+    one candidate being evaluated, candidates of the simplexes are interleaved so
+    that each worker evaluates a candidate of a different simplex. Candidates are
+    labeled with the simplex they belong to in the `xopt_start` column, which is
+    used to return evaluated data to its simplex.
+
+    Simplexes that converge or stall are retired and replaced by a simplex from
+    the next starting point, until `max_starts` simplexes have been started. The
+    outcome of each simplex is listed in `results` and the best point found over
+    all starts in `best`.
+    """
+
+    alias = "multistart_neldermead"
+
+    @staticmethod
+    def default_options() -> MultiStartNelderMeadOptions:
+        return MultiStartNelderMeadOptions()
+
+    def __init__(
+        self,
+        vocs,
+        options: MultiStartNelderMeadOptions = MultiStartNelderMeadOptions(),
+    ):
+        if not isinstance(options, MultiStartNelderMeadOptions):
+            raise ValueError("options must be a MultiStartNelderMeadOptions object")
+        super().__init__(vocs, options)
+
+        self.runs = {}  # Active simplexes keyed by start
+        self.n_started = 0
+        self._results = []  # Outcome of each retired simplex
+        self._sampler = qmc.Sobol(vocs.n_variables, scramble=True, seed=options.seed)
+
+    def _check_options(self, options: MultiStartNelderMeadOptions):
+        for name in ["n_starts", "max_starts", "stall_evaluations"]:
+            value = getattr(options, name)
+            if value is not None and value < 1:
+                raise ValueError(f"`{name}` must be at least 1")
+        if not 0 < options.initial_step <= 1:
+            raise ValueError("`initial_step` must be in (0, 1]")
+
+    def generate(self, n_candidates) -> List[Dict]:
+        """
+        generate up to `n_candidates` candidates, one from each simplex that is
+        not waiting for an evaluation
+        """
+        if self.n_started == 0 and self.options.n_starts is not None:
+            for _ in range(self.options.n_starts):
+                self.start()
+
+        candidates = []
+        ready = [run for run in self.runs.values() if not run.pending]
+        while len(candidates) < n_candidates:
+            if ready:
+                run = ready.pop(0)
+            elif self.options.n_starts is None:
+                run = self.start()
+            else:
+                run = None
+            if run is None:
+                break
+
+            # converged simplexes are replaced by a new start
+            while run is not None and not run.step():
+                self.retire(run, "converged")
+                run = self.start()
+
+            if run is not None:
+                x = dict(zip(self.vocs.variable_names, run.x))
+                candidates.append({**x, "xopt_start": run.start})
+
+        if not self.runs:
+            self._is_done = True
+            return None
+
+        return candidates
+
+    def add_data(self, new_data: pd.DataFrame):
+        # data that was not generated by a simplex is ignored
+        if "xopt_start" not in new_data:
+            return
+
+        objectives = self.vocs.objective_data(new_data, "").to_numpy()[:, 0]
+        for start, y in zip(new_data["xopt_start"], objectives):
+            run = self.runs.get(start)
+            if run is None or not run.pending:
+                continue
+            run.tell(y)
+
+            stall_evaluations = self.options.stall_evaluations
+            if stall_evaluations is not None and run.n_stalled >= stall_evaluations:
+                self.retire(run, "stalled")
+                self.start()
+
+    def start(self):
+        """
+        Start a new simplex from the next starting point, returns None if
+        `max_starts` simplexes have been started
+        """
+        max_starts = self.options.max_starts
+        if max_starts is not None and self.n_started >= max_starts:
+            return None
+
+        lower, upper = self.vocs.bounds
+        if self.n_started == 0 and self.options.initial_point is not None:
+            x0 = np.array(
+                [self.options.initial_point[k] for k in self.vocs.variable_names]
+            )
+        else:
+            x0 = qmc.scale(self._sampler.random(1), lower, upper)[0]
+
+        # steps along each axis, pointing inwards near the upper bound
+        step = self.options.initial_step * (upper - lower)
+        step = np.where(x0 + step > upper, -step, step)
+        initial_simplex = np.vstack([x0, x0 + np.diag(step)])
+
+        run = _NelderMeadRun(
+            self.n_started,
+            initial_simplex,
+            adaptive=self.options.adaptive,
+            xatol=self.options.xatol,
+            fatol=self.options.fatol,
+            bounds=self.vocs.bounds,
+        )
+        self.runs[run.start] = run
+        self.n_started += 1
+        logger.debug(f"Started simplex {run.start} from {x0}")
+        return run
+
+    def retire(self, run, status: str):
+        """Remove a simplex from the active simplexes and record its outcome"""
+        del self.runs[run.start]
+        self._results.append(self._result(run, status))
+        logger.debug(f"Simplex {run.start} {status} at {run.best_x}")
+
+    def _result(self, run, status: str) -> Dict:
+        # objective value in the original units
+        name = self.vocs.objective_names[0]
+        weight = OBJECTIVE_WEIGHT[self.vocs.objectives[name].upper()]
+        return {
+            "start": run.start,
+            "status": status,
+            "n_evaluations": run.n_evaluations,
+            **dict(zip(self.vocs.variable_names, run.best_x)),
+            name: weight * run.best_y,
+        }
+
+    @property
+    def results(self) -> pd.DataFrame:
+        """
+        Best point of each simplex, with its status ("converged", "stalled" or
+        "running") and number of evaluations
+        """
+        running = [self._result(run, "running") for run in self.runs.values()]
+        return pd.DataFrame(self._results + running)
+
+    @property
+    def best(self) -> Dict:
+        """
+        Best point found over all starts, with its objective value and the start it
+        belongs to, None if nothing has been evaluated
+        """
+        results = self.results
+        if results.empty or not results["n_evaluations"].any():
+            return None
+        objective = self.vocs.objective_data(results, "").iloc[:, 0]
+        return results.loc[objective.idxmin()].to_dict()
+
+
+class _NelderMeadRun:
+    """A single simplex, evaluated one candidate at a time"""
+
+    def __init__(self, start, initial_simplex, **kwargs):
+        self.start = start
+        self.pending = False  # Waiting for the evaluation of `x`
+        self.x = None
+        self.y = None
+        self.best_x = initial_simplex[0]
+        self.best_y = np.inf
+        self.n_evaluations = 0
+        self.n_stalled = 0  # Evaluations without improvement
+        self._algorithm = _minimize_neldermead(
+            self.func, initial_simplex[0], initial_simplex=initial_simplex, **kwargs
+        )
+        self._fatol = kwargs.get("fatol", 1e-4)
+
+    def func(self, x):
+        assert np.array_equal(x, self.x), f"{x} should equal {self.x}"
+        return self.y
+
+    def step(self) -> bool:
+        """Advance to the next candidate, returns False if converged"""
+        try:
+            self.x, _ = next(self._algorithm)
+        except StopIteration:
+            return False
+        self.x = np.array(self.x)  # the algorithm updates the simplex in place
+        self.pending = True
+        return True
+
+    def tell(self, y: float):
+        """Result of the evaluation of the pending candidate"""
+        self.y = y
+        self.pending = False
+        self.n_evaluations += 1
+        self.n_stalled += 1
+        if y < self.best_y - self._fatol:
+            self.n_stalled = 0
+        if y < self.best_y:
+            self.best_x, self.best_y = self.x, y
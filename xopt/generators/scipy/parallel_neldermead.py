@@ -0,0 +1,342 @@
+import logging
+import warnings
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from xopt.generators.scipy.neldermead import NelderMeadGenerator, NelderMeadOptions
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelNelderMeadOptions(NelderMeadOptions):
+    # Number of the worst vertices replaced concurrently in each iteration and
+    # whether all of their trial points are evaluated at once. Both default to
+    # using the number of candidates of the first request (the number of workers)
+    n_vertices: int = None
+    speculative: bool = None
+
+
+class ParallelNelderMeadGenerator(NelderMeadGenerator):
+    """
+    Parallel Nelder-Mead algorithm in Xopt's Generator form.
+
+    Two kinds of parallelism are used to keep the workers busy:
+
+    - speculative: the reflection, expansion and both contraction points of a
+      vertex are evaluated at once, instead of the reflection first followed by
+      one of the others. The simplex follows the same path as the serial algorithm
+      in fewer rounds of evaluations.
+    - `n_vertices` > 1: the worst vertices are replaced concurrently, reflected
+      through the centroid of the remaining vertices [1]. Replacing more than a
+      third of the vertices tends to collapse the simplex prematurely.
+
+    By default, candidates are evaluated speculatively with 4 or more workers and
+    as many vertices are replaced as the workers allow, up to a third of the
+    simplex. The number of workers is taken from the first request. With
+    `n_vertices = 1` and `speculative = False`, this is the same algorithm as
+    `NelderMeadGenerator`.
+
+    Candidates are generated in batches, the next batch is only available once
+    all evaluations of the current batch have been added, until then no
+    candidates are returned. Candidates are labeled
+    with a running trial number in the `xopt_trial` column, which is used to
+    match results to their trial point, so results can be added in any order.
+    Data without a label of the current batch is ignored.
+
+    References
+    ----------
+    .. [1] Lee, D. and Wiswall, M.
+       A Parallel Implementation of the Simplex Function Minimization Routine.
+       2007. Computational Economics. 30:2, pp. 171-187
+    """
+
+    alias = "parallel_neldermead"
+
+    @staticmethod
+    def default_options() -> ParallelNelderMeadOptions:
+        return ParallelNelderMeadOptions()
+
+    def __init__(
+        self, vocs, options: ParallelNelderMeadOptions = ParallelNelderMeadOptions()
+    ):
+        if not isinstance(options, ParallelNelderMeadOptions):
+            raise ValueError("options must be a ParallelNelderMeadOptions object")
+        super().__init__(vocs, options)
+
+        self._n_workers = None  # Set on first generate
+        self._n_issued = 0  # Number of points of the current batch generated
+        self._n_trials = 0  # Number of trial points of all batches so far
+        self._batch_start = 0  # Trial number of the first point of the batch
+        self._batch_values = None  # Objective values of the current batch
+
+    def _check_options(self, options: ParallelNelderMeadOptions):
+        if options.n_vertices is not None and options.n_vertices < 1:
+            raise ValueError("`n_vertices` must be at least 1")
+
+    @property
+    def speculative(self) -> bool:
+        """Whether all trial points of an iteration are evaluated at once"""
+        if self.options.speculative is None:
+            return self._n_workers >= 4
+        return self.options.speculative
+
+    @property
+    def n_vertices(self) -> int:
+        """Number of vertices replaced concurrently in each iteration"""
+        if self.options.n_vertices is not None:
+            return self.options.n_vertices
+        n_trial = 4 if self.speculative else 1  # trial points per vertex
+        max_vertices = max(1, self.vocs.n_variables // 3)
+        return max(1, min(self._n_workers // n_trial, max_vertices))
+
+    def _init_algorithm(self):
+        """
+        sets self._algorithm to the generator function (initializing it).
+        """
+        options = self.options  # convenience
+
+        if options.initial_simplex:
+            sim = np.array(
+                [options.initial_simplex[k] for k in self.vocs.variable_names]
+            ).T
+        else:
+            sim = None
+
+        self._algorithm = _minimize_parallel_neldermead(
+            self.func,  # Handled by base class
+            self.x0,  # Handled by base class
+            n_vertices=self.n_vertices,
+            speculative=self.speculative,
+            adaptive=options.adaptive,
+            xatol=options.xatol,
+            fatol=options.fatol,
+            initial_simplex=sim,
+            bounds=self.vocs.bounds,
+        )
+        self._batch_values = None
+
+    def generate(self, n_candidates) -> List[Dict]:
+        # Check if any options were changed from init. If so, reset the algorithm
+        if self.options != self._saved_options:
+            self._algorithm = None
+            self._saved_options = self.options.copy()
+
+        # Actually start the algorithm.
+        if self._algorithm is None:
+            self._n_workers = n_candidates
+            self._init_algorithm()
+            self._is_done = False
+
+        if self.is_done:
+            return None
+
+        # Start the next batch of trial points once the last one is evaluated
+        if self._batch_values is None:
+            try:
+                self.x, self.state = next(self._algorithm)
+            except StopIteration:
+                self._is_done = True
+                return None
+            self._batch_values = np.full(len(self.x), np.nan)
+            self._n_issued = 0
+            self._batch_start = self._n_trials
+            self._n_trials += len(self.x)
+
+        # nothing to issue while the rest of the batch is being evaluated
+        if self._n_issued == len(self.x):
+            return []
+
+        issued = range(self._n_issued, min(self._n_issued + n_candidates, len(self.x)))
+        self._n_issued = issued.stop
+        self.inputs = [
+            {
+                **dict(zip(self.vocs.variable_names, self.x[i])),
+                "xopt_trial": self._batch_start + i,
+            }
+            for i in issued
+        ]
+        return self.inputs
+
+    def add_data(self, new_data: pd.DataFrame):
+        # data that was not generated in the current batch is ignored
+        if self._batch_values is None or "xopt_trial" not in new_data:
+            return
+
+        # results are matched to their trial point by label
+        position = new_data["xopt_trial"].to_numpy(dtype=float) - self._batch_start
+        y = self.vocs.objective_data(new_data, "").to_numpy()[:, 0]
+        current = (position >= 0) & (position < self._n_issued)
+        self._batch_values[position[current].astype(int)] = y[current]
+
+        self.data = new_data
+
+        # all results are in, failed evaluations are treated as infinitely bad
+        if not np.any(np.isnan(self._batch_values)):
+            self.y = self._batch_values  # generator_function accesses this
+            self._batch_values = None
+
+
+def _minimize_parallel_neldermead(
+    func,
+    x0,
+    n_vertices=1,
+    speculative=False,
+    initial_simplex=None,
+    xatol=1e-4,
+    fatol=1e-4,
+    adaptive=False,
+    bounds=None,
+):
+    """
+    Parallel Nelder-Mead algorithm [1] as a generator function. Yields batches of
+    points to be evaluated together with the current simplex, `func` returns the
+    objective values of the last batch.
+
+    Each iteration, the `n_vertices` worst vertices are reflected through the
+    centroid of the remaining vertices and the reflections are evaluated at once.
+    The expansion or contraction points needed by each vertex are then evaluated
+    at once. The simplex is only shrunk if none of the vertices could be
+    replaced. With `n_vertices = 1` this is the same algorithm as
+    `_minimize_neldermead`.
+
+    Options
+    -------
+    n_vertices : int
+        Number of vertices replaced concurrently, at most the number of
+        variables.
+    speculative : bool
+        Evaluate the reflection, expansion and contraction points of each vertex
+        at once, in a single batch instead of two.
+    initial_simplex, xatol, fatol, adaptive, bounds
+        See `_minimize_neldermead`.
+
+    References
+    ----------
+    .. [1] Lee, D. and Wiswall, M.
+       A Parallel Implementation of the Simplex Function Minimization Routine.
+       2007. Computational Economics. 30:2, pp. 171-187
+    """
+    x0 = np.asfarray(x0).flatten()
+
+    if adaptive:
+        dim = float(len(x0))
+        rho = 1
+        chi = 1 + 2 / dim
+        psi = 0.75 - 1 / (2 * dim)
+        sigma = 1 - 1 / dim
+    else:
+        rho = 1
+        chi = 2
+        psi = 0.5
+        sigma = 0.5
+
+    nonzdelt = 0.05
+    zdelt = 0.00025
+
+    if bounds is not None:
+        lower_bound, upper_bound = bounds
+        if (lower_bound > upper_bound).any():
+            raise ValueError(
+                "Nelder Mead - one of the lower bounds is greater than an upper bound."
+            )
+        if np.any(lower_bound > x0) or np.any(x0 > upper_bound):
+            warnings.warn("Initial guess is not within the specified bounds")
+        x0 = np.clip(x0, lower_bound, upper_bound)
+
+    def clip(x):
+        if bounds is None:
+            return x
+        return np.clip(x, lower_bound, upper_bound)
+
+    if initial_simplex is None:
+        N = len(x0)
+        sim = np.tile(x0, (N + 1, 1))
+        for k in range(N):
+            sim[k + 1, k] = (1 + nonzdelt) * x0[k] if x0[k] != 0 else zdelt
+    else:
+        sim = np.asfarray(initial_simplex).copy()
+        if sim.ndim != 2 or sim.shape[0] != sim.shape[1] + 1:
+            raise ValueError("`initial_simplex` should be an array of shape (N+1,N)")
+        if len(x0) != sim.shape[1]:
+            raise ValueError("Size of `initial_simplex` is not consistent with `x0`")
+        N = sim.shape[1]
+    sim = clip(sim)
+
+    n_vertices = max(1, min(n_vertices, N))
+    n_keep = N + 1 - n_vertices  # vertices kept in each iteration
+
+    yield sim, sim
+    fsim = np.asarray(func(sim), dtype=float)
+
+    ind = np.argsort(fsim)
+    sim = np.take(sim, ind, 0)
+    fsim = np.take(fsim, ind, 0)
+
+    while True:
+        if (
+            np.max(np.ravel(np.abs(sim[1:] - sim[0]))) <= xatol
+            and np.max(np.abs(fsim[0] - fsim[1:])) <= fatol
+        ):
+            break
+
+        # trial points of the worst vertices, reflected through the centroid of
+        # the others
+        xbar = np.add.reduce(sim[:n_keep], 0) / n_keep
+        worst, fworst = sim[n_keep:], fsim[n_keep:]
+        xr = clip((1 + rho) * xbar - rho * worst)
+        xe = clip((1 + rho * chi) * xbar - rho * chi * worst)
+        xc = clip((1 + psi * rho) * xbar - psi * rho * worst)
+        xcc = clip((1 - psi) * xbar + psi * worst)
+
+        if speculative:
+            # evaluate all trial points at once, only some of them are used
+            xtrial = np.concatenate([xr, xe, xc, xcc])
+            yield xtrial, sim
+            fxr, fxe, fxc, fxcc = np.split(np.asarray(func(xtrial), dtype=float), 4)
+        else:
+            yield xr, sim
+            fxr = np.asarray(func(xr), dtype=float)
+
+        # expansion, acceptance, outside or inside contraction for each vertex
+        expand = fxr < fsim[0]
+        accept = ~expand & (fxr < fsim[n_keep - 1])
+        outside = ~expand & ~accept & (fxr < fworst)
+        inside = ~expand & ~accept & ~outside
+
+        # otherwise evaluate the one trial point needed by each vertex
+        if not speculative:
+            ftrial = np.full(n_vertices, np.nan)
+            if not np.all(accept):
+                xtrial = np.where(
+                    expand[:, np.newaxis],
+                    xe,
+                    np.where(outside[:, np.newaxis], xc, xcc),
+                )
+                yield xtrial[~accept], sim
+                ftrial[~accept] = func(xtrial[~accept])
+            fxe, fxc, fxcc = ftrial, ftrial, ftrial
+
+        xnew, fnew = xr.copy(), fxr.copy()
+        better = np.zeros(n_vertices, dtype=bool)
+        better[expand] = fxe[expand] < fxr[expand]
+        better[outside] = fxc[outside] <= fxr[outside]
+        better[inside] = fxcc[inside] < fworst[inside]
+        for mask, x, f in [(expand, xe, fxe), (outside, xc, fxc), (inside, xcc, fxcc)]:
+            xnew[mask & better] = x[mask & better]
+            fnew[mask & better] = f[mask & better]
+        failed = (outside | inside) & ~better
+
+        if np.all(failed):
+            # no vertex could be replaced, shrink towards the best vertex
+            sim[1:] = clip(sim[0] + sigma * (sim[1:] - sim[0]))
+            yield sim[1:], sim
+            fsim[1:] = func(sim[1:])
+        else:
+            sim[n_keep:][~failed] = xnew[~failed]
+            fsim[n_keep:][~failed] = fnew[~failed]
+
+        ind = np.argsort(fsim)
+        sim = np.take(sim, ind, 0)
+        fsim = np.take(fsim, ind, 0)
@@ -0,0 +1,224 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from xopt.vocs import VOCS
+
+
+class ParetoFront:
+    def __init__(
+        self,
+        vocs: VOCS,
+        reference_point: Dict[str, float] = None,
+        n_samples: int = 100000,
+        seed: int = None,
+    ):
+        """
+        Non-dominated set of the feasible observed points, updated incrementally
+        as data is added, with a history of the dominated hypervolume against the
+        number of evaluations.
+
+        The hypervolume is computed exactly for up to 3 objectives and estimated by
+        Monte Carlo sampling for more objectives. Samples are kept between updates,
+        so the estimate only needs to be updated with the region dominated by new
+        pareto optimal points.
+
+        Parameters
+        ----------
+        vocs: VOCS
+            vocs of the problem, objectives are compared in minimization form and
+            points are feasible if all constraints are satisfied
+        reference_point: Dict[str, float], optional
+            reference point of the hypervolume in units of the objectives, defaults
+            to the worst objective values of the first feasible points added
+        n_samples: int, optional
+            number of samples used for Monte Carlo estimation of the hypervolume
+        seed: int, optional
+            seed of the Monte Carlo samples
+        """
+        self.vocs = vocs
+        self.n_samples = n_samples
+        self.rng = np.random.default_rng(seed)
+
+        self.reference_point = None  # minimization form
+        if reference_point is not None:
+            missing = set(vocs.objective_names) - set(reference_point)
+            if missing:
+                raise ValueError(f"reference point is missing objectives {missing}")
+            self.reference_point = (
+                vocs.objective_data([reference_point], "").to_numpy()[0].astype(float)
+            )
+
+        self.reset()
+
+    chunk_size = 256  # Points compared to the front at once
+
+    def reset(self):
+        """Remove all points and history"""
+        self.n_evaluations = 0  # Number of rows added
+        self.positions = np.zeros(0, dtype=int)  # Row numbers of the front
+        self.values = np.zeros((0, self.vocs.n_objectives))  # Minimization form
+        self.history = []  # (n_evaluations, hypervolume) after each update
+        self._hypervolume = 0.0
+        self._samples = None  # Monte Carlo samples and the box they are drawn from
+        self._lower = None
+        self._dominated = None
+
+    def add(self, data: pd.DataFrame):
+        """
+        Add new rows of data, row `i` is given position `n_evaluations + i`.
+        Updates the non-dominated set, hypervolume and history.
+        """
+        if len(data) == 0:
+            return
+
+        objectives = self.vocs.objective_data(data, "").to_numpy()
+        feasible = self.vocs.feasibility_data(data)["feasible"].to_numpy()
+        feasible &= np.all(np.isfinite(objectives), axis=-1)
+        candidates = np.flatnonzero(feasible)
+
+        if self.reference_point is None and len(candidates):
+            self.reference_point = np.max(objectives[candidates], axis=0)
+
+        # a point can only be dominated by points with a smaller sum of objectives,
+        # adding the best points first keeps the number of replacements low
+        order = np.argsort(objectives[candidates].sum(axis=-1), kind="stable")
+        candidates = candidates[order]
+
+        positions, values = self.positions, self.values
+        new_values = []
+        for start in range(0, len(candidates), self.chunk_size):
+            # discard points dominated by the current front all at once
+            chunk = candidates[slice(start, start + self.chunk_size)]
+            chunk = chunk[~dominated_by(objectives[chunk], values)]
+
+            for i in chunk:
+                # points equal to a point on the front are not added again
+                y = objectives[i]
+                if np.any(np.all(values <= y, axis=-1)):
+                    continue
+
+                keep = ~(np.all(y <= values, axis=-1) & np.any(y < values, axis=-1))
+                positions = np.append(positions[keep], self.n_evaluations + i)
+                values = np.vstack([values[keep], y])
+                new_values.append(y)
+
+        self.positions, self.values = positions, values
+        self.n_evaluations += len(data)
+
+        if new_values:
+            self._update_hypervolume(np.array(new_values))
+        self.history.append((self.n_evaluations, self._hypervolume))
+
+    @property
+    def hypervolume(self) -> float:
+        """Hypervolume dominated by the front, bounded by the reference point"""
+        return self._hypervolume
+
+    @property
+    def hypervolume_history(self) -> pd.DataFrame:
+        """Hypervolume after each update against the number of evaluations"""
+        return pd.DataFrame(self.history, columns=["n_evaluations", "hypervolume"])
+
+    def _update_hypervolume(self, new_values: np.ndarray):
+        if self.vocs.n_objectives <= 3:
+            self._hypervolume = hypervolume(self.values, self.reference_point)
+            return
+
+        # Monte Carlo samples are drawn in the box between the ideal point and the
+        # reference point, and redrawn if a new point extends the box
+        lower = np.minimum(np.min(self.values, axis=0), self.reference_point)
+        if self._samples is None or np.any(lower < self._lower):
+            self._lower = lower
+            self._samples = self.rng.uniform(
+                lower, self.reference_point, (self.n_samples, len(lower))
+            )
+            self._dominated = np.zeros(self.n_samples, dtype=bool)
+            new_values = self.values
+
+        # only samples that are not dominated yet need to be checked
+        remaining = np.flatnonzero(~self._dominated)
+        for y in new_values:
+            hit = np.all(self._samples[remaining] >= y, axis=-1)
+            self._dominated[remaining[hit]] = True
+            remaining = remaining[~hit]
+
+        volume = np.prod(self.reference_point - self._lower)
+        self._hypervolume = float(volume * np.mean(self._dominated))
+
+
+def dominated_by(points: np.ndarray, front: np.ndarray, chunk_size: int = 1024):
+    """
+    Returns a boolean array that is True for each of `points` that is dominated by
+    any point of `front` (minimization)
+    """
+    dominated = np.zeros(len(points), dtype=bool)
+    if len(front) == 0:
+        return dominated
+    for start in range(0, len(points), chunk_size):
+        rows = slice(start, start + chunk_size)
+        chunk = points[rows]
+
+        # compare one objective at a time, avoids large 3d temporaries
+        weakly = np.ones((len(chunk), len(front)), dtype=bool)
+        strictly = np.zeros_like(weakly)
+        for k in range(front.shape[-1]):
+            weakly &= front[:, k] <= chunk[:, k, np.newaxis]
+            strictly |= front[:, k] < chunk[:, k, np.newaxis]
+        dominated[rows] = np.any(weakly & strictly, axis=-1)
+    return dominated
+
+
+def hypervolume(points: np.ndarray, reference_point: np.ndarray) -> float:
+    """
+    Exact hypervolume dominated by `points` (minimization) and bounded by
+    `reference_point` for up to 3 objectives. Points do not need to be
+    non-dominated.
+    """
+    points = np.asarray(points, dtype=float)
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = points[np.all(points < reference_point, axis=-1)]
+    if len(points) == 0:
+        return 0.0
+
+    n_objectives = points.shape[-1]
+    if n_objectives == 1:
+        return float(reference_point[0] - np.min(points))
+    elif n_objectives == 2:
+        return _hypervolume_2d(points, reference_point)
+    elif n_objectives == 3:
+        return _hypervolume_3d(points, reference_point)
+    raise ValueError("exact hypervolume is only available for up to 3 objectives")
+
+
+def _hypervolume_2d(points, reference_point):
+    # sweep along the first objective, the best second objective so far bounds
+    # each slab
+    points = points[np.lexsort((points[:, 1], points[:, 0]))]
+    best = np.minimum.accumulate(points[:, 1])
+    widths = np.diff(np.append(points[:, 0], reference_point[0]))
+    return float(np.sum(widths * (reference_point[1] - best)))
+
+
+def _hypervolume_3d(points, reference_point):
+    # sweep along the third objective, maintaining the 2d non-dominated staircase
+    # (first objective increasing, second decreasing) of the points below
+    points = points[np.argsort(points[:, 2], kind="stable")]
+    heights = np.diff(np.append(points[:, 2], reference_point[2]))
+
+    xs, ys = np.zeros(0), np.zeros(0)
+    area = 0.0
+    volume = 0.0
+    for (x, y, _), height in zip(points, heights):
+        # points weakly dominated by the staircase do not change the area
+        j = np.searchsorted(xs, x, side="right")
+        if not (j > 0 and ys[j - 1] <= y):
+            keep = ~((xs >= x) & (ys >= y))
+            xs, ys = xs[keep], ys[keep]
+            j = np.searchsorted(xs, x)
+            xs, ys = np.insert(xs, j, x), np.insert(ys, j, y)
+            widths = np.diff(np.append(xs, reference_point[0]))
+            area = np.sum(widths * (reference_point[1] - ys))
+        volume += area * height
+    return float(volume)
@@ -0,0 +1,58 @@
+from typing import Dict
+
+import numpy as np
+
+from xopt import VOCS
+
+
+def dtlz2(x, n_objectives):
+    """
+    DTLZ2 many-objective test function
+    https://doi.org/10.1007/1-84628-137-7_6
+
+    The pareto front is the part of the unit hypersphere in the positive orthant,
+    reached when all variables after the first `n_objectives - 1` are 0.5
+
+    Parameters
+    ----------
+    x: array-like of float
+        variables in [0, 1], at least `n_objectives` of them
+    n_objectives: int
+        number of objectives
+
+    Returns
+    -------
+    np.ndarray
+        objective values (minimized)
+
+    """
+    x = np.asarray(x, dtype=float)
+    n_angles = n_objectives - 1
+    g = np.sum((x[n_angles:] - 0.5) ** 2)
+
+    angles = x[:n_angles] * np.pi / 2
+    f = np.full(n_objectives, 1.0 + g)
+    for i in range(n_objectives):
+        f[i] *= np.prod(np.cos(angles[: n_angles - i]))
+        if i > 0:
+            f[i] *= np.sin(angles[n_angles - i])
+    return f
+
+
+def evaluate_dtlz2(inputs: Dict, n_objectives=None) -> Dict[str, float]:
+    """
+    Evaluate DTLZ2 with labeled inputs `x0, x1, ...` and outputs `y0, y1, ...`.
+    The number of objectives defaults to half the number of inputs.
+    """
+    n_variables = len([key for key in inputs if key.startswith("x")])
+    x = [inputs[f"x{i}"] for i in range(n_variables)]
+    n_objectives = n_objectives or n_variables // 2
+    return {f"y{i}": value for i, value in enumerate(dtlz2(x, n_objectives))}
+
+
+def make_dtlz2_vocs(n_objectives, n_variables=None):
+    n_variables = n_variables or 2 * n_objectives
+    return VOCS(
+        variables={f"x{i}": [0, 1] for i in range(n_variables)},
+        objectives={f"y{i}": "MINIMIZE" for i in range(n_objectives)},
+    )
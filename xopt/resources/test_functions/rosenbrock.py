@@ -1,4 +1,7 @@
 from typing import Dict
+
+import pandas as pd
+
 from xopt import VOCS
 
 
@@ -35,7 +38,8 @@ def evaluate_rosenbrock(inputs: Dict, label="y") -> Dict[str, float]:
     ----------
     inputs: Dict[str, float]
         labeled vector of inputs. The labels can be arbitrary.
-        labels will be sorted to construct the call to rosenbrock.
+        labels will be sorted to construct the call to rosenbrock, labels
+        starting with `xopt_` (added by generators) are ignored.
 
 
     label: str
@@ -54,7 +58,19 @@ def evaluate_rosenbrock(inputs: Dict, label="y") -> Dict[str, float]:
 
     """
 
-    return {"y": rosenbrock([inputs[k] for k in sorted(inputs)])}
+    names = sorted(k for k in inputs if not k.startswith("xopt_"))
+    return {label: rosenbrock([inputs[k] for k in names])}
+
+
+def evaluate_rosenbrock_dataframe(inputs: pd.DataFrame, **params) -> pd.DataFrame:
+    """
+    Evaluate each row of `inputs`, returns the inputs joined with the outputs
+    """
+    outputs = pd.DataFrame(
+        [evaluate_rosenbrock(ele, **params) for ele in inputs.to_dict("records")],
+        index=inputs.index,
+    )
+    return pd.concat([inputs, outputs], axis=1)
 
 
 def make_rosenbrock_vocs(n):
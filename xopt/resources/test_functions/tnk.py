@@ -3,6 +3,7 @@ from random import random
 from typing import Dict
 
 import numpy as np
+import pandas as pd
 
 from xopt.vocs import VOCS
 
@@ -57,3 +58,15 @@ def evaluate_TNK(
     }
 
     return outputs
+
+
+# dataframe version
+def evaluate_TNK_dataframe(inputs: pd.DataFrame, **params) -> pd.DataFrame:
+    """
+    Evaluate each row of `inputs`, returns the inputs joined with the outputs
+    """
+    outputs = pd.DataFrame(
+        [evaluate_TNK(ele, **params) for ele in inputs.to_dict("records")],
+        index=inputs.index,
+    )
+    return pd.concat([inputs, outputs], axis=1)